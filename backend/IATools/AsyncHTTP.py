@@ -0,0 +1,75 @@
+import asyncio
+import os
+from collections import defaultdict
+from typing import Dict
+
+import aiohttp
+
+# Conexiones keep-alive por proveedor y tiempo que se mantienen abiertas sin uso
+HTTP_POOL_SIZE = int(os.getenv("PROVIDER_HTTP_POOL_SIZE", "20"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("PROVIDER_HTTP_KEEPALIVE_SECONDS", "75"))
+# Cache de DNS del connector (segundos)
+HTTP_DNS_CACHE_SECONDS = int(os.getenv("PROVIDER_HTTP_DNS_CACHE_SECONDS", "300"))
+
+# Una sesión por (event loop, proveedor): aiohttp no permite compartir sesiones entre loops
+_sessions = {}
+# Contadores por proveedor, alimentados por los trace hooks de aiohttp
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+    "requests": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "dns_resolutions": 0,
+    "dns_cache_hits": 0,
+})
+
+def _trace_config(name: str) -> aiohttp.TraceConfig:
+    stats = _stats[name]
+    trace = aiohttp.TraceConfig()
+
+    def count(counter):
+        async def hook(session, context, params):
+            stats[counter] += 1
+        return hook
+
+    trace.on_request_start.append(count("requests"))
+    trace.on_connection_create_end.append(count("connections_created"))
+    trace.on_connection_reuseconn.append(count("connections_reused"))
+    trace.on_dns_resolvehost_end.append(count("dns_resolutions"))
+    trace.on_dns_cache_hit.append(count("dns_cache_hits"))
+    return trace
+
+async def get_session(name: str = "default") -> aiohttp.ClientSession:
+    """Devuelve la sesión HTTP asíncrona (pool keep-alive propio) del proveedor indicado"""
+    key = (asyncio.get_running_loop(), name)
+    session = _sessions.get(key)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS
+        )
+        session = aiohttp.ClientSession(connector=connector, trace_configs=[_trace_config(name)])
+        _sessions[key] = session
+    return session
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Contadores de cada pool: solicitudes, conexiones nuevas y reutilizadas, resoluciones DNS"""
+    result = {}
+    for name, stats in _stats.items():
+        reused = stats["connections_reused"]
+        opened = stats["connections_created"]
+        result[name] = {
+            **stats,
+            "pool_size": HTTP_POOL_SIZE,
+            "keepalive_seconds": HTTP_KEEPALIVE_SECONDS,
+            "reuse_rate": round(reused / (reused + opened), 3) if reused + opened else None,
+        }
+    return result
+
+async def close_sessions():
+    """Cierra las sesiones de todos los proveedores del loop actual"""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _sessions if key[0] is loop]:
+        session = _sessions.pop(key)
+        if not session.closed:
+            await session.close()
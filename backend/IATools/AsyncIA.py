@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Mapping, Optional
+
+class ProviderRateLimited(Exception):
+    """El proveedor respondió 429: IAManager espera y reintenta en vez de tratarlo como respuesta"""
+
+    def __init__(self, message: str, headers: Optional[Mapping[str, str]] = None):
+        super().__init__(message)
+        self.headers = dict(headers or {})
+
+def rate_limited_from(error: Exception) -> Optional[ProviderRateLimited]:
+    """Convierte el error 429 de un SDK (openai, cohere, google) en ProviderRateLimited"""
+    status = getattr(error, "status_code", None) or getattr(error, "http_status", None) or getattr(error, "code", None)
+    response = getattr(error, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    headers = getattr(response, "headers", None) if response is not None else None
+    return ProviderRateLimited(str(error), headers)
+
+class AsyncIA(ABC):
+    """Contraparte asíncrona de IA: get_response corre en el event loop sin ocupar un thread"""
+
+    # IAManager lo asigna para recibir las cabeceras de rate limit de cada respuesta
+    on_headers: Optional[Callable[[Mapping[str, str]], None]] = None
+
+    @abstractmethod
+    async def get_response(self, question, lang="en"):
+        pass
+
+    def cache_params(self) -> Dict[str, Any]:
+        """Modelo y parámetros que el cliente envía al proveedor (entran en la clave de caché)"""
+        return {}
+
+    async def warmup(self):
+        """Abre por adelantado la conexión (DNS + TLS) con el proveedor; no-op si el SDK no lo permite"""
+        pass
+
+    async def close(self):
+        pass
+
+    def _observe_headers(self, headers):
+        if self.on_headers is not None and headers is not None:
+            self.on_headers(headers)
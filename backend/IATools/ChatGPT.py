@@ -1,31 +1,71 @@
 import openai
 import os
 
-from IATools.IA import IA
+from IATools.IA import IA, PROVIDER_TIMEOUT_SECONDS
+from IATools.AsyncIA import AsyncIA, rate_limited_from
+
+MODEL = "gpt-3.5-turbo"
+
+# Mensaje de sistema: instrucciones de idioma y estilo de respuesta
+SYSTEM_PROMPT = (
+    "You are a helpful assistant. Always respond in {language}. "
+    "Keep answers concise, direct, and structured. Avoid introductions. "
+    "Use bullet points if possible."
+)
+
+# Sin temperature ni max_tokens: se usan los valores por defecto del proveedor
+CACHE_PARAMS = {"model": MODEL, "system_prompt": SYSTEM_PROMPT}
+
+def _build_messages(question: str, language: str):
+    system_message = {"role": "system", "content": SYSTEM_PROMPT.format(language=language.upper())}
+
+    user_message = {"role": "user", "content": question}
+    return [system_message, user_message]
 
 class ChatGPT(IA):
     def __init__(self, api_key):
-        self.client = openai.Client(api_key=api_key)
+        self.client = openai.Client(api_key=api_key, timeout=PROVIDER_TIMEOUT_SECONDS)
 
     def get_response(self, question: str, language: str = "en") -> str:
         try:
-            # Mensaje de sistema: instrucciones de idioma y estilo de respuesta
-            system_message = {
-                "role": "system",
-                "content": (
-                    f"You are a helpful assistant. Always respond in {language.upper()}. "
-                    "Keep answers concise, direct, and structured. Avoid introductions. "
-                    "Use bullet points if possible."
-                )
-            }
-
-            user_message = {"role": "user", "content": question}
-
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[system_message, user_message]
+                model=MODEL,
+                messages=_build_messages(question, language)
             )
             return response.choices[0].message.content
 
         except Exception as e:
             return f"Error in ChatGPT: {e}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+class AsyncChatGPT(AsyncIA):
+    def __init__(self, api_key):
+        self.client = openai.AsyncClient(api_key=api_key, timeout=PROVIDER_TIMEOUT_SECONDS)
+
+    async def get_response(self, question: str, language: str = "en") -> str:
+        try:
+            # with_raw_response expone las cabeceras x-ratelimit-* para el limitador de IAManager
+            raw = await self.client.chat.completions.with_raw_response.create(
+                model=MODEL,
+                messages=_build_messages(question, language)
+            )
+            self._observe_headers(raw.headers)
+            return raw.parse().choices[0].message.content
+
+        except Exception as e:
+            limited = rate_limited_from(e)
+            if limited is not None:
+                raise limited from e
+            return f"Error in ChatGPT: {e}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+    async def warmup(self):
+        # Listar modelos no consume tokens y deja abierta la conexión del pool httpx del SDK
+        await self.client.models.list()
+
+    async def close(self):
+        await self.client.close()
@@ -1,16 +1,47 @@
 import anthropic
-from IATools.IA import IA
+from IATools.IA import IA, PROVIDER_TIMEOUT_SECONDS
+from IATools.AsyncIA import AsyncIA, rate_limited_from
+
+MODEL = "claude-3-sonnet-20240229"
+MAX_TOKENS = 1000
+TEMPERATURE = 0.7
+
+CACHE_PARAMS = {"model": MODEL, "max_tokens": MAX_TOKENS, "temperature": TEMPERATURE}
 
 class Claude(IA):
     def __init__(self, api_key):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.Anthropic(api_key=api_key, timeout=PROVIDER_TIMEOUT_SECONDS)
         
     def get_response(self, question, lang="en"):
         try:
             response = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1000,
-                temperature=0.7,
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": question
+                    }
+                ]
+            )
+            return response.content[0].text
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+class AsyncClaude(AsyncIA):
+    def __init__(self, api_key):
+        self.client = anthropic.AsyncAnthropic(api_key=api_key, timeout=PROVIDER_TIMEOUT_SECONDS)
+
+    async def get_response(self, question, lang="en"):
+        try:
+            response = await self.client.messages.create(
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
                 messages=[
                     {
                         "role": "user",
@@ -20,4 +51,13 @@ class Claude(IA):
             )
             return response.content[0].text
         except Exception as e:
-            return f"Error: {str(e)}" 
\ No newline at end of file
+            limited = rate_limited_from(e)
+            if limited is not None:
+                raise limited from e
+            return f"Error: {str(e)}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+    async def close(self):
+        await self.client.close()
@@ -1,26 +1,67 @@
 import cohere
-from IATools.IA import IA
+from IATools.IA import IA, PROVIDER_TIMEOUT_SECONDS
+from IATools.AsyncIA import AsyncIA, rate_limited_from
+
+MODEL = 'command'
+MAX_TOKENS = 1000
+TEMPERATURE = 0.7
+TOP_K = 0
+
+CACHE_PARAMS = {"model": MODEL, "max_tokens": MAX_TOKENS, "temperature": TEMPERATURE, "k": TOP_K}
 
 class Cohere(IA):
     def __init__(self, api_key):
         if not api_key or not api_key.strip():
             raise ValueError("API key de Cohere es requerida")
         try:
-            self.co = cohere.Client(api_key)
+            self.co = cohere.Client(api_key, timeout=PROVIDER_TIMEOUT_SECONDS)
         except Exception as e:
             raise ValueError(f"Error al inicializar cliente de Cohere: {str(e)}")
         
     def get_response(self, question, lang="en"):
         try:
             response = self.co.generate(
-                model='command',
+                model=MODEL,
                 prompt=question,
-                max_tokens=1000,
-                temperature=0.7,
-                k=0,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                k=TOP_K,
                 stop_sequences=[],
                 return_likelihoods='NONE'
             )
             return response.generations[0].text
         except Exception as e:
-            return f"Error: {str(e)}" 
\ No newline at end of file
+            return f"Error: {str(e)}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+class AsyncCohere(AsyncIA):
+    def __init__(self, api_key):
+        if not api_key or not api_key.strip():
+            raise ValueError("API key de Cohere es requerida")
+        try:
+            self.co = cohere.AsyncClient(api_key, timeout=PROVIDER_TIMEOUT_SECONDS)
+        except Exception as e:
+            raise ValueError(f"Error al inicializar cliente de Cohere: {str(e)}")
+
+    async def get_response(self, question, lang="en"):
+        try:
+            response = await self.co.generate(
+                model=MODEL,
+                prompt=question,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                k=TOP_K,
+                stop_sequences=[],
+                return_likelihoods='NONE'
+            )
+            return response.generations[0].text
+        except Exception as e:
+            limited = rate_limited_from(e)
+            if limited is not None:
+                raise limited from e
+            return f"Error: {str(e)}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
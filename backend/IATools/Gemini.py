@@ -1,5 +1,12 @@
 import google.generativeai as genai
-from IATools.IA import IA
+from IATools.IA import IA, PROVIDER_TIMEOUT_SECONDS
+from IATools.AsyncIA import AsyncIA, rate_limited_from
+
+# Usar el modelo correcto para la API v1beta
+MODEL = 'gemini-1.5-flash'
+
+# Sin generation_config: temperatura y tokens por defecto del modelo
+CACHE_PARAMS = {"model": MODEL}
 
 class Gemini(IA):
     def __init__(self, api_key):
@@ -7,14 +14,43 @@ class Gemini(IA):
             raise ValueError("API key de Gemini es requerida")
         try:
             genai.configure(api_key=api_key)
-            # Usar el modelo correcto para la API v1beta
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            self.model = genai.GenerativeModel(MODEL)
         except Exception as e:
             raise ValueError(f"Error al inicializar cliente de Gemini: {str(e)}")
         
     def get_response(self, question, lang="en"):
         try:
-            response = self.model.generate_content(question)
+            response = self.model.generate_content(
+                question, request_options={"timeout": PROVIDER_TIMEOUT_SECONDS}
+            )
+            return response.text
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+class AsyncGemini(AsyncIA):
+    def __init__(self, api_key):
+        if not api_key or not api_key.strip():
+            raise ValueError("API key de Gemini es requerida")
+        try:
+            genai.configure(api_key=api_key)
+            self.model = genai.GenerativeModel(MODEL)
+        except Exception as e:
+            raise ValueError(f"Error al inicializar cliente de Gemini: {str(e)}")
+
+    async def get_response(self, question, lang="en"):
+        try:
+            response = await self.model.generate_content_async(
+                question, request_options={"timeout": PROVIDER_TIMEOUT_SECONDS}
+            )
             return response.text
         except Exception as e:
-            return f"Error: {str(e)}" 
\ No newline at end of file
+            limited = rate_limited_from(e)
+            if limited is not None:
+                raise limited from e
+            return f"Error: {str(e)}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
@@ -1,6 +1,15 @@
 from abc import ABC, abstractmethod
+import os
+from typing import Any, Dict
+
+# Timeout por llamada a un proveedor (segundos); el plazo total de la solicitud lo aplica IAManager
+PROVIDER_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "60"))
 
 class IA(ABC):
     @abstractmethod
     def get_response(self, question):
         pass
+
+    def cache_params(self) -> Dict[str, Any]:
+        """Modelo y parámetros que el cliente envía al proveedor (entran en la clave de caché)"""
+        return {}
@@ -1,10 +1,10 @@
-from IATools.ChatGPT import ChatGPT
+from IATools.ChatGPT import ChatGPT, AsyncChatGPT
 from IATools.Bard import Bard
-from IATools.PerplexityIA import PerplexityIA
-from IATools.Claude import Claude
-from IATools.Gemini import Gemini
-from IATools.Mistral import Mistral
-from IATools.Cohere import Cohere
+from IATools.PerplexityIA import PerplexityIA, AsyncPerplexityIA
+from IATools.Claude import Claude, AsyncClaude
+from IATools.Gemini import Gemini, AsyncGemini
+from IATools.Mistral import Mistral, AsyncMistral
+from IATools.Cohere import Cohere, AsyncCohere
 
 class IAFactory:
     @staticmethod
@@ -24,4 +24,21 @@ class IAFactory:
         elif ai_type == "Cohere":
             return Cohere(api_key)
         else:
-            raise ValueError(f"IA not supported: {ai_type}")
\ No newline at end of file
+            raise ValueError(f"IA not supported: {ai_type}")
+
+    @staticmethod
+    def create_async_ia(ai_type: str, api_key=None):
+        if ai_type == "ChatGPT":
+            return AsyncChatGPT(api_key)
+        elif ai_type == "Perplexity":
+            return AsyncPerplexityIA(api_key)
+        elif ai_type == "Claude":
+            return AsyncClaude(api_key)
+        elif ai_type == "Gemini":
+            return AsyncGemini(api_key)
+        elif ai_type == "Mistral":
+            return AsyncMistral(api_key)
+        elif ai_type == "Cohere":
+            return AsyncCohere(api_key)
+        else:
+            raise ValueError(f"Async IA not supported: {ai_type}")
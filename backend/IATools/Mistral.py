@@ -1,41 +1,102 @@
+import aiohttp
 import requests
-from IATools.IA import IA
+from IATools.IA import IA, PROVIDER_TIMEOUT_SECONDS
+from IATools.AsyncIA import AsyncIA, ProviderRateLimited
+from IATools.AsyncHTTP import get_session
+
+BASE_URL = "https://api.mistral.ai/v1"
+MODEL = "mistral-large-latest"
+MAX_TOKENS = 1000
+TEMPERATURE = 0.7
+
+CACHE_PARAMS = {"model": MODEL, "max_tokens": MAX_TOKENS, "temperature": TEMPERATURE}
+
+def _build_request(api_key, question):
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    data = {
+        "model": MODEL,
+        "messages": [
+            {"role": "user", "content": question}
+        ],
+        "max_tokens": MAX_TOKENS,
+        "temperature": TEMPERATURE
+    }
+    return headers, data
+
+def _error_for_status(status_code):
+    if status_code == 429:
+        return "Error: 429 (Too Many Requests - Rate limit exceeded. Please wait and try again later.)"
+    return f"Error: {status_code}"
 
 class Mistral(IA):
     def __init__(self, api_key):
         if not api_key or not api_key.strip():
             raise ValueError("API key de Mistral es requerida")
         self.api_key = api_key
-        self.base_url = "https://api.mistral.ai/v1"
+        self.base_url = BASE_URL
+        # Sesión keep-alive: reutiliza la conexión TLS entre llamadas
+        self.session = requests.Session()
         
     def get_response(self, question, lang="en"):
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": "mistral-large-latest",
-                "messages": [
-                    {"role": "user", "content": question}
-                ],
-                "max_tokens": 1000,
-                "temperature": 0.7
-            }
+            headers, data = _build_request(self.api_key, question)
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/completions",
                 headers=headers,
-                json=data
+                json=data,
+                timeout=PROVIDER_TIMEOUT_SECONDS
             )
             
             if response.status_code == 200:
                 return response.json()["choices"][0]["message"]["content"]
-            elif response.status_code == 429:
-                return "Error: 429 (Too Many Requests - Rate limit exceeded. Please wait and try again later.)"
-            else:
-                return f"Error: {response.status_code}"
+            return _error_for_status(response.status_code)
                 
         except Exception as e:
-            return f"Error: {str(e)}" 
\ No newline at end of file
+            return f"Error: {str(e)}" 
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+class AsyncMistral(AsyncIA):
+    def __init__(self, api_key):
+        if not api_key or not api_key.strip():
+            raise ValueError("API key de Mistral es requerida")
+        self.api_key = api_key
+        self.base_url = BASE_URL
+
+    async def get_response(self, question, lang="en"):
+        try:
+            headers, data = _build_request(self.api_key, question)
+            session = await get_session("Mistral")
+
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=data,
+                timeout=aiohttp.ClientTimeout(total=PROVIDER_TIMEOUT_SECONDS)
+            ) as response:
+                if response.status == 429:
+                    raise ProviderRateLimited(_error_for_status(429), response.headers)
+                self._observe_headers(response.headers)
+                if response.status == 200:
+                    payload = await response.json()
+                    return payload["choices"][0]["message"]["content"]
+                return _error_for_status(response.status)
+
+        except ProviderRateLimited:
+            raise
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+    async def warmup(self):
+        session = await get_session("Mistral")
+        async with session.head(self.base_url, timeout=aiohttp.ClientTimeout(total=PROVIDER_TIMEOUT_SECONDS)):
+            pass
@@ -1,47 +1,66 @@
+import aiohttp
 import requests
+from IATools.IA import PROVIDER_TIMEOUT_SECONDS
+from IATools.AsyncIA import AsyncIA, ProviderRateLimited
+from IATools.AsyncHTTP import get_session
+
+URL = "https://api.perplexity.ai/chat/completions"
+MODEL = "r1-1776"
+
+# Instrucciones explícitas antes de la consulta
+PROMPT_TEMPLATE = (
+    "Responde {lang_instruction} la siguiente consulta de forma clara, concisa y estructurada. "
+    "Evita introducciones, contexto innecesario o reflexiones. "
+    "Limita la respuesta a 5 viñetas con los puntos clave. "
+    "No incluyas notas finales ni advertencias. Solo hechos relevantes.\n\n"
+    "{prompt}"
+)
+
+# Sin temperature ni max_tokens: se usan los valores por defecto del proveedor
+CACHE_PARAMS = {"model": MODEL, "prompt_template": PROMPT_TEMPLATE}
+
+def _build_request(api_key: str, prompt: str, language: str):
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    # Mapa de idiomas
+    lang_instruction = {
+        "es": "en español",
+        "en": "in English",
+        "fr": "en français",
+        "de": "auf Deutsch",
+        "it": "in italiano"
+    }.get(language, "in English")
+
+    full_prompt = PROMPT_TEMPLATE.format(lang_instruction=lang_instruction, prompt=prompt)
+
+    payload = {
+        "model": MODEL,
+        "messages": [
+            {"role": "user", "content": full_prompt}
+        ]
+    }
+    return headers, payload
+
+def _clean_result(result: str) -> str:
+    # Opcional: eliminar secciones como <think> si aún aparecen
+    if "<think>" in result:
+        result = result.split("</think>")[-1].strip()
+    return result
 
 class PerplexityIA:
     def __init__(self, api_key):
         self.api_key = api_key
-        self.url = "https://api.perplexity.ai/chat/completions"
+        self.url = URL
+        # Sesión keep-alive: reutiliza la conexión TLS entre llamadas
+        self.session = requests.Session()
 
     def get_response(self, prompt: str, language: str = "en") -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-
-        # Mapa de idiomas
-        lang_instruction = {
-            "es": "en español",
-            "en": "in English",
-            "fr": "en français",
-            "de": "auf Deutsch",
-            "it": "in italiano"
-        }.get(language, "in English")
-
-        style_instruction = (
-            "Responde de forma breve, directa, estructurada y clara. "
-            "No uses introducciones ni explicaciones innecesarias. Usa viñetas si aplica."
-        )
-
-        # Construir mensaje con instrucciones explícitas
-        full_prompt = (
-            f"Responde {lang_instruction} la siguiente consulta de forma clara, concisa y estructurada. "
-            f"Evita introducciones, contexto innecesario o reflexiones. "
-            f"Limita la respuesta a 5 viñetas con los puntos clave. "
-            f"No incluyas notas finales ni advertencias. Solo hechos relevantes.\n\n"
-            f"{prompt}"
-        )
-
-        payload = {
-            "model": "r1-1776",
-            "messages": [
-                {"role": "user", "content": full_prompt}
-            ]
-        }
-
-        response = requests.post(self.url, headers=headers, json=payload)
+        headers, payload = _build_request(self.api_key, prompt, language)
+
+        response = self.session.post(self.url, headers=headers, json=payload, timeout=PROVIDER_TIMEOUT_SECONDS)
 
         if response.status_code != 200:
             print(f"🚨 Perplexity Error: {response.status_code}")
@@ -51,8 +70,47 @@ class PerplexityIA:
         response.raise_for_status()
         result = response.json()["choices"][0]["message"]["content"]
 
-        # Opcional: eliminar secciones como <think> si aún aparecen
-        if "<think>" in result:
-            result = result.split("</think>")[-1].strip()
+        return _clean_result(result)
+
+    def cache_params(self):
+        return CACHE_PARAMS
+
+class AsyncPerplexityIA(AsyncIA):
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.url = URL
+
+    async def get_response(self, prompt: str, language: str = "en") -> str:
+        headers, payload = _build_request(self.api_key, prompt, language)
+        session = await get_session("Perplexity")
+
+        async with session.post(
+            self.url,
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=PROVIDER_TIMEOUT_SECONDS)
+        ) as response:
+            if response.status == 429:
+                raise ProviderRateLimited(f"[Perplexity ERROR 429] {await response.text()}", response.headers)
+            self._observe_headers(response.headers)
+            if response.status != 200:
+                body = await response.text()
+                print(f"🚨 Perplexity Error: {response.status}")
+                print(body)
+                try:
+                    message = (await response.json(content_type=None)).get('error', {}).get('message', 'Unknown error')
+                except Exception:
+                    message = 'Unknown error'
+                return f"[Perplexity ERROR {response.status}] {message}"
+
+            result = (await response.json())["choices"][0]["message"]["content"]
+
+        return _clean_result(result)
+
+    def cache_params(self):
+        return CACHE_PARAMS
 
-        return result
+    async def warmup(self):
+        session = await get_session("Perplexity")
+        async with session.head(self.url, timeout=aiohttp.ClientTimeout(total=PROVIDER_TIMEOUT_SECONDS)):
+            pass
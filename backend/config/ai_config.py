@@ -17,6 +17,10 @@ class AIConfig:
     description: str = ""
     strengths: Optional[List[str]] = None
     weaknesses: Optional[List[str]] = None
+    cache_ttl_seconds: int = 86400  # TTL de la caché de respuestas (0 = sin caché)
+    hedge_after_seconds: Optional[float] = None  # Lanzar un segundo intento si el primero tarda más
+    requests_per_minute: Optional[int] = None  # Cuota RPM del proveedor (None = se aprende de las cabeceras)
+    tokens_per_minute: Optional[int] = None  # Cuota TPM del proveedor
     
     def __post_init__(self):
         if self.strengths is None:
@@ -48,7 +52,7 @@ class AIConfigManager:
             "Gemini": AIConfig(
                 name="Gemini",
                 api_key_env="GEMINI_API_KEY",
-                model_name="gemini-pro",
+                model_name="gemini-1.5-flash",
                 description="Modelo de Google con buen equilibrio entre creatividad y precisión",
                 strengths=["Equilibrio", "Bien estructurado", "Multimodal"],
                 weaknesses=["Limitaciones en ciertos temas", "Menos personalizable"]
@@ -59,7 +63,8 @@ class AIConfigManager:
                 model_name="mistral-large-latest",
                 description="Modelo técnico y preciso, excelente para análisis detallados",
                 strengths=["Precisión técnica", "Análisis detallado", "Eficiencia"],
-                weaknesses=["Menos conversacional", "Respuestas más secas"]
+                weaknesses=["Menos conversacional", "Respuestas más secas"],
+                requests_per_minute=60  # Plan gratuito: ~1 solicitud por segundo
             ),
             "Cohere": AIConfig(
                 name="Cohere",
@@ -72,10 +77,13 @@ class AIConfigManager:
             "Perplexity": AIConfig(
                 name="Perplexity",
                 api_key_env="PERPLEXITY_API_KEY",
-                model_name="llama-3.1-sonar-small-128k-online",
+                model_name="r1-1776",
                 description="Modelo con acceso a internet y fuentes, excelente para información actualizada",
                 strengths=["Información actualizada", "Fuentes verificables", "Investigación"],
-                weaknesses=["Dependiente de fuentes", "Puede ser lento"]
+                weaknesses=["Dependiente de fuentes", "Puede ser lento"],
+                cache_ttl_seconds=3600,  # Respuestas con búsqueda online: caducan antes
+                hedge_after_seconds=10.0,
+                requests_per_minute=50
             )
         }
     
@@ -139,7 +147,11 @@ class AIConfigManager:
                 "weaknesses": config.weaknesses or [],
                 "model_name": config.model_name,
                 "max_tokens": config.max_tokens,
-                "temperature": config.temperature
+                "temperature": config.temperature,
+                "cache_ttl_seconds": config.cache_ttl_seconds,
+                "hedge_after_seconds": config.hedge_after_seconds,
+                "requests_per_minute": config.requests_per_minute,
+                "tokens_per_minute": config.tokens_per_minute
             }
         return info
     
@@ -1,20 +1,40 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+def _async_database_url(url: str) -> str:
+    """postgresql://... -> postgresql+asyncpg://... (acepta también postgres:// y +psycopg2)"""
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    scheme, _, rest = url.partition("://")
+    if scheme.startswith("postgresql"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+
+# Engine async (asyncpg): lo usan todas las rutas y servicios del event loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    pool_pre_ping=True
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+# Engine sync: solo para scripts (el esquema lo crean las migraciones de migrations/)
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def get_db():
+    """Sesión async por solicitud (único proveedor de sesiones de las rutas)"""
+    async with AsyncSessionLocal() as session:
+        yield session
 
 def wait_for_db():
     """Espera a que PostgreSQL esté disponible antes de conectarse."""
@@ -0,0 +1,6 @@
+from fastapi import Request
+from services.IAManager import IAManager
+
+def get_ia_manager(request: Request) -> IAManager:
+    """IAManager compartido por todas las solicitudes (se crea en el lifespan de la app)"""
+    return request.app.state.ia_manager
@@ -1,15 +1,47 @@
 from fastapi import FastAPI
-from database import engine, Base
-from routes import questions, responses, summaries, similarities, sentiments, contradictions, named_entities, semantic_similarity, health, ai_responses, analysis, advanced_analysis, ai_info, health_check
+from database import async_engine
+from routes import questions, responses, summaries, similarities, sentiments, contradictions, named_entities, semantic_similarity, health, ai_responses, analysis, advanced_analysis, ai_info, health_check, nlp_models
+from services.ModelRegistry import model_registry
+from services.IAManager import IAManager
+from services.AnalysisExecutor import analysis_executor
+from IATools.AsyncHTTP import close_sessions
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+import asyncio
 import sys
 import os
 
-# Crear las tablas en la base de datos
-Base.metadata.create_all(bind=engine)
+# El esquema se crea y actualiza con las migraciones (alembic upgrade head), no al importar la app
+
+async def warmup_nlp_models():
+    # NLP_PRELOAD_MODELS: lista separada por comas, o "all" para precargar todos
+    preload = os.getenv("NLP_PRELOAD_MODELS", "").strip()
+    if not preload:
+        return
+    names = None if preload == "all" else [name.strip() for name in preload.split(",") if name.strip()]
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, model_registry.warmup, names)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Un único IAManager para toda la app: clientes y pools de conexiones se reutilizan
+    app.state.ia_manager = IAManager()
+    if os.getenv("PROVIDER_PREWARM", "true").lower() == "true":
+        await app.state.ia_manager.warmup_connections()
+    await warmup_nlp_models()
+    # Los workers de análisis cargan sus modelos en segundo plano: no bloquean el arranque
+    app.state.analysis_warmup = asyncio.ensure_future(analysis_executor.warmup())
+    try:
+        yield
+    finally:
+        app.state.analysis_warmup.cancel()
+        analysis_executor.shutdown()
+        await app.state.ia_manager.close()
+        await close_sessions()
+        await async_engine.dispose()
 
 # Inicializar la aplicación
-app = FastAPI(title="IAAnalyzerComparison API")
+app = FastAPI(title="IAAnalyzerComparison API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,4 +66,5 @@ app.include_router(health_check.router)
 app.include_router(ai_responses.router, prefix="/ai", tags=["AI Responses"])
 app.include_router(analysis.router, prefix="/analysis", tags=["Analysis"])
 app.include_router(advanced_analysis.router)
-app.include_router(ai_info.router)
\ No newline at end of file
+app.include_router(ai_info.router)
+app.include_router(nlp_models.router)
@@ -0,0 +1,51 @@
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Base, DATABASE_URL
+# Registrar todas las tablas en Base.metadata (para --autogenerate)
+from models import (  # noqa: F401
+    comparison_snapshot,
+    contradiction,
+    named_entity,
+    provider_response_cache,
+    question,
+    question_embedding,
+    response,
+    semantic_similarity,
+    sentiment,
+    similarity,
+    summary,
+)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Genera el SQL sin conectarse (alembic upgrade head --sql)"""
+    context.configure(url=DATABASE_URL, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
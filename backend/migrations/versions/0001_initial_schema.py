@@ -0,0 +1,130 @@
+"""Esquema inicial (el que creaba Base.metadata.create_all)
+
+Las bases creadas antes de las migraciones ya tienen estas tablas: solo se crean
+las que falten, así `alembic upgrade head` funciona igual en una base nueva o existente.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_initial_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table_if_missing(name, *columns):
+    if sa.inspect(op.get_bind()).has_table(name):
+        return
+    op.create_table(name, *columns)
+    op.create_index(f"ix_{name}_id", name, ["id"])
+
+
+def _question_fk():
+    return sa.Column("question_id", sa.Integer, sa.ForeignKey("questions.id"), nullable=False)
+
+
+def upgrade():
+    _create_table_if_missing(
+        "questions",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("text", sa.String, nullable=False),
+        sa.Column("language", sa.String, nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=True),
+    )
+    _create_table_if_missing(
+        "responses",
+        sa.Column("id", sa.Integer, primary_key=True),
+        _question_fk(),
+        sa.Column("ai_name", sa.String, nullable=False),
+        sa.Column("response_text", sa.String, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=True),
+    )
+    _create_table_if_missing(
+        "summaries",
+        sa.Column("id", sa.Integer, primary_key=True),
+        _question_fk(),
+        sa.Column("summary_text", sa.String, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=True),
+    )
+    for name in ("similarities", "semantic_similarities"):
+        _create_table_if_missing(
+            name,
+            sa.Column("id", sa.Integer, primary_key=True),
+            _question_fk(),
+            sa.Column("ai1", sa.String, nullable=False),
+            sa.Column("ai2", sa.String, nullable=False),
+            sa.Column("similarity_score", sa.Float, nullable=False),
+        )
+    _create_table_if_missing(
+        "contradictions",
+        sa.Column("id", sa.Integer, primary_key=True),
+        _question_fk(),
+        sa.Column("ai1", sa.String, nullable=False),
+        sa.Column("ai2", sa.String, nullable=False),
+        sa.Column("label", sa.String, nullable=False),
+        sa.Column("score", sa.Float, nullable=False),
+    )
+    _create_table_if_missing(
+        "named_entities",
+        sa.Column("id", sa.Integer, primary_key=True),
+        _question_fk(),
+        sa.Column("ai_name", sa.String, nullable=False),
+        sa.Column("entity", sa.String, nullable=False),
+        sa.Column("label", sa.String, nullable=False),
+    )
+    _create_table_if_missing(
+        "sentiments",
+        sa.Column("id", sa.Integer, primary_key=True),
+        _question_fk(),
+        sa.Column("ai_name", sa.String, nullable=False),
+        sa.Column("label", sa.String, nullable=False),
+        sa.Column("score", sa.Float, nullable=False),
+    )
+    if not sa.inspect(op.get_bind()).has_table("provider_response_cache"):
+        _create_table_if_missing(
+            "provider_response_cache",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("cache_key", sa.String(64), nullable=False),
+            sa.Column("ai_name", sa.String, nullable=False),
+            sa.Column("model_name", sa.String, nullable=True),
+            sa.Column("language", sa.String, nullable=True),
+            sa.Column("response_text", sa.String, nullable=False),
+            sa.Column("latency_ms", sa.Float, nullable=True),
+            sa.Column("created_at", sa.DateTime, nullable=True),
+            sa.Column("expires_at", sa.DateTime, nullable=False),
+        )
+        op.create_index(
+            "ix_provider_response_cache_cache_key", "provider_response_cache", ["cache_key"], unique=True
+        )
+        op.create_index("ix_provider_response_cache_expires_at", "provider_response_cache", ["expires_at"])
+    if not sa.inspect(op.get_bind()).has_table("question_embeddings"):
+        op.create_table(
+            "question_embeddings",
+            sa.Column(
+                "question_id", sa.Integer, sa.ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True
+            ),
+            sa.Column("model_name", sa.String, nullable=False),
+            sa.Column("embedding", sa.LargeBinary, nullable=False),
+            sa.Column("created_at", sa.DateTime, nullable=True),
+        )
+
+
+def downgrade():
+    for name in (
+        "question_embeddings",
+        "provider_response_cache",
+        "sentiments",
+        "named_entities",
+        "contradictions",
+        "semantic_similarities",
+        "similarities",
+        "summaries",
+        "responses",
+        "questions",
+    ):
+        op.drop_table(name)
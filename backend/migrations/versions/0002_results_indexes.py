@@ -0,0 +1,43 @@
+"""Índices de question_id en las tablas de resultados y de created_at en questions
+
+- (question_id, ai_name) en responses, named_entities y sentiments: la columna inicial
+  sirve también para las búsquedas solo por question_id.
+- question_id en summaries, similarities, semantic_similarities y contradictions.
+- (created_at, id) en questions para la paginación por cursor del historial.
+
+Se crean con CONCURRENTLY para no bloquear escrituras en bases con datos.
+
+Revision ID: 0002_results_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0002_results_indexes"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_responses_question_id_ai_name", "responses", ["question_id", "ai_name"]),
+    ("ix_named_entities_question_id_ai_name", "named_entities", ["question_id", "ai_name"]),
+    ("ix_sentiments_question_id_ai_name", "sentiments", ["question_id", "ai_name"]),
+    ("ix_summaries_question_id", "summaries", ["question_id"]),
+    ("ix_similarities_question_id", "similarities", ["question_id"]),
+    ("ix_semantic_similarities_question_id", "semantic_similarities", ["question_id"]),
+    ("ix_contradictions_question_id", "contradictions", ["question_id"]),
+    ("ix_questions_created_at_id", "questions", ["created_at", "id"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
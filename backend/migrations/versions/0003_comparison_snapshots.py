@@ -0,0 +1,29 @@
+"""Tabla comparison_snapshots: documento de comparación completo por pregunta y versión de análisis
+
+Revision ID: 0003_comparison_snapshots
+Revises: 0002_results_indexes
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0003_comparison_snapshots"
+down_revision = "0002_results_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "comparison_snapshots",
+        sa.Column("question_id", sa.Integer, sa.ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("analysis_version", sa.Integer, primary_key=True),
+        sa.Column("document", postgresql.JSONB, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("comparison_snapshots")
@@ -0,0 +1,33 @@
+"""Revisión de los snapshots de comparación e invalidación sin borrar la fila
+
+- revision: sube cada vez que el snapshot se invalida o se reescribe. Las escrituras que
+  parten de un snapshot leído antes (reconstrucción, secciones avanzadas) solo se aplican
+  si la revisión sigue siendo la leída.
+- document pasa a aceptar NULL: un snapshot invalidado queda como fila sin documento.
+
+Revision ID: 0004_snapshot_revisions
+Revises: 0003_comparison_snapshots
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_snapshot_revisions"
+down_revision = "0003_comparison_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "comparison_snapshots",
+        sa.Column("revision", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.alter_column("comparison_snapshots", "document", nullable=True)
+
+
+def downgrade():
+    op.execute("DELETE FROM comparison_snapshots WHERE document IS NULL")
+    op.alter_column("comparison_snapshots", "document", nullable=False)
+    op.drop_column("comparison_snapshots", "revision")
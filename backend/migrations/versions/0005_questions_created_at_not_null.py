@@ -0,0 +1,42 @@
+"""questions.created_at NOT NULL (la paginación por cursor compara y serializa created_at)
+
+Con created_at NULL la pregunta quedaba primera en ORDER BY created_at DESC, la
+comparación (created_at, id) < cursor nunca la incluía y encode_cursor fallaba si era la
+última de la página. Las filas sin fecha toman la de su primera respuesta o, sin
+respuestas, 1970-01-01 (quedan al final del historial, como con NULLS LAST).
+
+Revision ID: 0005_questions_created_at_not_null
+Revises: 0004_snapshot_revisions
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_questions_created_at_not_null"
+down_revision = "0004_snapshot_revisions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        UPDATE questions SET created_at = COALESCE(
+            (SELECT MIN(responses.created_at) FROM responses WHERE responses.question_id = questions.id),
+            TIMESTAMP '1970-01-01 00:00:00'
+        )
+        WHERE created_at IS NULL
+        """
+    )
+    op.alter_column(
+        "questions", "created_at",
+        existing_type=sa.DateTime, nullable=False, server_default=sa.text("LOCALTIMESTAMP")
+    )
+
+
+def downgrade():
+    op.alter_column(
+        "questions", "created_at",
+        existing_type=sa.DateTime, nullable=True, server_default=None
+    )
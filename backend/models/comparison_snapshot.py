@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from database import Base
+
+class ComparisonSnapshot(Base):
+    __tablename__ = "comparison_snapshots"
+
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    analysis_version = Column(Integer, primary_key=True)  # Cambia cuando cambia el formato o los modelos del análisis
+    # Comparación completa (mismo formato que AnalysisStore.load_comparison); NULL si se invalidó
+    document = Column(JSONB(none_as_null=True), nullable=True)
+    revision = Column(Integer, nullable=False, default=0, server_default="0")  # Sube en cada invalidación y reescritura
+    created_at = Column(DateTime, default=func.now())
+
+    question = relationship("Question")
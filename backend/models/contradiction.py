@@ -7,7 +7,7 @@ class Contradiction(Base):
     __tablename__ = "contradictions"
 
     id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
     ai1 = Column(String, nullable=False)
     ai2 = Column(String, nullable=False)
     label = Column(String, nullable=False)  # "entailment", "neutral", "contradiction"
@@ -1,10 +1,12 @@
 # models/named_entity.py
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
 class NamedEntity(Base):
     __tablename__ = "named_entities"
+    # Cubre también las búsquedas solo por question_id (columna inicial)
+    __table_args__ = (Index("ix_named_entities_question_id_ai_name", "question_id", "ai_name"),)
 
     id = Column(Integer, primary_key=True, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, func
+from database import Base
+
+class ProviderResponseCache(Base):
+    __tablename__ = "provider_response_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), nullable=False, unique=True, index=True)  # sha256 del prompt normalizado + parámetros
+    ai_name = Column(String, nullable=False)
+    model_name = Column(String, nullable=True)
+    language = Column(String, nullable=True)
+    response_text = Column(String, nullable=False)
+    latency_ms = Column(Float, nullable=True)  # Latencia de la llamada original, para medir lo ahorrado
+    created_at = Column(DateTime, default=func.now())
+    expires_at = Column(DateTime, nullable=False, index=True)
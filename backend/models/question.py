@@ -1,16 +1,19 @@
 # backend/models.py o donde tengas el modelo
 
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    # Paginación por cursor del historial (ORDER BY created_at DESC, id DESC)
+    __table_args__ = (Index("ix_questions_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     text = Column(String, nullable=False)
     language = Column(String, nullable=True)  # ✅ Agregado
-    created_at = Column(DateTime, default=func.now())
+    # NOT NULL: la paginación por cursor compara y serializa created_at (migración 0005)
+    created_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.localtimestamp())
 
     responses = relationship("Response", back_populates="question", cascade="all, delete-orphan")
     summary = relationship("Summary", back_populates="question", uselist=False, cascade="all, delete-orphan")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey, DateTime, func
+from sqlalchemy.orm import relationship
+from database import Base
+
+class QuestionEmbedding(Base):
+    __tablename__ = "question_embeddings"
+
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    model_name = Column(String, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)  # Vector float32 normalizado
+    created_at = Column(DateTime, default=func.now())
+
+    question = relationship("Question")
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Response(Base):
     __tablename__ = "responses"
+    # Cubre también las búsquedas solo por question_id (columna inicial)
+    __table_args__ = (Index("ix_responses_question_id_ai_name", "question_id", "ai_name"),)
 
     id = Column(Integer, primary_key=True, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
@@ -1,10 +1,12 @@
 # models/sentiment.py
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Sentiment(Base):
     __tablename__ = "sentiments"
+    # Cubre también las búsquedas solo por question_id (columna inicial)
+    __table_args__ = (Index("ix_sentiments_question_id_ai_name", "question_id", "ai_name"),)
 
     id = Column(Integer, primary_key=True, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
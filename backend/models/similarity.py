@@ -6,7 +6,7 @@ class Similarity(Base):
     __tablename__ = "similarities"
 
     id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
     ai1 = Column(String, nullable=False)
     ai2 = Column(String, nullable=False)
     similarity_score = Column(Float, nullable=False)
@@ -9,32 +9,43 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.AdvancedResponseAnalyzer import AdvancedResponseAnalyzer
 from services.IntelligentComparator import IntelligentComparator
 from services.IAManager import IAManager
+from services.AnalysisStore import AnalysisStore
+from services.ComparisonSnapshotStore import ComparisonSnapshotStore
 from database import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
 router = APIRouter(prefix="/advanced-analysis", tags=["Advanced Analysis"])
 
+async def _load_comparison(db: AsyncSession, question_id: int, min_responses: int, status_code: int, detail: str):
+    """Snapshot de comparación de la pregunta y su revisión; error HTTP si no tiene suficientes respuestas"""
+    comparison, revision = await AnalysisStore.load_comparison_snapshot(db, question_id)
+    if comparison is None or len(comparison["responses"]) < min_responses:
+        raise HTTPException(status_code=status_code, detail=detail)
+    return comparison, revision
+
+def _analyze_responses(comparison: Dict[str, Any]) -> Dict[str, Any]:
+    # Idioma guardado con la pregunta: no se detecta de nuevo en cada respuesta
+    return AdvancedResponseAnalyzer(language=comparison.get("language")).analyze_responses(comparison["responses"])
+
+def _compare_responses(comparison: Dict[str, Any]) -> Dict[str, Any]:
+    return IntelligentComparator().compare_responses(comparison["responses"])
+
 @router.post("/analyze-responses")
 async def analyze_responses(
     question_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Analiza las respuestas de una pregunta específica con métricas avanzadas"""
     try:
-        # Obtener respuestas de la base de datos
-        from models.response import Response
-        responses_db = db.query(Response).filter(Response.question_id == question_id).all()
-        
-        if not responses_db:
-            raise HTTPException(status_code=404, detail="No se encontraron respuestas para esta pregunta")
-        
-        # Convertir a formato esperado por el analizador
-        responses = {resp.ai_name: resp.content for resp in responses_db}
+        # Respuestas y análisis guardados en el snapshot de la pregunta
+        comparison, revision = await _load_comparison(db, question_id, 1, 404, "No se encontraron respuestas para esta pregunta")
+        responses = comparison["responses"]
         
         # Realizar análisis avanzado
-        analyzer = AdvancedResponseAnalyzer()
-        analysis_results = analyzer.analyze_responses(responses)
+        analysis_results = await ComparisonSnapshotStore.get_section(
+            db, question_id, comparison, revision, "response_analysis", _analyze_responses
+        )
         
         return {
             "question_id": question_id,
@@ -53,23 +64,17 @@ async def analyze_responses(
 @router.post("/compare-intelligently")
 async def compare_responses_intelligently(
     question_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Compara inteligentemente las respuestas de una pregunta"""
     try:
-        # Obtener respuestas de la base de datos
-        from models.response import Response
-        responses_db = db.query(Response).filter(Response.question_id == question_id).all()
-        
-        if len(responses_db) < 2:
-            raise HTTPException(status_code=400, detail="Se necesitan al menos 2 respuestas para comparar")
-        
-        # Convertir a formato esperado
-        responses = {resp.ai_name: resp.content for resp in responses_db}
+        # Respuestas y análisis guardados en el snapshot de la pregunta
+        comparison, revision = await _load_comparison(db, question_id, 2, 400, "Se necesitan al menos 2 respuestas para comparar")
         
         # Realizar comparación inteligente
-        comparator = IntelligentComparator()
-        comparison_results = comparator.compare_responses(responses)
+        comparison_results = await ComparisonSnapshotStore.get_section(
+            db, question_id, comparison, revision, "intelligent_comparison", _compare_responses
+        )
         
         return {
             "question_id": question_id,
@@ -82,22 +87,17 @@ async def compare_responses_intelligently(
 @router.post("/quality-assessment")
 async def assess_response_quality(
     question_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Evalúa la calidad de las respuestas con métricas detalladas"""
     try:
-        # Obtener respuestas
-        from models.response import Response
-        responses_db = db.query(Response).filter(Response.question_id == question_id).all()
-        
-        if not responses_db:
-            raise HTTPException(status_code=404, detail="No se encontraron respuestas")
-        
-        responses = {resp.ai_name: resp.content for resp in responses_db}
+        # Respuestas y análisis guardados en el snapshot de la pregunta
+        comparison, revision = await _load_comparison(db, question_id, 1, 404, "No se encontraron respuestas")
         
         # Análisis de calidad
-        analyzer = AdvancedResponseAnalyzer()
-        quality_analysis = analyzer.analyze_responses(responses)
+        quality_analysis = await ComparisonSnapshotStore.get_section(
+            db, question_id, comparison, revision, "response_analysis", _analyze_responses
+        )
         
         # Ranking de calidad
         quality_rankings = []
@@ -129,24 +129,19 @@ async def assess_response_quality(
 @router.post("/consensus-analysis")
 async def analyze_consensus(
     question_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Analiza el consenso entre las respuestas de diferentes AI"""
     try:
-        # Obtener respuestas
-        from models.response import Response
-        responses_db = db.query(Response).filter(Response.question_id == question_id).all()
-        
-        if len(responses_db) < 2:
-            raise HTTPException(status_code=400, detail="Se necesitan al menos 2 respuestas para analizar consenso")
-        
-        responses = {resp.ai_name: resp.content for resp in responses_db}
+        # Respuestas y análisis guardados en el snapshot de la pregunta
+        comparison, revision = await _load_comparison(db, question_id, 2, 400, "Se necesitan al menos 2 respuestas para analizar consenso")
         
         # Análisis de consenso
-        comparator = IntelligentComparator()
-        comparison = comparator.compare_responses(responses)
+        intelligent_comparison = await ComparisonSnapshotStore.get_section(
+            db, question_id, comparison, revision, "intelligent_comparison", _compare_responses
+        )
         
-        consensus_analysis = comparison.get("consensus_analysis", {})
+        consensus_analysis = intelligent_comparison.get("consensus_analysis", {})
         
         return {
             "question_id": question_id,
@@ -162,24 +157,19 @@ async def analyze_consensus(
 @router.post("/divergence-analysis")
 async def analyze_divergence(
     question_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Analiza las divergencias entre las respuestas"""
     try:
-        # Obtener respuestas
-        from models.response import Response
-        responses_db = db.query(Response).filter(Response.question_id == question_id).all()
-        
-        if len(responses_db) < 2:
-            raise HTTPException(status_code=400, detail="Se necesitan al menos 2 respuestas para analizar divergencias")
-        
-        responses = {resp.ai_name: resp.content for resp in responses_db}
+        # Respuestas y análisis guardados en el snapshot de la pregunta
+        comparison, revision = await _load_comparison(db, question_id, 2, 400, "Se necesitan al menos 2 respuestas para analizar divergencias")
         
         # Análisis de divergencia
-        comparator = IntelligentComparator()
-        comparison = comparator.compare_responses(responses)
+        intelligent_comparison = await ComparisonSnapshotStore.get_section(
+            db, question_id, comparison, revision, "intelligent_comparison", _compare_responses
+        )
         
-        divergence_analysis = comparison.get("divergence_analysis", {})
+        divergence_analysis = intelligent_comparison.get("divergence_analysis", {})
         
         return {
             "question_id": question_id,
@@ -196,24 +186,19 @@ async def analyze_divergence(
 @router.get("/recommendations/{question_id}")
 async def get_recommendations(
     question_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Obtiene recomendaciones basadas en el análisis de respuestas"""
     try:
-        # Obtener respuestas
-        from models.response import Response
-        responses_db = db.query(Response).filter(Response.question_id == question_id).all()
-        
-        if not responses_db:
-            raise HTTPException(status_code=404, detail="No se encontraron respuestas")
-        
-        responses = {resp.ai_name: resp.content for resp in responses_db}
+        # Respuestas y análisis guardados en el snapshot de la pregunta
+        comparison, revision = await _load_comparison(db, question_id, 1, 404, "No se encontraron respuestas")
         
         # Generar recomendaciones
-        comparator = IntelligentComparator()
-        comparison = comparator.compare_responses(responses)
+        intelligent_comparison = await ComparisonSnapshotStore.get_section(
+            db, question_id, comparison, revision, "intelligent_comparison", _compare_responses
+        )
         
-        recommendations = comparison.get("recommendations", {})
+        recommendations = intelligent_comparison.get("recommendations", {})
         
         return {
             "question_id": question_id,
@@ -230,24 +215,19 @@ async def get_recommendations(
 @router.get("/detailed-comparison/{question_id}")
 async def get_detailed_comparison(
     question_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Obtiene comparaciones detalladas entre pares de AI"""
     try:
-        # Obtener respuestas
-        from models.response import Response
-        responses_db = db.query(Response).filter(Response.question_id == question_id).all()
-        
-        if len(responses_db) < 2:
-            raise HTTPException(status_code=400, detail="Se necesitan al menos 2 respuestas para comparar")
-        
-        responses = {resp.ai_name: resp.content for resp in responses_db}
+        # Respuestas y análisis guardados en el snapshot de la pregunta
+        comparison, revision = await _load_comparison(db, question_id, 2, 400, "Se necesitan al menos 2 respuestas para comparar")
         
         # Comparación detallada
-        comparator = IntelligentComparator()
-        comparison = comparator.compare_responses(responses)
+        intelligent_comparison = await ComparisonSnapshotStore.get_section(
+            db, question_id, comparison, revision, "intelligent_comparison", _compare_responses
+        )
         
-        detailed_comparisons = comparison.get("detailed_comparisons", {})
+        detailed_comparisons = intelligent_comparison.get("detailed_comparisons", {})
         
         return {
             "question_id": question_id,
@@ -1,47 +1,94 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from services.IAManager import IAManager
+from services.AnalysisPipeline import AnalysisPipeline
+from services.AnalysisStore import AnalysisStore
+from services.AnalysisExecutor import analysis_executor, AnalysisQueueFull
+from services.ResponseCache import response_cache
+from services.QuestionIndex import question_index
+from services.RateLimiter import rate_limiter
+from services.CircuitBreaker import ProviderUnavailable
+from IATools.AsyncIA import ProviderRateLimited
+from services.ComparisonSnapshotStore import ComparisonSnapshotStore
 from models.question import Question as QuestionModel
 from models.response import Response as Answer
-from database import get_db
+from database import get_db, AsyncSessionLocal
+from dependencies import get_ia_manager
 from schemas.question import QuestionRequest
 from utils.lang import detect_language
 from typing import Dict, Any
 import asyncio
+import json
 
 router = APIRouter()
 
 @router.post("/query-single-ai")
-async def query_single_ai(question_request: QuestionRequest, db: Session = Depends(get_db)):
+async def query_single_ai(
+    question_request: QuestionRequest,
+    db: AsyncSession = Depends(get_db),
+    manager: IAManager = Depends(get_ia_manager)
+):
     """
     Consulta una IA específica y retorna su respuesta
     """
     lang = detect_language(question_request.text)
     
     # Guardar la pregunta si no existe
-    existing_question = db.query(QuestionModel).filter(
-        QuestionModel.text == question_request.text
-    ).first()
+    existing_question = (await db.execute(
+        select(QuestionModel).where(QuestionModel.text == question_request.text)
+    )).scalars().first()
     
     if not existing_question:
         new_question = QuestionModel(text=question_request.text, language=lang)
         db.add(new_question)
-        db.commit()
-        db.refresh(new_question)
+        await db.commit()
+        await db.refresh(new_question)
         question_id = new_question.id
     else:
         question_id = existing_question.id
 
     # Consultar la IA específica
-    manager = IAManager()
     ai_name = question_request.ai_name  # Debe venir en el request
-    response_text = await manager.query_single_ai(question_request.text, ai_name, lang)
+    try:
+        response_text = await manager.query_single_ai(
+            question_request.text,
+            ai_name,
+            lang,
+            use_cache=question_request.use_cache,
+            timeout=question_request.deadline_seconds
+        )
+    except ProviderUnavailable:
+        return {
+            "question_id": question_id,
+            "ai_name": ai_name,
+            "response": None,
+            "status": "unavailable"
+        }
+    except ProviderRateLimited:
+        return {
+            "question_id": question_id,
+            "ai_name": ai_name,
+            "response": None,
+            "status": "rate_limited"
+        }
+
+    if response_text is None:
+        return {
+            "question_id": question_id,
+            "ai_name": ai_name,
+            "response": None,
+            "status": "timed_out"
+        }
     
     # Guardar la respuesta
     answer = Answer(question_id=question_id, ai_name=ai_name, response_text=response_text)
     db.add(answer)
-    db.commit()
-    db.refresh(answer)
+    # La pregunta puede ser una ya analizada: su snapshot de comparación deja de estar completo
+    await ComparisonSnapshotStore.invalidate(db, question_id)
+    await db.commit()
+    await db.refresh(answer)
     
     return {
         "question_id": question_id,
@@ -51,7 +98,11 @@ async def query_single_ai(question_request: QuestionRequest, db: Session = Depen
     }
 
 @router.post("/query-all-ais")
-async def query_all_ais(question_request: QuestionRequest, db: Session = Depends(get_db)):
+async def query_all_ais(
+    question_request: QuestionRequest,
+    db: AsyncSession = Depends(get_db),
+    manager: IAManager = Depends(get_ia_manager)
+):
     """
     Consulta todas las IAs en paralelo
     """
@@ -60,21 +111,138 @@ async def query_all_ais(question_request: QuestionRequest, db: Session = Depends
     # Guardar la pregunta
     new_question = QuestionModel(text=question_request.text, language=lang)
     db.add(new_question)
-    db.commit()
-    db.refresh(new_question)
+    await db.commit()
+    await db.refresh(new_question)
     
     # Consultar todas las IAs en paralelo
-    manager = IAManager()
-    responses = await manager.query_all_ias_parallel(question_request.text, lang)
+    result = await manager.query_all_ias_with_status(
+        question_request.text,
+        lang,
+        use_cache=question_request.use_cache,
+        timeout=question_request.deadline_seconds
+    )
+    responses = result["responses"]
     
     # Guardar todas las respuestas
     for ai_name, response_text in responses.items():
         answer = Answer(question_id=new_question.id, ai_name=ai_name, response_text=response_text)
         db.add(answer)
-    db.commit()
+    await db.commit()
     
     return {
         "question_id": new_question.id,
         "responses": responses,
-        "status": "completed"
-    } 
\ No newline at end of file
+        "timed_out": result["timed_out"],
+        "unavailable": result["unavailable"],
+        "rate_limited": result["rate_limited"],
+        "status": "partial" if result["timed_out"] or result["unavailable"] or result["rate_limited"] else "completed"
+    }
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Contadores de la caché de respuestas: aciertos, fallos, latencia ahorrada por proveedor
+    """
+    return response_cache.stats()
+
+@router.get("/cache/questions")
+async def get_question_index_stats():
+    """
+    Estado del índice semántico de preguntas (caché de preguntas casi duplicadas)
+    """
+    return question_index.stats()
+
+@router.delete("/cache")
+async def clear_cache(persistent: bool = False):
+    """
+    Vacía la caché en memoria (y la tabla persistente si persistent=true)
+    """
+    removed = await response_cache.clear(persistent)
+    return {"removed": removed, "persistent": persistent}
+
+@router.get("/rate-limits")
+async def get_rate_limits():
+    """
+    Estado del limitador por proveedor: cuota, saldo, solicitudes en cola, throttled y 429 recibidos
+    """
+    return rate_limiter.stats()
+
+@router.post("/query-all-ais/stream")
+async def query_all_ais_stream(
+    question_request: QuestionRequest,
+    manager: IAManager = Depends(get_ia_manager)
+):
+    """
+    Consulta todas las IAs en paralelo y transmite (Server-Sent Events) cada respuesta en
+    orden de llegada, seguida de los eventos de cada etapa de análisis.
+
+    Eventos: question, response, timeout, unavailable, rate_limited, response_analysis, stage, done, error
+    """
+    # Sin lugar en la cola de análisis no se consulta a las IAs ni se guarda la pregunta:
+    # una vez abierto el stream el error solo podría viajar como evento
+    try:
+        analysis_executor.ensure_capacity()
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    lang = detect_language(question_request.text)
+
+    async def event_stream():
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def on_event(event, data):
+            await queue.put((event, data))
+
+        async def run_pipeline():
+            # La sesión vive dentro del stream: la de Depends podría cerrarse antes de terminar
+            async with AsyncSessionLocal() as db:
+                new_question = await AnalysisStore.create_question(db, question_request.text, lang)
+                try:
+                    await queue.put(("question", {"question_id": new_question.id, "question": new_question.text, "language": lang}))
+                    results = await AnalysisPipeline(manager).run(
+                        question_request.text,
+                        lang,
+                        on_event=on_event,
+                        use_cache=question_request.use_cache,
+                        timeout=question_request.deadline_seconds
+                    )
+                    await AnalysisStore.save_analysis(db, new_question.id, results)
+                except BaseException:
+                    # Cliente desconectado o análisis fallido: no dejar la pregunta sin resultados en el historial
+                    try:
+                        await asyncio.shield(AnalysisStore.discard_question(db, new_question.id))
+                    except Exception as e:
+                        print(f"⚠️ No se pudo borrar la pregunta {new_question.id} sin análisis: {str(e)}")
+                    raise
+            await question_index.add(new_question.id, new_question.text, lang)
+            await queue.put(("done", {"question_id": new_question.id, **results}))
+
+        pipeline_task = asyncio.ensure_future(run_pipeline())
+        pipeline_task.add_done_callback(lambda task: queue.put_nowait(None))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield _sse(*item)
+            if not pipeline_task.cancelled() and pipeline_task.exception() is not None:
+                yield _sse("error", {"detail": str(pipeline_task.exception())})
+        finally:
+            if not pipeline_task.done():
+                # El cliente se desconectó: cancelar consultas y análisis pendientes
+                pipeline_task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=_json_default)}\n\n"
+
+def _json_default(obj):
+    # Escalares de numpy/torch (scores de los pipelines) y fechas
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
@@ -1,25 +1,29 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, List
+import asyncio
 import os
 import sys
 
 # Agregar el directorio padre al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.IAManager import IAManager
+from services.IAManager import IAManager, PROVIDER_KEYS
+from services.CircuitBreaker import circuit_breakers, ProviderUnavailable, CLOSED, OPEN, HALF_OPEN
+from IATools.AsyncIA import ProviderRateLimited
+from dependencies import get_ia_manager
 
 router = APIRouter(prefix="/health", tags=["Health Check"])
 
 @router.get("/ai-status")
 async def check_ai_status():
-    """Verifica el estado de todas las IAs configuradas"""
+    """
+    Estado de las IAs configuradas a partir del estado compartido de sus circuit breakers:
+    circuito, tasa de error y latencia recientes (no construye clientes ni llama a los proveedores)
+    """
     try:
-        # Crear una instancia temporal del IAManager para verificar
-        manager = IAManager()
-        
-        # Obtener información de las IAs disponibles
-        available_ais = list(manager.ias.keys())
-        
+        breaker_stats = circuit_breakers.stats()
+        queried = {ai_name for ai_name, _ in PROVIDER_KEYS}
+
         # Verificar API keys
         api_keys_status = {}
         api_keys = {
@@ -33,16 +37,24 @@ async def check_ai_status():
         
         for env_key, ai_name in api_keys.items():
             api_key = os.getenv(env_key)
-            if api_key and api_key.strip() and len(api_key.strip()) > 10:
+            if api_key and api_key.strip() and len(api_key.strip()) > 10 and ai_name in queried:
+                circuit = breaker_stats.get(ai_name)
+                state = circuit["state"] if circuit else CLOSED
                 api_keys_status[ai_name] = {
                     "configured": True,
-                    "status": "available" if ai_name in available_ais else "error"
+                    "status": _status_for_state(state),
+                    "circuit": circuit or {"state": CLOSED, "recent_requests": 0}
                 }
             else:
                 api_keys_status[ai_name] = {
-                    "configured": False,
-                    "status": "missing_key"
+                    "configured": bool(api_key and api_key.strip()),
+                    "status": "missing_key" if ai_name in queried else "disabled"
                 }
+
+        available_ais = [
+            ai_name for ai_name, status in api_keys_status.items()
+            if status["status"] in ("available", "recovering")
+        ]
         
         return {
             "status": "healthy" if available_ais else "degraded",
@@ -55,12 +67,26 @@ async def check_ai_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al verificar estado: {str(e)}")
 
+@router.get("/circuits")
+async def get_circuits():
+    """Circuit breakers por proveedor: estado, tasa de error y latencia recientes"""
+    return {
+        "settings": circuit_breakers.settings,
+        "providers": circuit_breakers.stats()
+    }
+
+@router.post("/circuits/{ai_name}/reset")
+async def reset_circuit(ai_name: str):
+    """Cierra manualmente el circuito de un proveedor"""
+    if ai_name not in {name for name, _ in PROVIDER_KEYS}:
+        raise HTTPException(status_code=404, detail=f"IA '{ai_name}' no registrada")
+    circuit_breakers.get(ai_name).reset()
+    return {"ai_name": ai_name, "state": CLOSED}
+
 @router.get("/test-connection")
-async def test_ai_connections():
-    """Prueba la conexión con las IAs disponibles"""
+async def test_ai_connections(manager: IAManager = Depends(get_ia_manager)):
+    """Prueba la conexión con las IAs disponibles usando los clientes compartidos de la app"""
     try:
-        manager = IAManager()
-        
         if not manager.ias:
             return {
                 "status": "no_ais_configured",
@@ -70,25 +96,25 @@ async def test_ai_connections():
         # Probar con una pregunta simple
         test_question = "Hello, this is a test. Please respond with 'OK' if you can read this."
         
-        results = {}
-        for ai_name, ia in manager.ias.items():
+        async def test_ai(ai_name):
             try:
-                response = ia.get_response(test_question)
-                if response and not response.startswith("Error:"):
-                    results[ai_name] = {
+                response = await manager.query_single_ai(test_question, ai_name, use_cache=False)
+                if response is None:
+                    return ai_name, {"status": "error", "error": "timeout"}
+                if not response.startswith("Error"):
+                    return ai_name, {
                         "status": "connected",
                         "response_preview": response[:100] + "..." if len(response) > 100 else response
                     }
-                else:
-                    results[ai_name] = {
-                        "status": "error",
-                        "error": response
-                    }
+                return ai_name, {"status": "error", "error": response}
+            except ProviderUnavailable:
+                return ai_name, {"status": "circuit_open", "error": "Circuito abierto"}
+            except ProviderRateLimited as e:
+                return ai_name, {"status": "rate_limited", "error": str(e)}
             except Exception as e:
-                results[ai_name] = {
-                    "status": "error",
-                    "error": str(e)
-                }
+                return ai_name, {"status": "error", "error": str(e)}
+
+        results = dict(await asyncio.gather(*(test_ai(ai_name) for ai_name in manager.ias)))
         
         successful_connections = sum(1 for result in results.values() if result["status"] == "connected")
         
@@ -103,6 +129,14 @@ async def test_ai_connections():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al probar conexiones: {str(e)}")
 
+@router.get("/connection-pools")
+async def get_connection_pools(manager: IAManager = Depends(get_ia_manager)):
+    """Clientes compartidos y pools keep-alive por proveedor: conexiones nuevas vs reutilizadas"""
+    return manager.pool_stats()
+
+def _status_for_state(state: str) -> str:
+    return {CLOSED: "available", HALF_OPEN: "recovering", OPEN: "unavailable"}[state]
+
 def _generate_recommendations(available_ais: List[str], api_keys_status: Dict) -> List[str]:
     """Genera recomendaciones basadas en el estado actual"""
     recommendations = []
@@ -113,14 +147,14 @@ def _generate_recommendations(available_ais: List[str], api_keys_status: Dict) -
     if len(available_ais) < 2:
         recommendations.append("Solo una IA disponible. Considera configurar más para comparaciones.")
     
-    # Verificar IAs con API keys pero sin conexión
+    # Verificar IAs con API keys pero con el circuito abierto
     configured_but_unavailable = [
         ai_name for ai_name, status in api_keys_status.items()
-        if status["configured"] and status["status"] == "error"
+        if status["configured"] and status["status"] == "unavailable"
     ]
     
     if configured_but_unavailable:
-        recommendations.append(f"IAs con API key pero sin conexión: {', '.join(configured_but_unavailable)}")
+        recommendations.append(f"IAs con API key pero sin conexión (circuito abierto): {', '.join(configured_but_unavailable)}")
     
     # Verificar IAs populares no configuradas
     popular_ais = ["ChatGPT", "Gemini", "Claude"]
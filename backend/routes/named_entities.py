@@ -1,21 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from database import SessionLocal
+from database import get_db
+from services.ComparisonSnapshotStore import ComparisonSnapshotStore
 from models.named_entity import NamedEntity
 from schemas.named_entity import NamedEntityCreate
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=NamedEntityCreate)
-def create_named_entity(entity: NamedEntityCreate, db: Session = Depends(get_db)):
+async def create_named_entity(entity: NamedEntityCreate, db: AsyncSession = Depends(get_db)):
     db_entity = NamedEntity(
         question_id=entity.question_id,
         ai_name=entity.ai_name,
@@ -23,17 +18,18 @@ def create_named_entity(entity: NamedEntityCreate, db: Session = Depends(get_db)
         label=entity.label
     )
     db.add(db_entity)
-    db.commit()
-    db.refresh(db_entity)
+    await ComparisonSnapshotStore.invalidate(db, db_entity.question_id)
+    await db.commit()
+    await db.refresh(db_entity)
     return db_entity
 
 @router.get("/", response_model=List[NamedEntityCreate])
-def get_all_named_entities(db: Session = Depends(get_db)):
-    return db.query(NamedEntity).all()
+async def get_all_named_entities(db: AsyncSession = Depends(get_db)):
+    return (await db.execute(select(NamedEntity))).scalars().all()
 
 @router.get("/by-question/{question_id}", response_model=List[NamedEntityCreate])
-def get_named_entities_by_question(question_id: int, db: Session = Depends(get_db)):
-    entities = db.query(NamedEntity).filter(NamedEntity.question_id == question_id).all()
+async def get_named_entities_by_question(question_id: int, db: AsyncSession = Depends(get_db)):
+    entities = (await db.execute(select(NamedEntity).where(NamedEntity.question_id == question_id))).scalars().all()
     if not entities:
         raise HTTPException(status_code=404, detail="No named entities found for this question_id")
     return entities
\ No newline at end of file
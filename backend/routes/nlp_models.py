@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+import asyncio
+import sys
+import os
+
+# Agregar el directorio padre al path para importar servicios
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ModelRegistry import model_registry
+from services.AnalysisExecutor import analysis_executor
+
+router = APIRouter(prefix="/nlp-models", tags=["NLP Models"])
+
+@router.get("/")
+async def get_nlp_models():
+    """Estado de los modelos NLP: cargados, fijados, memoria y tiempo de carga"""
+    return model_registry.stats()
+
+@router.get("/executor")
+async def get_analysis_executor():
+    """Estado del ejecutor de análisis: modo, workers, tareas pendientes y rechazadas"""
+    return analysis_executor.stats()
+
+@router.post("/warmup")
+async def warmup_nlp_models(names: Optional[List[str]] = None):
+    """Precarga los modelos indicados (todos si no se indica ninguno)"""
+    unknown = [name for name in (names or []) if name not in model_registry.loaders]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Modelos no registrados: {', '.join(unknown)}")
+
+    loop = asyncio.get_event_loop()
+    load_times = await loop.run_in_executor(None, model_registry.warmup, names)
+    return {
+        "loaded": load_times,
+        "stats": model_registry.stats()
+    }
+
+@router.post("/{name}/pin")
+async def pin_nlp_model(name: str):
+    """Fija un modelo para que el presupuesto de memoria nunca lo desaloje"""
+    if not model_registry.pin(name):
+        raise HTTPException(status_code=404, detail=f"Modelo '{name}' no registrado")
+    return {"name": name, "pinned": True}
+
+@router.post("/{name}/unpin")
+async def unpin_nlp_model(name: str):
+    """Quita la fijación de un modelo"""
+    if not model_registry.unpin(name):
+        raise HTTPException(status_code=404, detail=f"Modelo '{name}' no registrado")
+    return {"name": name, "pinned": False}
+
+@router.post("/{name}/evict")
+async def evict_nlp_model(name: str):
+    """Libera un modelo de memoria; se volverá a cargar en el próximo uso"""
+    if name not in model_registry.loaders:
+        raise HTTPException(status_code=404, detail=f"Modelo '{name}' no registrado")
+    evicted = model_registry.evict(name)
+    return {"name": name, "evicted": evicted}
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from services.IAManager import IAManager
-from services.SimilarityAnalyzer import SimilarityAnalyzer
-from services.SummaryAnalyzer import SummaryAnalyzer
+from services.AnalysisPipeline import AnalysisPipeline
+from services.AnalysisStore import AnalysisStore
+from services.AnalysisExecutor import analysis_executor, AnalysisQueueFull
+from services.QuestionIndex import question_index
 from models.question import Question as QuestionModel
 from models.response import Response as Answer
 from models.summary import Summary as Summary
@@ -12,9 +15,10 @@ from models.contradiction import Contradiction as Contradiction
 from models.named_entity import NamedEntity as NamedEntity
 from models.sentiment import Sentiment as Sentiment
 from database import get_db
+from dependencies import get_ia_manager
 from schemas.question import QuestionRequest
-from services.NLPAnalyzer import NLPAnalyzer
 from utils.lang import detect_language
+from typing import Optional
 
 import numpy as np
 import sys
@@ -34,178 +38,109 @@ def convert_np(obj):
     return obj
 
 @router.post("/")
-async def ask_question(question_request: QuestionRequest, db: Session = Depends(get_db)):
-    print('aca esta')
-
+async def ask_question(
+    question_request: QuestionRequest,
+    db: AsyncSession = Depends(get_db),
+    manager: IAManager = Depends(get_ia_manager)
+):
     lang = detect_language(question_request.text)
 
-    # 1️⃣ Guardar la pregunta en la base de datos
-    new_question = QuestionModel(text=question_request.text, language=lang)
-    
-    db.add(new_question)
-    db.commit()
-    db.refresh(new_question)
-
-    # 2️⃣ Llamar al IA Manager
-    manager = IAManager()
-    manager.query_ias(question_request.text, lang)
-    responses = manager.get_responses()
-
-    # 3️⃣ Guardar las respuestas en la base de datos
-    for ai_name, response_text in responses.items():
-        answer = Answer(question_id=new_question.id, ai_name=ai_name, response_text=response_text)
-        db.add(answer)
-    db.commit()
-
-
-    # 4️⃣ Analizar similitudes
-    similarity_results = SimilarityAnalyzer.analyze(responses)
-    for pair, score in similarity_results.items():
-        ai1, ai2 = pair.split(" vs ")
-        db.add(Similarity(
-            question_id=new_question.id,
-            ai1=ai1,
-            ai2=ai2,
-            similarity_score=score
-        ))
-    db.commit()
-
-    # 6️⃣ NLP Analysis
-    nlp_analyzer = NLPAnalyzer(responses)
+    # 0️⃣ Pregunta casi idéntica ya analizada: devolver la comparación guardada
+    if question_request.use_cache:
+        match = await question_index.find_similar(question_request.text, lang)
+        if match is not None:
+            matched_id, question_similarity = match
+            stored = await AnalysisStore.load_comparison(db, matched_id)
+            if stored is not None:
+                return convert_np({
+                    **stored,
+                    "cached": True,
+                    "matched_question_id": matched_id,
+                    "question_similarity": question_similarity
+                })
+
+    # Sin lugar en la cola de análisis no se consulta a las IAs ni se guarda la pregunta
+    try:
+        analysis_executor.ensure_capacity()
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
-    # 6.1 Análisis de similitud semántica
-    semantic_similarities = nlp_analyzer.analyze_semantic_similarity()
-    for result in semantic_similarities:
-        similarity_record = SemanticSimilarity(
-            question_id=new_question.id,
-            ai1=result["ai1"],
-            ai2=result["ai2"],
-            similarity_score=float(result["score"])
-        )
-        db.add(similarity_record)
+    # 1️⃣ Guardar la pregunta en la base de datos
+    new_question = await AnalysisStore.create_question(db, question_request.text, lang)
 
-    # 6.2 Análisis de contradicciones (NLI)
-    contradictions = nlp_analyzer.detect_contradictions()
-    for result in contradictions:
-        contradiction_record = Contradiction(
-            question_id=new_question.id,
-            ai1=result["ai1"],
-            ai2=result["ai2"],
-            label=result["label"],
-            score=float(result["score"])
+    # 2️⃣ Consultar las IAs en paralelo y analizar cada respuesta a medida que llega
+    try:
+        results = await AnalysisPipeline(manager).run(
+            question_request.text,
+            lang,
+            use_cache=question_request.use_cache,
+            timeout=question_request.deadline_seconds
         )
-        db.add(contradiction_record)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
-    # 6.3 Extracción de entidades nombradas
-    named_entities = nlp_analyzer.extract_named_entities()
-    for ai_name, entities in named_entities.items():
-        for entity in entities:
-            entity_record = NamedEntity(
-                question_id=new_question.id,
-                ai_name=ai_name,
-                entity=entity["word"],
-                label=entity["entity_group"]
-            )
-            db.add(entity_record)
-
-    # 6.4 Análisis de sentimiento
-    sentiments = nlp_analyzer.analyze_sentiment()
-    for ai_name, results in sentiments.items():
-        for result in results:
-            sentiment_record = Sentiment(
-                question_id=new_question.id,
-                ai_name=ai_name,
-                label=result["label"],
-                score=float(result["score"])
-            )
-            db.add(sentiment_record)
-
-    db.commit()
-
-    # 6️⃣  Generar y guardar el resumen en la base de datos
-    summary_analyzer = SummaryAnalyzer()
-    summary_text = summary_analyzer.generate_summary(list(responses.values()), lang)
-
-    new_summary = Summary(question_id=new_question.id, summary_text=summary_text)  # ⬅ Creando el objeto
-    db.add(new_summary)  # ⬅ Agregando a la base de datos
-    db.commit()  # ⬅ Guardando cambios en la base de datos
-    db.refresh(new_summary)  # ⬅ Refrescando el objeto para obtener ID
+    # 3️⃣ Guardar respuestas y análisis
+    await AnalysisStore.save_analysis(db, new_question.id, results)
+    await question_index.add(new_question.id, new_question.text, lang)
 
     return convert_np({
         "question": new_question.text,
         "question_id": new_question.id,
-        "responses": responses,
-        "similarities": similarity_results,
-        "semantic_similarities": semantic_similarities,
-        "contradictions": contradictions,
-        "named_entities": named_entities,
-        "sentiments": sentiments,
-        "summary": summary_text
+        **results
     })
 
 @router.get("/{question_id}")
-async def get_question_by_id(question_id: int, db: Session = Depends(get_db)):
-    question = db.query(QuestionModel).filter(QuestionModel.id == question_id).first()
-    if not question:
+async def get_question_by_id(question_id: int, db: AsyncSession = Depends(get_db)):
+    # Snapshot de la comparación (una búsqueda por clave primaria); se reconstruye si no existe
+    comparison = await AnalysisStore.load_comparison(db, question_id)
+    if not comparison:
         return {"detail": "Question not found"}
 
-    responses = db.query(Answer).filter(Answer.question_id == question_id).all()
-    summary = db.query(Summary).filter(Summary.question_id == question_id).first()
-    similarities = db.query(Similarity).filter(Similarity.question_id == question_id).all()
-    semantic_similarities = db.query(SemanticSimilarity).filter(SemanticSimilarity.question_id == question_id).all()
-    contradictions = db.query(Contradiction).filter(Contradiction.question_id == question_id).all()
-    named_entities = db.query(NamedEntity).filter(NamedEntity.question_id == question_id).all()
-    sentiments = db.query(Sentiment).filter(Sentiment.question_id == question_id).all()
+    similarities = []
+    for pair, score in comparison["similarities"].items():
+        ai1, ai2 = pair.split(" vs ")
+        similarities.append({"ai1": ai1, "ai2": ai2, "score": score})
 
     return {
-        "id": question.id,
-        "text": question.text,
-        "summary": summary.summary_text if summary else None,
-        "similarity": [
-            {"ai1": s.ai1, "ai2": s.ai2, "score": s.similarity_score} for s in similarities
-        ],
-        "semantic_similarity": [
-            {"ai1": s.ai1, "ai2": s.ai2, "score": s.similarity_score} for s in semantic_similarities
-        ],
-        "contradictions": [
-            {"ai1": c.ai1, "ai2": c.ai2, "label": c.label, "score": c.score} for c in contradictions
-        ],
+        "id": comparison["question_id"],
+        "text": comparison["question"],
+        "summary": comparison["summary"],
+        "similarity": similarities,
+        "semantic_similarity": comparison["semantic_similarities"],
+        "contradictions": comparison["contradictions"],
         "named_entities": {
-            e.ai_name: [{"entity": e.entity, "label": e.label} for e in named_entities if e.ai_name == e.ai_name]
-            for e in named_entities
-        },
-        "sentiments": {
-            s.ai_name: [{"label": s.label, "score": s.score} for s in sentiments if s.ai_name == s.ai_name]
-            for s in sentiments
+            ai_name: [{"entity": e["word"], "label": e["entity_group"]} for e in entities]
+            for ai_name, entities in comparison["named_entities"].items()
         },
+        "sentiments": comparison["sentiments"],
         "responses": [
-            {"iaName": r.ai_name, "text": r.response_text} for r in responses
+            {"iaName": ai_name, "text": text} for ai_name, text in comparison["responses"].items()
         ],
     }
 
 
 @router.get("/")
-async def get_questions(db: Session = Depends(get_db)):
-    questions = db.query(QuestionModel).all()
-    questions_with_answers = []
-    
-    for q in questions:
-        answers = db.query(Answer).filter(Answer.question_id == q.id).all()
-        questions_with_answers.append({
-            "id": q.id,
-            "text": q.text,
-            "answers": [{"ai_name": a.ai_name, "response": a.response_text} for a in answers],
-            "created_at": q.created_at
-        })
-    
-    return questions_with_answers
+async def get_questions(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    preview_chars: int = Query(0, ge=0, le=500),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Historial de preguntas paginado (más recientes primero).
+    Pasar next_cursor de la respuesta como cursor para pedir la página siguiente.
+    """
+    try:
+        return await AnalysisStore.list_questions(db, limit, cursor, preview_chars)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/seed")
-async def seed_test_data(db: Session = Depends(get_db)):
+async def seed_test_data(db: AsyncSession = Depends(get_db)):
     """Crea datos de prueba para testing"""
     try:
         # Verificar si ya hay datos
-        existing_questions = db.query(QuestionModel).count()
+        existing_questions = await db.scalar(select(func.count()).select_from(QuestionModel))
         if existing_questions > 0:
             return {"message": f"Ya existen {existing_questions} preguntas en la base de datos"}
         
@@ -237,8 +172,8 @@ async def seed_test_data(db: Session = Depends(get_db)):
             # Crear pregunta
             question = QuestionModel(text=test_data["text"], language=test_data["language"])
             db.add(question)
-            db.commit()
-            db.refresh(question)
+            await db.commit()
+            await db.refresh(question)
             
             # Crear respuestas
             for ai_name, response_text in test_data["responses"].items():
@@ -251,7 +186,7 @@ async def seed_test_data(db: Session = Depends(get_db)):
                 "responses_count": len(test_data["responses"])
             })
         
-        db.commit()
+        await db.commit()
         
         return {
             "message": f"Se crearon {len(created_questions)} preguntas de prueba",
@@ -259,27 +194,28 @@ async def seed_test_data(db: Session = Depends(get_db)):
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return {"error": f"Error creando datos de prueba: {str(e)}"}
 
 @router.delete("/{question_id}")
-def delete_question(question_id: int, db: Session = Depends(get_db)):
-    question = db.query(QuestionModel).filter(QuestionModel.id == question_id).first()
+async def delete_question(question_id: int, db: AsyncSession = Depends(get_db)):
+    question = (await db.execute(select(QuestionModel).where(QuestionModel.id == question_id))).scalars().first()
 
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
 
     # Eliminar respuestas asociadas
-    db.query(Answer).filter(Answer.question_id == question_id).delete()
+    await db.execute(delete(Answer).where(Answer.question_id == question_id))
 
     # Eliminar similitudes asociadas
-    #db.query(Similarity).filter(Similarity.question_id == question_id).delete()
+    #await db.execute(delete(Similarity).where(Similarity.question_id == question_id))
 
     # Eliminar resumen asociado
-    db.query(Summary).filter(Summary.question_id == question_id).delete()
+    await db.execute(delete(Summary).where(Summary.question_id == question_id))
 
     # Eliminar la pregunta
-    db.delete(question)
-    db.commit()
+    await db.delete(question)
+    await db.commit()
+    question_index.remove(question_id)
 
     return {"message": "Question and related data deleted successfully"}
@@ -1,21 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from database import SessionLocal
+from database import get_db
+from services.ComparisonSnapshotStore import ComparisonSnapshotStore
 from models.semantic_similarity import SemanticSimilarity
 from schemas.semantic_similarity import SemanticSimilarityCreate
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=SemanticSimilarityCreate)
-def create_semantic_similarity(sim: SemanticSimilarityCreate, db: Session = Depends(get_db)):
+async def create_semantic_similarity(sim: SemanticSimilarityCreate, db: AsyncSession = Depends(get_db)):
     db_similarity = SemanticSimilarity(
         question_id=sim.question_id,
         ai1=sim.ai1,
@@ -23,17 +18,18 @@ def create_semantic_similarity(sim: SemanticSimilarityCreate, db: Session = Depe
         similarity_score=sim.similarity_score
     )
     db.add(db_similarity)
-    db.commit()
-    db.refresh(db_similarity)
+    await ComparisonSnapshotStore.invalidate(db, db_similarity.question_id)
+    await db.commit()
+    await db.refresh(db_similarity)
     return db_similarity
 
 @router.get("/", response_model=List[SemanticSimilarityCreate])
-def get_all_semantic_similarities(db: Session = Depends(get_db)):
-    return db.query(SemanticSimilarity).all()
+async def get_all_semantic_similarities(db: AsyncSession = Depends(get_db)):
+    return (await db.execute(select(SemanticSimilarity))).scalars().all()
 
 @router.get("/by-question/{question_id}", response_model=List[SemanticSimilarityCreate])
-def get_semantic_similarities_by_question(question_id: int, db: Session = Depends(get_db)):
-    sims = db.query(SemanticSimilarity).filter(SemanticSimilarity.question_id == question_id).all()
+async def get_semantic_similarities_by_question(question_id: int, db: AsyncSession = Depends(get_db)):
+    sims = (await db.execute(select(SemanticSimilarity).where(SemanticSimilarity.question_id == question_id))).scalars().all()
     if not sims:
         raise HTTPException(status_code=404, detail="No semantic similarities found for this question_id")
     return sims
@@ -1,38 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from services.ComparisonSnapshotStore import ComparisonSnapshotStore
 from models.similarity import Similarity
 from schemas.similarity import SimilarityCreate
 from typing import List
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=SimilarityCreate)
-def create_similarity(similarity: SimilarityCreate, db: Session = Depends(get_db)):
+async def create_similarity(similarity: SimilarityCreate, db: AsyncSession = Depends(get_db)):
     db_similarity = Similarity(
         question_id=similarity.question_id,
         model_pair=similarity.model_pair,
         score=similarity.score
     )
     db.add(db_similarity)
-    db.commit()
-    db.refresh(db_similarity)
+    await ComparisonSnapshotStore.invalidate(db, db_similarity.question_id)
+    await db.commit()
+    await db.refresh(db_similarity)
     return db_similarity
 
 @router.get("/", response_model=List[SimilarityCreate])
-def get_all_similarities(db: Session = Depends(get_db)):
-    return db.query(Similarity).all()
+async def get_all_similarities(db: AsyncSession = Depends(get_db)):
+    return (await db.execute(select(Similarity))).scalars().all()
 
 @router.get("/by-question/{question_id}", response_model=List[SimilarityCreate])
-def get_similarities_by_question(question_id: int, db: Session = Depends(get_db)):
-    similarities = db.query(Similarity).filter(Similarity.question_id == question_id).all()
+async def get_similarities_by_question(question_id: int, db: AsyncSession = Depends(get_db)):
+    similarities = (await db.execute(select(Similarity).where(Similarity.question_id == question_id))).scalars().all()
     if not similarities:
         raise HTTPException(status_code=404, detail="No similarities found for this question_id")
     return similarities
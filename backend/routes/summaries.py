@@ -1,37 +1,33 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from services.ComparisonSnapshotStore import ComparisonSnapshotStore
 from models.summary import Summary
 from schemas.summary import SummaryCreate
 from typing import List
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=SummaryCreate)
-def create_summary(summary: SummaryCreate, db: Session = Depends(get_db)):
+async def create_summary(summary: SummaryCreate, db: AsyncSession = Depends(get_db)):
     db_summary = Summary(
         question_id=summary.question_id,
         summary_text=summary.summary_text
     )
     db.add(db_summary)
-    db.commit()
-    db.refresh(db_summary)
+    await ComparisonSnapshotStore.invalidate(db, db_summary.question_id)
+    await db.commit()
+    await db.refresh(db_summary)
     return db_summary
 
 @router.get("/", response_model=List[SummaryCreate])
-def get_summaries(db: Session = Depends(get_db)):
-    return db.query(Summary).all()
+async def get_summaries(db: AsyncSession = Depends(get_db)):
+    return (await db.execute(select(Summary))).scalars().all()
 
 @router.get("/by-question/{question_id}", response_model=List[SummaryCreate])
-def get_summaries_by_question(question_id: int, db: Session = Depends(get_db)):
-    summaries = db.query(Summary).filter(Summary.question_id == question_id).all()
+async def get_summaries_by_question(question_id: int, db: AsyncSession = Depends(get_db)):
+    summaries = (await db.execute(select(Summary).where(Summary.question_id == question_id))).scalars().all()
     if not summaries:
         raise HTTPException(status_code=404, detail="No summaries found for this question_id")
     return summaries
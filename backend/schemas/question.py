@@ -5,6 +5,8 @@ from typing import Optional
 class QuestionRequest(BaseModel):
     text: str
     ai_name: Optional[str] = None
+    use_cache: bool = True  # False para forzar la consulta a los proveedores
+    deadline_seconds: Optional[float] = None  # Plazo de la solicitud (acotado por REQUEST_DEADLINE_SECONDS)
 
 class QuestionResponse(BaseModel):
     id: int
@@ -0,0 +1,92 @@
+"""
+Compara el guardado de análisis por filas (ORM, un db.add por resultado) con el
+escritor masivo (executemany y COPY) a 5, 20 y 50 respuestas por pregunta.
+
+Uso (desde backend/, con DATABASE_URL apuntando a una base de pruebas ya migrada):
+    python scripts/benchmark_bulk_writer.py [--repeat 5] [--entities 20]
+
+Las preguntas creadas se borran al terminar cada medición.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+
+from database import AsyncSessionLocal
+from models.question import Question as QuestionModel
+from services.BulkWriter import AnalysisBulkWriter, build_rows
+
+RESPONSE_COUNTS = (5, 20, 50)
+
+
+def synthetic_results(responses: int, entities_per_response: int):
+    names = [f"AI{i}" for i in range(responses)]
+    pairs = [(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+    return {
+        "responses": {name: f"Respuesta de {name} " * 40 for name in names},
+        "similarities": {f"{a} vs {b}": 0.5 for a, b in pairs},
+        "semantic_similarities": [{"ai1": a, "ai2": b, "score": 0.8} for a, b in pairs],
+        "contradictions": [{"ai1": a, "ai2": b, "label": "neutral", "score": 0.7} for a, b in pairs],
+        "named_entities": {
+            name: [{"word": f"Entidad {j}", "entity_group": "ORG"} for j in range(entities_per_response)]
+            for name in names
+        },
+        "sentiments": {name: [{"label": "POSITIVE", "score": 0.9}] for name in names},
+        "summary": "Resumen de prueba",
+    }
+
+
+async def save_with_orm(db, question_id, results):
+    """Camino anterior: un objeto ORM por fila y un commit al final"""
+    for model, rows in build_rows(question_id, results):
+        for row in rows:
+            db.add(model(**row))
+    await db.commit()
+
+
+async def measure(mode, results):
+    async with AsyncSessionLocal() as db:
+        question = QuestionModel(text="benchmark bulk writer", language="es")
+        db.add(question)
+        await db.commit()
+        try:
+            start = time.perf_counter()
+            if mode == "orm":
+                await save_with_orm(db, question.id, results)
+            else:
+                await AnalysisBulkWriter(mode).write(db, question.id, results)
+            return (time.perf_counter() - start) * 1000
+        finally:
+            for model, _ in build_rows(question.id, results):
+                await db.execute(delete(model).where(model.question_id == question.id))
+            await db.delete(question)
+            await db.commit()
+
+
+async def main(repeat: int, entities: int):
+    print(f"{'respuestas':>10} {'filas':>7} {'orm ms':>9} {'executemany ms':>15} {'copy ms':>9}")
+    for responses in RESPONSE_COUNTS:
+        results = synthetic_results(responses, entities)
+        total_rows = sum(len(rows) for _, rows in build_rows(0, results))
+        medians = {}
+        for mode in ("orm", "executemany", "copy"):
+            await measure(mode, results)  # calentamiento
+            medians[mode] = statistics.median([await measure(mode, results) for _ in range(repeat)])
+        print(
+            f"{responses:>10} {total_rows:>7} {medians['orm']:>9.1f} "
+            f"{medians['executemany']:>15.1f} {medians['copy']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--entities", type=int, default=20, help="entidades por respuesta")
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat, args.entities))
@@ -0,0 +1,78 @@
+"""
+Compara difflib.SequenceMatcher (el cálculo anterior de SimilarityAnalyzer) con las
+métricas del motor léxico sobre respuestas sintéticas de 2k a 20k caracteres.
+
+Uso (desde backend/):
+    python scripts/benchmark_lexical_similarity.py [--responses 5] [--repeat 3]
+
+Cada fila es el tiempo de calcular todos los pares de respuestas (mediana de --repeat).
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.LexicalSimilarity import METRICS, LexicalSimilarityEngine
+
+LENGTHS = (2000, 5000, 10000, 20000)
+
+
+def synthetic_responses(count: int, length: int, seed: int = 7):
+    """Respuestas con una base común (60%) y partes propias, como las de distintos proveedores"""
+    rng = random.Random(seed)
+    vocabulary = [f"palabra{i}" for i in range(800)]
+    shared = [rng.choice(vocabulary) for _ in range(length // 8)]
+    responses = {}
+    for i in range(count):
+        words = [word if rng.random() < 0.6 else rng.choice(vocabulary) for word in shared]
+        text = ""
+        for position, word in enumerate(words):
+            text += word + ("\n- " if position % 25 == 24 else " ")
+        responses[f"AI{i}"] = text[:length]
+    return responses
+
+
+def sequence_matcher_pairwise(responses):
+    names = list(responses)
+    return {
+        f"{a} vs {b}": SequenceMatcher(None, responses[a], responses[b]).ratio()
+        for i, a in enumerate(names) for b in names[i + 1:]
+    }
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main(count: int, repeat: int):
+    metrics = list(METRICS)
+    print(f"{'caracteres':>10} {'difflib ms':>11} " + " ".join(f"{name + ' ms':>11}" for name in metrics))
+    for length in LENGTHS:
+        responses = synthetic_responses(count, length)
+        baseline_ms, baseline = timed(lambda: sequence_matcher_pairwise(responses), repeat)
+        row = f"{length:>10} {baseline_ms:>11.1f} "
+        scores = {"difflib": statistics.mean(baseline.values())}
+        for name in metrics:
+            engine = LexicalSimilarityEngine(name)
+            elapsed, result = timed(lambda: engine.pairwise(responses), repeat)
+            row += f"{elapsed:>11.1f} "
+            scores[name] = statistics.mean(result.values())
+        print(row + " | score medio: " + ", ".join(f"{name}={value:.3f}" for name, value in scores.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.responses, args.repeat)
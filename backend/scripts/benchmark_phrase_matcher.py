@@ -0,0 +1,179 @@
+"""
+Mide AdvancedResponseAnalyzer.analyze_responses completo (legibilidad, concisión,
+estructura, vocabulario e indicadores) con la búsqueda de frases anterior y con el
+PhraseMatcher, sobre respuestas en inglés:
+
+- listas anteriores: las listas en inglés de cada método, un `frase in texto.lower()` por
+  frase y los tres regex de términos técnicos (copia de los métodos anteriores).
+- matcher: el analizador actual con el idioma de la pregunta (como en /advanced-analysis).
+- matcher + detección: el analizador actual sin idioma, que lo detecta una vez por llamada.
+
+Uso (desde backend/, con los datos de nltk instalados):
+    python scripts/benchmark_phrase_matcher.py [--responses 4] [--repeat 3]
+
+Verifica además que con las listas anteriores y con el matcher el resultado es idéntico.
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nltk.tokenize import sent_tokenize
+
+from services.AdvancedResponseAnalyzer import AdvancedResponseAnalyzer
+from services.PhraseMatcher import PHRASES
+
+LENGTHS = (2000, 5000, 10000, 20000)
+
+FILLER = (
+    "the system uses a cache to store results and the API returns them quickly while the "
+    "database keeps every request in a table so users can review the history of each "
+    "question with the userId and max_retries settings of the service"
+).split()
+
+
+class LegacyPhraseAnalyzer(AdvancedResponseAnalyzer):
+    """Búsqueda de frases anterior a PhraseMatcher (listas en inglés, una búsqueda por frase)"""
+
+    def analyze_responses(self, responses):
+        analysis_results = {}
+        for ai_name, response in responses.items():
+            if not response or response.startswith("Error:"):
+                continue
+            analysis_results[ai_name] = {
+                "readability": self._calculate_readability(response),
+                "conciseness": self._calculate_conciseness(response),
+                "structure": self._legacy_structure(response),
+                "vocabulary": self._legacy_vocabulary(response),
+                "factual_indicators": self._legacy_factual(response),
+                "confidence_indicators": self._legacy_confidence(response),
+                "response_quality_score": 0.0
+            }
+            analysis_results[ai_name]["response_quality_score"] = self._calculate_quality_score(
+                analysis_results[ai_name]
+            )
+        return analysis_results
+
+    def _legacy_structure(self, text):
+        bullet_patterns = [r'^\s*[-•*]\s+', r'^\s*\d+\.\s+']
+        logical_connectors = [
+            'however', 'therefore', 'furthermore', 'moreover', 'consequently',
+            'additionally', 'nevertheless', 'nonetheless', 'thus', 'hence'
+        ]
+        intro_indicators = [
+            'introduction', 'overview', 'summary', 'in this', 'this article',
+            'this response', 'let me', 'i will', 'we will'
+        ]
+        conclusion_indicators = [
+            'conclusion', 'summary', 'in conclusion', 'to summarize',
+            'therefore', 'thus', 'finally', 'in summary'
+        ]
+        first_sentence = sent_tokenize(text)[0].lower() if sent_tokenize(text) else ""
+        last_sentence = sent_tokenize(text)[-1].lower() if sent_tokenize(text) else ""
+        return {
+            "bullet_points": sum(len(re.findall(pattern, text, re.MULTILINE)) for pattern in bullet_patterns),
+            "paragraphs": len([p.strip() for p in text.split('\n\n') if p.strip()]),
+            "logical_connectors": sum(1 for connector in logical_connectors if connector.lower() in text.lower()),
+            "has_introduction": any(indicator in first_sentence for indicator in intro_indicators),
+            "has_conclusion": any(indicator in last_sentence for indicator in conclusion_indicators)
+        }
+
+    def _legacy_vocabulary(self, text):
+        vocabulary = self._analyze_vocabulary(text)
+        technical_terms = set()
+        for pattern in [r'\b[A-Z]{2,}\b', r'\b\w+[a-z]+[A-Z]\w+\b', r'\b\w+_\w+\b']:
+            technical_terms.update(re.findall(pattern, text))
+        vocabulary["technical_terms"] = len(technical_terms)
+        return vocabulary
+
+    def _legacy_factual(self, text):
+        factual_phrases = [
+            'according to', 'research shows', 'studies indicate', 'data suggests',
+            'evidence shows', 'statistics show', 'reports indicate', 'analysis reveals',
+            'findings show', 'results indicate', 'survey shows', 'experts say'
+        ]
+        uncertainty_phrases = [
+            'might be', 'could be', 'possibly', 'perhaps', 'maybe', 'potentially',
+            'it seems', 'appears to', 'suggests', 'indicates', 'may be'
+        ]
+        factual_count = sum(1 for phrase in factual_phrases if phrase.lower() in text.lower())
+        uncertainty_count = sum(1 for phrase in uncertainty_phrases if phrase.lower() in text.lower())
+        return {
+            "factual_indicators": factual_count,
+            "uncertainty_indicators": uncertainty_count,
+            "factual_confidence": max(0, factual_count - uncertainty_count)
+        }
+
+    def _legacy_confidence(self, text):
+        confident_phrases = [
+            'definitely', 'certainly', 'clearly', 'obviously', 'undoubtedly',
+            'without doubt', 'absolutely', 'positively', 'assuredly'
+        ]
+        cautious_phrases = [
+            'i think', 'in my opinion', 'it seems', 'appears', 'might',
+            'could', 'possibly', 'perhaps', 'maybe', 'i believe'
+        ]
+        confident_count = sum(1 for phrase in confident_phrases if phrase.lower() in text.lower())
+        cautious_count = sum(1 for phrase in cautious_phrases if phrase.lower() in text.lower())
+        return {
+            "confidence_indicators": confident_count,
+            "cautious_indicators": cautious_count,
+            "confidence_level": max(0, confident_count - cautious_count)
+        }
+
+
+def synthetic_responses(count: int, length: int, seed: int = 3):
+    """Respuestas en inglés con frases de todas las categorías y algunas viñetas"""
+    rng = random.Random(seed)
+    phrases = [phrase for category in PHRASES["en"].values() for phrase in category]
+    responses = {}
+    for i in range(count):
+        text = ""
+        while len(text) < length:
+            words = [rng.choice(FILLER) for _ in range(rng.randint(8, 20))]
+            if rng.random() < 0.3:
+                words.insert(rng.randrange(len(words)), rng.choice(phrases))
+            sentence = " ".join(words).capitalize() + "."
+            text += f"\n- {sentence}" if rng.random() < 0.1 else f" {sentence}"
+        responses[f"AI{i}"] = text[:length].strip()
+    return responses
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main(count: int, repeat: int):
+    legacy_analyzer = LegacyPhraseAnalyzer()
+    known_language = AdvancedResponseAnalyzer(language="en")
+    detected_language = AdvancedResponseAnalyzer()
+    print(f"{'caracteres':>10} {'listas ant. ms':>15} {'matcher ms':>11} {'+ detección ms':>15} {'speedup':>8}")
+    for length in LENGTHS:
+        responses = synthetic_responses(count, length)
+        legacy_ms, legacy = timed(lambda: legacy_analyzer.analyze_responses(responses), repeat)
+        matcher_ms, matched = timed(lambda: known_language.analyze_responses(responses), repeat)
+        detect_ms, _ = timed(lambda: detected_language.analyze_responses(responses), repeat)
+        if legacy != matched:
+            print(f"🚨 Resultados distintos con {length} caracteres")
+            return 1
+        print(f"{length:>10} {legacy_ms:>15.1f} {matcher_ms:>11.1f} {detect_ms:>15.1f} {legacy_ms / matcher_ms:>7.2f}x")
+    print("✅ Mismo análisis con las listas anteriores y con el matcher")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(main(args.responses, args.repeat))
@@ -0,0 +1,93 @@
+"""
+Compara el cálculo de redundancia anterior de AdvancedResponseAnalyzer (Jaccard de cada
+par de oraciones, volviendo a tokenizar las dos en cada comparación) con jaccard_matrix
+(cada oración se tokeniza una vez y un producto disperso da todas las intersecciones).
+
+Uso (desde backend/):
+    python scripts/benchmark_redundancy.py [--repeat 3]
+
+Para no depender de los datos de nltk se tokeniza con un regex parecido a word_tokenize;
+el costo relativo es el mismo. Verifica que ambos caminos dan el mismo score.
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.SentenceSimilarity import jaccard_matrix
+
+LENGTHS = (2000, 5000, 10000, 20000)
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(sentence: str):
+    return TOKEN_RE.findall(sentence.lower())
+
+
+def synthetic_sentences(length: int, seed: int = 9):
+    """Oraciones de una respuesta larga y repetitiva (algunas casi duplicadas)"""
+    rng = random.Random(seed)
+    vocabulary = [f"palabra{i}" for i in range(400)]
+    sentences, size = [], 0
+    while size < length:
+        if sentences and rng.random() < 0.2:
+            words = rng.choice(sentences).rstrip(".").split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        else:
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(8, 20))]
+        sentences.append(" ".join(words) + ".")
+        size += len(sentences[-1]) + 1
+    return sentences
+
+
+def legacy_redundancy(sentences):
+    similarities = []
+    for i in range(len(sentences)):
+        for j in range(i + 1, len(sentences)):
+            words1, words2 = set(tokenize(sentences[i])), set(tokenize(sentences[j]))
+            union = words1 | words2
+            similarities.append(len(words1 & words2) / len(union) if union else 0.0)
+    return round(np.mean(similarities), 3)
+
+
+def matrix_redundancy(sentences):
+    similarity = jaccard_matrix([tokenize(sentence) for sentence in sentences])
+    first, second = np.triu_indices(len(sentences), k=1)
+    return float(round(similarity[first, second].mean(), 3))
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main(repeat: int):
+    print(f"{'caracteres':>10} {'oraciones':>10} {'por par ms':>11} {'matriz ms':>10} {'speedup':>8}")
+    for length in LENGTHS:
+        sentences = synthetic_sentences(length)
+        legacy_ms, legacy = timed(lambda: legacy_redundancy(sentences), repeat)
+        matrix_ms, score = timed(lambda: matrix_redundancy(sentences), repeat)
+        if legacy != score:
+            print(f"🚨 Scores distintos con {length} caracteres: {legacy} vs {score}")
+            return 1
+        print(f"{length:>10} {len(sentences):>10} {legacy_ms:>11.1f} {matrix_ms:>10.1f} {legacy_ms / matrix_ms:>7.1f}x")
+    print("✅ Mismo score de redundancia en todas las longitudes")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(main(args.repeat))
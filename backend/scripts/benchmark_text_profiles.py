@@ -0,0 +1,174 @@
+"""
+Compara el recálculo por método (cada método de IntelligentComparator volvía a correr
+re.findall / re.split / la regex de viñetas sobre el mismo texto) con los TextProfile
+calculados una vez por respuesta.
+
+Mide las etapas que dependen solo del perfil: ranking de calidad (fortalezas,
+debilidades, legibilidad), recomendaciones y, por cada par, elementos comunes/únicos y
+comparación de estilos. Las similitudes con SequenceMatcher no cambian y quedan fuera.
+
+Uso (desde backend/):
+    python scripts/benchmark_text_profiles.py [--responses 5] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.IntelligentComparator import IntelligentComparator, TextProfile
+
+LENGTHS = (2000, 5000, 10000, 20000)
+
+
+def synthetic_responses(count: int, length: int, seed: int = 11):
+    rng = random.Random(seed)
+    vocabulary = [f"palabra{i}" for i in range(800)] + ["Key", "data", "2024", "main"]
+    responses = {}
+    for i in range(count):
+        text = ""
+        while len(text) < length:
+            sentence = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 24)))
+            text += rng.choice(("- ", "", "1. ")) + sentence + rng.choice((". ", ".\n", "! "))
+        responses[f"AI{i}"] = text[:length]
+    return responses
+
+
+def legacy_stages(responses):
+    """Las mismas etapas con el cálculo anterior: cada método tokeniza el texto de nuevo"""
+    def quality(response):
+        length = len(response)
+        score = 25 if 100 <= length <= 500 else 20 if 50 <= length <= 1000 else 15 if length > 1000 else 10
+        if re.search(r'[•\-\*]', response):
+            score += 10
+        if re.search(r'\d+\.', response):
+            score += 10
+        if len(re.split(r'[.!?]+', response)) > 3:
+            score += 5
+        words = re.findall(r'\b\w+\b', response)
+        if words:
+            score += len(set(words)) / len(words) * 25
+        sentences = re.split(r'[.!?]+', response)
+        average = sum(len(s.split()) for s in sentences) / len(sentences)
+        score += 25 if 10 <= average <= 25 else 20 if 5 <= average <= 30 else 10
+        return min(100, score)
+
+    def strengths(response):
+        result = []
+        if len(response) > 200:
+            result.append("Respuesta detallada")
+        if re.search(r'[•\-\*]', response):
+            result.append("Bien estructurada")
+        if len(re.findall(r'\b\w+\b', response)) > 50:
+            result.append("Vocabulario rico")
+        if re.search(r'\d+', response):
+            result.append("Incluye datos específicos")
+        return result
+
+    def weaknesses(response):
+        result = []
+        if len(response) < 50:
+            result.append("Respuesta muy corta")
+        if len(re.split(r'[.!?]+', response)) < 2:
+            result.append("Falta estructura")
+        if not re.search(r'[•\-\*]', response) and len(response) > 100:
+            result.append("Podría beneficiarse de listas")
+        return result
+
+    def readability(response):
+        sentences = re.split(r'[.!?]+', response)
+        words = re.findall(r'\b\w+\b', response)
+        average = len(words) / len(sentences)
+        return 100.0 if average <= 15 else 80.0 if average <= 20 else 60.0 if average <= 25 else 40.0
+
+    def ranking():
+        rows = [{
+            "ai_name": ai,
+            "quality_score": quality(response),
+            "strengths": strengths(response),
+            "weaknesses": weaknesses(response),
+            "length": len(response),
+            "readability": readability(response)
+        } for ai, response in responses.items()]
+        rows.sort(key=lambda x: x["quality_score"], reverse=True)
+        return rows
+
+    def words(text):
+        return set(re.findall(r'\b\w+\b', text.lower()))
+
+    # El ranking se calculaba dos veces: en quality_ranking y en recommendations
+    first = ranking()
+    ranking()
+    [ai for ai, r in responses.items() if not re.search(r'[•\-\*]', r)]
+    names = list(responses)
+    pairs = {}
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            pairs[f"{a}_vs_{b}"] = (
+                len(words(responses[a]) & words(responses[b])),
+                len(words(responses[a]) - words(responses[b])),
+                len(words(responses[b]) - words(responses[a])),
+                {
+                    "text1_length": len(responses[a]),
+                    "text2_length": len(responses[b]),
+                    "text1_sentences": len(re.split(r'[.!?]+', responses[a])),
+                    "text2_sentences": len(re.split(r'[.!?]+', responses[b])),
+                    "text1_has_bullets": bool(re.search(r'[•\-\*]', responses[a])),
+                    "text2_has_bullets": bool(re.search(r'[•\-\*]', responses[b]))
+                }
+            )
+    return first, pairs
+
+
+def profile_stages(responses):
+    comparator = IntelligentComparator()
+    profiles = {ai: TextProfile(response) for ai, response in responses.items()}
+    ranking = comparator._quality_ranking(profiles)
+    comparator._generate_recommendations(profiles, ranking)
+    names = list(profiles)
+    pairs = {}
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            first, second = profiles[a], profiles[b]
+            pairs[f"{a}_vs_{b}"] = (
+                len(first.word_set & second.word_set),
+                len(first.word_set - second.word_set),
+                len(second.word_set - first.word_set),
+                comparator._compare_styles(first, second)
+            )
+    return ranking, pairs
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main(count: int, repeat: int):
+    print(f"{'caracteres':>10} {'por método ms':>14} {'perfiles ms':>12} {'speedup':>8}")
+    for length in LENGTHS:
+        responses = synthetic_responses(count, length)
+        legacy_ms, legacy = timed(lambda: legacy_stages(responses), repeat)
+        profile_ms, profiled = timed(lambda: profile_stages(responses), repeat)
+        if legacy != profiled:
+            print(f"🚨 Resultados distintos con {length} caracteres")
+            return 1
+        print(f"{length:>10} {legacy_ms:>14.1f} {profile_ms:>12.1f} {legacy_ms / profile_ms:>7.1f}x")
+    print("✅ Mismos resultados en todas las longitudes")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(main(args.responses, args.repeat))
@@ -0,0 +1,95 @@
+"""
+Compara la detección de puntos únicos anterior (SequenceMatcher de cada oración contra el
+texto completo de cada otra respuesta) con la matriz de similitud oración por oración de
+SentenceMatrix.
+
+Uso (desde backend/):
+    python scripts/benchmark_unique_points.py [--responses 4] [--backend tfidf]
+
+Con 10k caracteres el cálculo anterior ya tarda varios segundos por pregunta; con
+--max-legacy se limita la longitud hasta la que se mide.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.IntelligentComparator import UNIQUE_POINT_THRESHOLD, IntelligentComparator, TextProfile
+
+LENGTHS = (2000, 5000, 10000, 20000)
+
+
+def synthetic_responses(count: int, length: int, seed: int = 5):
+    """Oraciones compartidas entre respuestas (reformuladas) y algunas propias de cada una"""
+    rng = random.Random(seed)
+    vocabulary = [f"termino{i}" for i in range(1500)]
+    shared = [[rng.choice(vocabulary) for _ in range(rng.randint(8, 20))] for _ in range(length // 60)]
+    responses = {}
+    for i in range(count):
+        sentences = []
+        for words in shared:
+            if rng.random() < 0.25:
+                words = [rng.choice(vocabulary) for _ in words]
+            else:
+                words = [word if rng.random() < 0.8 else rng.choice(vocabulary) for word in words]
+            sentences.append(" ".join(words).capitalize() + ".")
+        responses[f"AI{i}"] = " ".join(sentences)[:length]
+    return responses
+
+
+def legacy_unique_points(responses):
+    unique = {}
+    for ai, response in responses.items():
+        points = []
+        for sentence in re.split(r'[.!?]+', response):
+            sentence = sentence.strip()
+            if len(sentence) < 10:
+                continue
+            if all(
+                SequenceMatcher(None, sentence.lower(), other.lower()).ratio() <= UNIQUE_POINT_THRESHOLD
+                for other in responses.values() if other != response
+            ):
+                points.append(sentence)
+        unique[ai] = points[:3]
+    return unique
+
+
+def matrix_unique_points(responses, backend):
+    comparator = IntelligentComparator()
+    profiles = {ai: TextProfile(response) for ai, response in responses.items()}
+    matrix = comparator._build_sentence_matrix(profiles, backend)
+    return {ai: comparator._find_unique_points(ai, matrix) for ai in profiles}
+
+
+def main(count: int, backend: str, max_legacy: int):
+    print(f"{'caracteres':>10} {'oraciones':>10} {'SequenceMatcher ms':>19} {'matriz ms':>10} | únicos (anterior / matriz)")
+    for length in LENGTHS:
+        responses = synthetic_responses(count, length)
+        sentences = sum(len(TextProfile(r).points) for r in responses.values())
+
+        start = time.perf_counter()
+        unique = matrix_unique_points(responses, backend)
+        matrix_ms = (time.perf_counter() - start) * 1000
+
+        legacy_ms, legacy_count = "-", "-"
+        if length <= max_legacy:
+            start = time.perf_counter()
+            legacy = legacy_unique_points(responses)
+            legacy_ms = f"{(time.perf_counter() - start) * 1000:.1f}"
+            legacy_count = sum(len(points) for points in legacy.values())
+        unique_count = sum(len(points) for points in unique.values())
+        print(f"{length:>10} {sentences:>10} {legacy_ms:>19} {matrix_ms:>10.1f} | {legacy_count} / {unique_count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=4)
+    parser.add_argument("--backend", default="tfidf", choices=["tfidf", "embedding"])
+    parser.add_argument("--max-legacy", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.responses, args.backend, args.max_legacy)
@@ -0,0 +1,104 @@
+"""
+Verifica con EXPLAIN que las consultas del historial (GET /questions/) y del detalle
+(GET /questions/{id}) usan los índices creados por las migraciones.
+
+Captura las sentencias SQL que ejecuta la app (AnalysisStore.list_questions y
+load_question) y corre EXPLAIN (FORMAT JSON) sobre cada una con los mismos parámetros.
+Con tablas chicas el planificador prefiere un seq scan aunque exista el índice, por eso
+los planes se piden con enable_seqscan=off: si aun así aparece un Seq Scan, falta el índice.
+
+Uso (desde backend/, después de alembic upgrade head y con al menos una pregunta):
+    python scripts/check_query_plans.py [--question-id 12]
+
+Termina con código 1 si alguna tabla se recorre sin índice.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func, select
+
+from database import AsyncSessionLocal, async_engine
+from models.question import Question as QuestionModel
+from services.AnalysisStore import AnalysisStore, encode_cursor
+
+
+async def capture_statements(load):
+    """Ejecuta load(db) y devuelve las sentencias (sql, parámetros) que envió al driver"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with AsyncSessionLocal() as db:
+            await load(db)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+    return statements
+
+
+def plan_scans(node, scans):
+    """Recorre el plan y junta (tabla, tipo de nodo, índice) de cada scan"""
+    relation = node.get("Relation Name")
+    if relation is not None or "Index Name" in node:
+        scans.append((relation, node["Node Type"], node.get("Index Name")))
+    for child in node.get("Plans", []):
+        plan_scans(child, scans)
+    return scans
+
+
+async def explain(statements):
+    results = []
+    async with async_engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        for statement, parameters in statements:
+            plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            results.append((statement, plan_scans(plan[0]["Plan"], [])))
+    return results
+
+
+async def main(question_id):
+    async with AsyncSessionLocal() as db:
+        if question_id is None:
+            question_id = await db.scalar(select(func.max(QuestionModel.id)))
+    if question_id is None:
+        print("🚨 No hay preguntas: crear alguna (p.ej. POST /questions/seed) antes de revisar los planes")
+        return 1
+
+    checks = {
+        "listado (primera página)": lambda db: AnalysisStore.list_questions(db, 20, None, 80),
+        "listado (con cursor)": lambda db: AnalysisStore.list_questions(
+            db, 20, encode_cursor(datetime.utcnow(), 2 ** 31 - 1), 80
+        ),
+        f"detalle (pregunta {question_id})": lambda db: AnalysisStore.load_question(db, question_id),
+    }
+
+    failures = 0
+    for name, load in checks.items():
+        print(f"\n🔎 {name}")
+        for statement, scans in await explain(await capture_statements(load)):
+            print(f"   {' '.join(statement.split())[:110]}")
+            for relation, node_type, index_name in scans:
+                ok = node_type != "Seq Scan"
+                failures += not ok
+                print(f"      {'✅' if ok else '❌'} {relation or '-'}: {node_type}{f' ({index_name})' if index_name else ''}")
+
+    print(f"\n{'✅ Todas las consultas usan índices' if not failures else f'🚨 {failures} scans sin índice'}")
+    await async_engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--question-id", type=int, default=None, help="pregunta a usar para el detalle (por defecto la última)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.question_id)))
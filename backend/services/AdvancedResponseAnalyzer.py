@@ -1,5 +1,6 @@
+import os
 import re
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Set, Tuple
 from collections import Counter
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
@@ -7,6 +8,10 @@ from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 import numpy as np
 
+from services.PhraseMatcher import PhraseMatcher, get_phrase_matcher
+from services.SentenceSimilarity import embedding_vectors, jaccard_matrix
+from utils.lang import detect_language
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -23,26 +28,52 @@ try:
 except LookupError:
     nltk.download('wordnet')
 
+# Términos técnicos: acrónimos, camelCase y snake_case (cada alternativa abarca una palabra entera)
+TECHNICAL_TERM_RE = re.compile(
+    r'\b[A-Z]{2,}\b'
+    r'|\b\w+[a-z]+[A-Z]\w+\b'
+    r'|\b\w+_\w+\b'
+)
+
+# Viñetas y listas numeradas al inicio de línea (por separado: \s+ puede consumir el salto de línea)
+BULLET_PATTERNS = [re.compile(r'^\s*[-•*]\s+', re.MULTILINE), re.compile(r'^\s*\d+\.\s+', re.MULTILINE)]
+
+# Redundancia: jaccard (conjuntos de palabras, por defecto) o embedding (modelo compartido)
+REDUNDANCY_BACKEND = os.getenv("REDUNDANCY_BACKEND", "jaccard").lower()
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_SIMILARITY_THRESHOLD", "0.8"))
+MAX_NEAR_DUPLICATES = 10
+
 class AdvancedResponseAnalyzer:
-    def __init__(self):
+    def __init__(self, language: str = None):
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
+        # Idioma de la pregunta (elige las listas de frases); None: se detecta una vez por llamada
+        self.language = language
         
     def analyze_responses(self, responses: Dict[str, str]) -> Dict[str, Dict]:
         """Analiza todas las respuestas y retorna métricas detalladas"""
         analysis_results = {}
+        responses = {
+            ai_name: response for ai_name, response in responses.items()
+            if response and not response.startswith("Error:")
+        }
+        if not responses:
+            return analysis_results
+        
+        # Todas las respuestas contestan la misma pregunta: un solo detector de frases
+        matcher = get_phrase_matcher(self.language or detect_language(next(iter(responses.values()))))
         
         for ai_name, response in responses.items():
-            if not response or response.startswith("Error:"):
-                continue
+            # Todas las categorías de frases en una sola pasada sobre la respuesta
+            phrases = matcher.find(response)
                 
             analysis_results[ai_name] = {
                 "readability": self._calculate_readability(response),
                 "conciseness": self._calculate_conciseness(response),
-                "structure": self._analyze_structure(response),
+                "structure": self._analyze_structure(response, phrases, matcher),
                 "vocabulary": self._analyze_vocabulary(response),
-                "factual_indicators": self._detect_factual_indicators(response),
-                "confidence_indicators": self._detect_confidence_indicators(response),
+                "factual_indicators": self._detect_factual_indicators(phrases),
+                "confidence_indicators": self._detect_confidence_indicators(phrases),
                 "response_quality_score": 0.0
             }
             
@@ -82,36 +113,34 @@ class AdvancedResponseAnalyzer:
         # Eliminar palabras de relleno
         content_words = [word for word in words if word not in self.stop_words]
         
+        redundancy = self._calculate_redundancy(sentences)
+        
         return {
             "content_word_ratio": round(len(content_words) / len(words) if words else 0, 3),
             "words_per_sentence": round(len(words) / len(sentences) if sentences else 0, 2),
-            "redundancy_score": self._calculate_redundancy(text)
+            "redundancy_score": redundancy["score"],
+            "near_duplicates": redundancy["near_duplicates"]
         }
     
-    def _analyze_structure(self, text: str) -> Dict[str, any]:
+    def _analyze_structure(self, text: str, phrases: Dict[str, Set[str]], matcher: PhraseMatcher) -> Dict[str, any]:
         """Analiza la estructura del texto"""
         sentences = sent_tokenize(text)
         
         # Detectar listas y bullet points
-        bullet_patterns = [r'^\s*[-•*]\s+', r'^\s*\d+\.\s+']
-        bullet_count = sum(len(re.findall(pattern, text, re.MULTILINE)) for pattern in bullet_patterns)
+        bullet_count = sum(len(pattern.findall(text)) for pattern in BULLET_PATTERNS)
         
         # Detectar párrafos
         paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
         
         # Detectar conectores lógicos
-        logical_connectors = [
-            'however', 'therefore', 'furthermore', 'moreover', 'consequently',
-            'additionally', 'nevertheless', 'nonetheless', 'thus', 'hence'
-        ]
-        connector_count = sum(1 for connector in logical_connectors if connector.lower() in text.lower())
+        connector_count = len(phrases.get("connector", ()))
         
         return {
             "bullet_points": bullet_count,
             "paragraphs": len(paragraphs),
             "logical_connectors": connector_count,
-            "has_introduction": self._has_introduction(text),
-            "has_conclusion": self._has_conclusion(text)
+            "has_introduction": self._has_introduction(sentences, matcher),
+            "has_conclusion": self._has_conclusion(sentences, matcher)
         }
     
     def _analyze_vocabulary(self, text: str) -> Dict[str, any]:
@@ -128,14 +157,7 @@ class AdvancedResponseAnalyzer:
         complex_word_ratio = len(complex_words) / len(words) if words else 0
         
         # Palabras técnicas (detectar patrones)
-        technical_patterns = [
-            r'\b[A-Z]{2,}\b',  # Acrónimos
-            r'\b\w+[a-z]+[A-Z]\w+\b',  # camelCase
-            r'\b\w+_\w+\b'  # snake_case
-        ]
-        technical_terms = set()
-        for pattern in technical_patterns:
-            technical_terms.update(re.findall(pattern, text))
+        technical_terms = set(TECHNICAL_TERM_RE.findall(text))
         
         return {
             "lexical_diversity": round(lexical_diversity, 3),
@@ -144,21 +166,10 @@ class AdvancedResponseAnalyzer:
             "vocabulary_richness": self._calculate_vocabulary_richness(words)
         }
     
-    def _detect_factual_indicators(self, text: str) -> Dict[str, int]:
-        """Detecta indicadores de factualidad"""
-        factual_phrases = [
-            'according to', 'research shows', 'studies indicate', 'data suggests',
-            'evidence shows', 'statistics show', 'reports indicate', 'analysis reveals',
-            'findings show', 'results indicate', 'survey shows', 'experts say'
-        ]
-        
-        uncertainty_phrases = [
-            'might be', 'could be', 'possibly', 'perhaps', 'maybe', 'potentially',
-            'it seems', 'appears to', 'suggests', 'indicates', 'may be'
-        ]
-        
-        factual_count = sum(1 for phrase in factual_phrases if phrase.lower() in text.lower())
-        uncertainty_count = sum(1 for phrase in uncertainty_phrases if phrase.lower() in text.lower())
+    def _detect_factual_indicators(self, phrases: Dict[str, Set[str]]) -> Dict[str, int]:
+        """Detecta indicadores de factualidad (frases encontradas por el PhraseMatcher)"""
+        factual_count = len(phrases.get("factual", ()))
+        uncertainty_count = len(phrases.get("uncertainty", ()))
         
         return {
             "factual_indicators": factual_count,
@@ -166,20 +177,10 @@ class AdvancedResponseAnalyzer:
             "factual_confidence": max(0, factual_count - uncertainty_count)
         }
     
-    def _detect_confidence_indicators(self, text: str) -> Dict[str, int]:
-        """Detecta indicadores de confianza"""
-        confident_phrases = [
-            'definitely', 'certainly', 'clearly', 'obviously', 'undoubtedly',
-            'without doubt', 'absolutely', 'positively', 'assuredly'
-        ]
-        
-        cautious_phrases = [
-            'i think', 'in my opinion', 'it seems', 'appears', 'might',
-            'could', 'possibly', 'perhaps', 'maybe', 'i believe'
-        ]
-        
-        confident_count = sum(1 for phrase in confident_phrases if phrase.lower() in text.lower())
-        cautious_count = sum(1 for phrase in cautious_phrases if phrase.lower() in text.lower())
+    def _detect_confidence_indicators(self, phrases: Dict[str, Set[str]]) -> Dict[str, int]:
+        """Detecta indicadores de confianza (frases encontradas por el PhraseMatcher)"""
+        confident_count = len(phrases.get("confident", ()))
+        cautious_count = len(phrases.get("cautious", ()))
         
         return {
             "confidence_indicators": confident_count,
@@ -238,48 +239,51 @@ class AdvancedResponseAnalyzer:
         
         return count
     
-    def _calculate_redundancy(self, text: str) -> float:
-        """Calcula un score de redundancia"""
-        sentences = sent_tokenize(text)
+    def _calculate_redundancy(self, sentences: List[str]) -> Dict[str, Any]:
+        """Calcula un score de redundancia (similitud media entre oraciones) y las oraciones casi duplicadas"""
         if len(sentences) < 2:
-            return 0.0
-        
-        # Comparar similitud entre oraciones
-        similarities = []
-        for i in range(len(sentences)):
-            for j in range(i + 1, len(sentences)):
-                similarity = self._sentence_similarity(sentences[i], sentences[j])
-                similarities.append(similarity)
+            return {"score": 0.0, "near_duplicates": []}
         
-        return round(np.mean(similarities) if similarities else 0.0, 3)
-    
-    def _sentence_similarity(self, sent1: str, sent2: str) -> float:
-        """Calcula similitud entre dos oraciones"""
-        words1 = set(word_tokenize(sent1.lower()))
-        words2 = set(word_tokenize(sent2.lower()))
+        # Similitud de todos los pares de oraciones (triángulo superior de la matriz)
+        similarity = self._sentence_similarity_matrix(sentences)
+        first, second = np.triu_indices(len(sentences), k=1)
+        pair_scores = similarity[first, second]
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        near = np.flatnonzero(pair_scores >= NEAR_DUPLICATE_THRESHOLD)
+        near = near[np.argsort(-pair_scores[near], kind="stable")][:MAX_NEAR_DUPLICATES]
         
-        return len(intersection) / len(union) if union else 0.0
+        return {
+            "score": float(round(pair_scores.mean(), 3)),
+            "near_duplicates": [
+                {
+                    "sentences": [sentences[first[k]], sentences[second[k]]],
+                    "similarity": round(float(pair_scores[k]), 3)
+                }
+                for k in near
+            ]
+        }
+    
+    def _sentence_similarity_matrix(self, sentences: List[str]) -> np.ndarray:
+        """Similitud entre todas las oraciones; cada oración se tokeniza una sola vez"""
+        if REDUNDANCY_BACKEND == "embedding":
+            try:
+                vectors = embedding_vectors(sentences)
+                return np.clip(vectors @ vectors.T, -1.0, 1.0)
+            except Exception as e:
+                print(f"❌ Error con embeddings de oraciones, se usa Jaccard: {str(e)}")
+        
+        # Jaccard de los conjuntos de palabras: intersecciones con un producto disperso
+        return jaccard_matrix([word_tokenize(sentence.lower()) for sentence in sentences])
     
-    def _has_introduction(self, text: str) -> bool:
+    def _has_introduction(self, sentences: List[str], matcher: PhraseMatcher) -> bool:
         """Detecta si el texto tiene una introducción"""
-        intro_indicators = [
-            'introduction', 'overview', 'summary', 'in this', 'this article',
-            'this response', 'let me', 'i will', 'we will'
-        ]
-        first_sentence = sent_tokenize(text)[0].lower() if sent_tokenize(text) else ""
-        return any(indicator in first_sentence for indicator in intro_indicators)
+        first_sentence = sentences[0] if sentences else ""
+        return bool(matcher.find(first_sentence).get("introduction"))
     
-    def _has_conclusion(self, text: str) -> bool:
+    def _has_conclusion(self, sentences: List[str], matcher: PhraseMatcher) -> bool:
         """Detecta si el texto tiene una conclusión"""
-        conclusion_indicators = [
-            'conclusion', 'summary', 'in conclusion', 'to summarize',
-            'therefore', 'thus', 'finally', 'in summary'
-        ]
-        last_sentence = sent_tokenize(text)[-1].lower() if sent_tokenize(text) else ""
-        return any(indicator in last_sentence for indicator in conclusion_indicators)
+        last_sentence = sentences[-1] if sentences else ""
+        return bool(matcher.find(last_sentence).get("conclusion"))
     
     def _calculate_vocabulary_richness(self, words: List[str]) -> float:
         """Calcula la riqueza del vocabulario"""
@@ -0,0 +1,187 @@
+"""
+Ejecutor de análisis NLP fuera del event loop.
+
+La inferencia (NER, sentimiento, embeddings, NLI) y las comparaciones léxicas corren en
+un pool de procesos propio: cada worker carga sus modelos al arrancar y los reutiliza en
+todas las tareas. La cola está acotada; si se llena, run() lanza AnalysisQueueFull en vez
+de acumular trabajo que el cliente ya no va a esperar.
+
+Con ANALYSIS_EXECUTOR=thread las mismas tareas corren en un pool de threads del proceso
+principal (útil en desarrollo o con poca memoria: los modelos se cargan una sola vez).
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from services.ModelRegistry import model_registry
+
+# Modelos que cada worker carga al arrancar
+DEFAULT_WORKER_MODELS = ["sentence_embedding", "nli", "ner", "sentiment", "sentiment_tokenizer"]
+
+
+class AnalysisQueueFull(Exception):
+    """La cola de análisis alcanzó ANALYSIS_MAX_QUEUE tareas pendientes"""
+
+
+# --- Tareas (funciones de módulo para que se puedan enviar a otro proceso) ---
+
+def _init_worker(model_names: List[str]):
+    # Un hilo de torch por worker: el paralelismo lo dan los procesos
+    try:
+        import torch
+        torch.set_num_threads(int(os.getenv("ANALYSIS_TORCH_THREADS", "1")))
+    except ImportError:
+        pass
+    if model_names:
+        model_registry.warmup(model_names)
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def analyze_response(ai_name: str, text: str) -> Dict[str, Any]:
+    """NER, sentimiento y embedding de una respuesta"""
+    from services.NLPAnalyzer import NLPAnalyzer
+    analyzer = NLPAnalyzer({ai_name: text})
+    embedding = model_registry.get("sentence_embedding").encode(text, convert_to_numpy=True)
+    return {
+        "named_entities": analyzer.entities_for(ai_name),
+        "sentiment": analyzer.sentiment_for(ai_name),
+        "embedding": embedding,
+    }
+
+
+def detect_contradictions(responses: Dict[str, str]) -> Dict[str, Any]:
+    """NLI por pares; devuelve los resultados y las métricas de throughput"""
+    from services.NLPAnalyzer import NLPAnalyzer
+    analyzer = NLPAnalyzer(responses)
+    results = analyzer.detect_contradictions()
+    return {"contradictions": results, "throughput": analyzer.contradiction_stats}
+
+
+def lexical_similarities(responses: Dict[str, str]) -> Dict[str, Any]:
+    """Similitud léxica por par y la métrica usada"""
+    from services.SimilarityAnalyzer import SimilarityAnalyzer
+    return SimilarityAnalyzer.analyze_with_metric(responses)
+
+
+class AnalysisExecutor:
+    """Pool de procesos (o threads) con cola acotada para las tareas de análisis"""
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        worker_models: Optional[List[str]] = None,
+    ):
+        self.mode = (mode or os.getenv("ANALYSIS_EXECUTOR", "process")).lower()
+        if workers is None:
+            workers = int(os.getenv("ANALYSIS_WORKERS", "0") or 0) or min(2, os.cpu_count() or 1)
+        self.workers = workers
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("ANALYSIS_MAX_QUEUE", "32"))
+        if worker_models is None:
+            configured = os.getenv("ANALYSIS_WORKER_MODELS", "").strip()
+            worker_models = (
+                [name.strip() for name in configured.split(",") if name.strip()]
+                if configured else DEFAULT_WORKER_MODELS
+            )
+        self.worker_models = worker_models
+
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {"completed": 0, "failed": 0, "rejected": 0, "task_seconds": 0.0, "max_pending": 0}
+
+    def start(self) -> Executor:
+        """Crea el pool (idempotente). En modo proceso los workers cargan sus modelos al arrancar"""
+        with self._lock:
+            if self._pool is not None:
+                return self._pool
+            if self.mode == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis")
+            else:
+                # spawn: hacer fork de un proceso con torch cargado puede colgar a los workers
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.worker_models,),
+                )
+            print(f"⚙️ Ejecutor de análisis iniciado ({self.mode}, {self.workers} workers)")
+            return self._pool
+
+    async def warmup(self):
+        """Arranca todos los workers (y por lo tanto la carga de sus modelos) antes de la primera pregunta"""
+        pool = self.start()
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread":
+            if self.worker_models:
+                await loop.run_in_executor(pool, model_registry.warmup, self.worker_models)
+            return
+        await asyncio.gather(*(loop.run_in_executor(pool, _worker_ready) for _ in range(self.workers)))
+
+    def ensure_capacity(self):
+        """Lanza AnalysisQueueFull si la cola está llena (para rechazar antes de consultar las IAs)"""
+        with self._lock:
+            self._check_capacity()
+
+    def _check_capacity(self):
+        if self._pending >= self.max_queue:
+            self._counters["rejected"] += 1
+            raise AnalysisQueueFull(
+                f"Cola de análisis llena ({self._pending} tareas pendientes)"
+            )
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Ejecuta fn(*args) en el pool. Lanza AnalysisQueueFull si la cola está llena"""
+        pool = self.start()
+        with self._lock:
+            self._check_capacity()
+            self._pending += 1
+            self._counters["max_pending"] = max(self._counters["max_pending"], self._pending)
+
+        start = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+            with self._lock:
+                self._counters["completed"] += 1
+            return result
+        except Exception:
+            with self._lock:
+                self._counters["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._counters["task_seconds"] += time.perf_counter() - start
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "started": self._pool is not None,
+                "pending": self._pending,
+                "max_queue": self.max_queue,
+                "worker_models": self.worker_models,
+                **{
+                    name: round(value, 3) if isinstance(value, float) else value
+                    for name, value in self._counters.items()
+                },
+            }
+
+
+# Instancia global del ejecutor de análisis
+analysis_executor = AnalysisExecutor()
@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from services.IAManager import IAManager
+from services.NLPAnalyzer import NLPAnalyzer
+from services.SummaryAnalyzer import SummaryAnalyzer
+from services.AnalysisExecutor import (
+    analysis_executor,
+    analyze_response,
+    detect_contradictions,
+    lexical_similarities,
+)
+
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class AnalysisPipeline:
+    """
+    Pipeline concurrente de consulta y análisis de una pregunta.
+
+    - Las IAs se consultan en paralelo.
+    - El análisis por respuesta (NER, sentimiento, embedding) arranca apenas llega cada respuesta.
+    - El resumen se genera mientras corren las etapas NLP locales.
+    - Las etapas por pares (similitud, NLI) arrancan cuando están todas las respuestas.
+
+    Todo el trabajo de CPU corre en el ejecutor de análisis (pool de procesos), así el
+    event loop sigue atendiendo otras solicitudes mientras se analiza.
+
+    Si se pasa on_event, se notifica cada respuesta ("response"), el análisis de cada
+    respuesta ("response_analysis") y cada etapa por pares ("stage") en cuanto terminan.
+    Las IAs que no responden dentro del plazo se notifican con "timeout", las que tienen el
+    circuito abierto con "unavailable" y las que su cuota rechazó con "rate_limited"; todas
+    quedan fuera del análisis.
+    """
+
+    def __init__(self, manager: Optional[IAManager] = None):
+        self.manager = manager
+        self.summary_analyzer = SummaryAnalyzer()
+
+    async def run(
+        self,
+        question: str,
+        lang: str = "en",
+        on_event: Optional[EventCallback] = None,
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Consulta las IAs y analiza sus respuestas"""
+        analysis_executor.ensure_capacity()
+        emit = self._emitter(on_event)
+        responses = {}
+        per_response_tasks = {}
+        timed_out = []
+        unavailable = []
+        rate_limited = []
+
+        try:
+            async for ai_name, response_text in self.manager.query_as_completed(
+                question, lang, use_cache, timeout, unavailable, rate_limited
+            ):
+                if response_text is None:
+                    if ai_name in unavailable:
+                        await emit("unavailable", {"ai_name": ai_name})
+                        continue
+                    if ai_name in rate_limited:
+                        await emit("rate_limited", {"ai_name": ai_name})
+                        continue
+                    # Venció el plazo: se analiza lo que llegó
+                    timed_out.append(ai_name)
+                    await emit("timeout", {"ai_name": ai_name})
+                    continue
+                responses[ai_name] = response_text
+                per_response_tasks[ai_name] = asyncio.ensure_future(
+                    self._analyze_response(ai_name, response_text, emit)
+                )
+                await emit("response", {"ai_name": ai_name, "response": response_text})
+        except BaseException:
+            for task in per_response_tasks.values():
+                task.cancel()
+            raise
+
+        # Mantener el orden de configuración de las IAs para los resultados por pares
+        ordered = {name: responses[name] for name in self.manager.ias if name in responses}
+        results = await self._run_stages(ordered, lang, per_response_tasks, emit)
+        return {
+            "responses": ordered,
+            "timed_out": timed_out,
+            "unavailable": unavailable,
+            "rate_limited": rate_limited,
+            **results
+        }
+
+    async def analyze(
+        self,
+        responses: Dict[str, str],
+        lang: str = "en",
+        on_event: Optional[EventCallback] = None
+    ) -> Dict[str, Any]:
+        """Analiza respuestas ya obtenidas (p.ej. guardadas en la base de datos)"""
+        analysis_executor.ensure_capacity()
+        emit = self._emitter(on_event)
+        per_response_tasks = {
+            ai_name: asyncio.ensure_future(self._analyze_response(ai_name, text, emit))
+            for ai_name, text in responses.items()
+        }
+        results = await self._run_stages(responses, lang, per_response_tasks, emit)
+        return {"responses": responses, **results}
+
+    def _emitter(self, on_event: Optional[EventCallback]):
+        async def emit(event: str, data: Dict[str, Any]):
+            if on_event is not None:
+                await on_event(event, data)
+        return emit
+
+    async def _analyze_response(self, ai_name: str, text: str, emit):
+        analysis = await analysis_executor.run(analyze_response, ai_name, text)
+        await emit("response_analysis", {
+            "ai_name": ai_name,
+            "named_entities": analysis["named_entities"],
+            "sentiment": analysis["sentiment"]
+        })
+        return analysis
+
+    async def _run_stages(self, responses: Dict[str, str], lang: str, per_response_tasks, emit):
+        loop = asyncio.get_running_loop()
+        nlp_analyzer = NLPAnalyzer(responses)
+
+        async def stage(name, awaitable):
+            result = await awaitable
+            await emit("stage", {"stage": name, "result": result})
+            return result
+
+        async def semantic_similarity_stage():
+            # Con los embeddings de cada respuesta la matriz es un único producto (sin modelo)
+            for ai_name, task in per_response_tasks.items():
+                nlp_analyzer.set_embedding(ai_name, (await task)["embedding"])
+            return await loop.run_in_executor(None, nlp_analyzer.analyze_semantic_similarity)
+
+        tasks = list(per_response_tasks.values())
+        try:
+            stage_tasks = [
+                asyncio.ensure_future(stage("summary", self.summary_analyzer.generate_summary_async(
+                    list(responses.values()), lang
+                ))),
+                asyncio.ensure_future(stage("similarities", analysis_executor.run(
+                    lexical_similarities, responses
+                ))),
+                asyncio.ensure_future(stage("contradictions", analysis_executor.run(
+                    detect_contradictions, responses
+                ))),
+                asyncio.ensure_future(stage("semantic_similarities", semantic_similarity_stage())),
+            ]
+            tasks.extend(stage_tasks)
+            summary_text, lexical, nli, semantic_similarities = await asyncio.gather(*stage_tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        named_entities = {}
+        sentiments = {}
+        for ai_name in responses:
+            analysis = per_response_tasks[ai_name].result()
+            named_entities[ai_name] = analysis["named_entities"]
+            if analysis["sentiment"] is not None:
+                sentiments[ai_name] = analysis["sentiment"]
+
+        return {
+            "similarities": lexical["scores"],
+            "similarity_metric": lexical["metric"],
+            "semantic_similarities": semantic_similarities,
+            "semantic_similarity_matrix": nlp_analyzer.semantic_similarity_matrix(),
+            "contradictions": nli["contradictions"],
+            "contradiction_throughput": nli["throughput"],
+            "named_entities": named_entities,
+            "sentiments": sentiments,
+            "summary": summary_text
+        }
@@ -0,0 +1,203 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, null, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from models.question import Question as QuestionModel
+from models.response import Response as Answer
+from models.summary import Summary
+from models.similarity import Similarity
+from models.semantic_similarity import SemanticSimilarity
+from models.contradiction import Contradiction
+from models.named_entity import NamedEntity
+from models.sentiment import Sentiment
+from services.BulkWriter import bulk_writer
+from services.ComparisonSnapshotStore import ComparisonSnapshotStore
+
+
+def encode_cursor(created_at: datetime, question_id: int) -> str:
+    """Cursor opaco con la posición (created_at, id) de la última pregunta de la página"""
+    if created_at is None:
+        # questions.created_at es NOT NULL desde la migración 0005: sin fecha no hay posición
+        raise RuntimeError(f"La pregunta {question_id} no tiene created_at: aplicar las migraciones (alembic upgrade head)")
+    payload = json.dumps({"created_at": created_at.isoformat(), "id": question_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverso de encode_cursor. Lanza ValueError si el cursor no es válido"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["created_at"]), int(payload["id"])
+    except (KeyError, TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
+
+
+def group_by_ai(rows, build: Callable[[Any], Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Agrupa filas por ai_name en una sola pasada"""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        grouped.setdefault(row.ai_name, []).append(build(row))
+    return grouped
+
+
+class AnalysisStore:
+    """Persistencia de preguntas, respuestas y resultados de análisis"""
+
+    @staticmethod
+    async def create_question(db: AsyncSession, text: str, lang: str) -> QuestionModel:
+        new_question = QuestionModel(text=text, language=lang)
+        db.add(new_question)
+        await db.commit()
+        await db.refresh(new_question)
+        return new_question
+
+    @staticmethod
+    async def discard_question(db: AsyncSession, question_id: int):
+        """Borra una pregunta recién creada cuyo análisis no llegó a guardarse (aún sin resultados)"""
+        await db.rollback()
+        await db.execute(delete(QuestionModel).where(QuestionModel.id == question_id))
+        await db.commit()
+
+    @staticmethod
+    async def list_questions(
+        db: AsyncSession,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        preview_chars: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Página de preguntas (las más recientes primero) con paginación por cursor.
+
+        Una sola consulta: la página se recorta en una subconsulta (keyset sobre created_at, id)
+        y se une con los nombres de proveedor de sus respuestas; el total viaja como subconsulta
+        escalar. Con preview_chars > 0 se incluye el comienzo de cada respuesta.
+        """
+        page = select(QuestionModel.id, QuestionModel.text, QuestionModel.language, QuestionModel.created_at)
+        if cursor is not None:
+            created_at, question_id = decode_cursor(cursor)
+            page = page.where(tuple_(QuestionModel.created_at, QuestionModel.id) < tuple_(created_at, question_id))
+        page = page.order_by(
+            QuestionModel.created_at.desc(), QuestionModel.id.desc()
+        ).limit(limit + 1).subquery()
+
+        preview = func.substr(Answer.response_text, 1, preview_chars) if preview_chars else null()
+        total = select(func.count()).select_from(QuestionModel).scalar_subquery()
+        rows = (await db.execute(
+            select(page, Answer.ai_name, preview.label("preview"), total.label("total"))
+            .outerjoin(Answer, Answer.question_id == page.c.id)
+            .order_by(page.c.created_at.desc(), page.c.id.desc(), Answer.id)
+        )).all()
+
+        items: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            item = items.get(row.id)
+            if item is None:
+                item = items[row.id] = {
+                    "id": row.id,
+                    "text": row.text,
+                    "language": row.language,
+                    "created_at": row.created_at,
+                    "providers": [],
+                }
+                if preview_chars:
+                    item["previews"] = {}
+            if row.ai_name is not None:
+                item["providers"].append(row.ai_name)
+                if preview_chars:
+                    item["previews"][row.ai_name] = row.preview
+
+        page_items = list(items.values())
+        has_more = len(page_items) > limit
+        page_items = page_items[:limit]
+        if rows:
+            total_count = rows[0].total
+        else:
+            total_count = await db.scalar(select(func.count()).select_from(QuestionModel))
+        last = page_items[-1] if page_items else None
+        return {
+            "items": page_items,
+            "next_cursor": encode_cursor(last["created_at"], last["id"]) if has_more else None,
+            "limit": limit,
+            "total": total_count,
+        }
+
+    @staticmethod
+    async def save_analysis(db: AsyncSession, question_id: int, results: dict, save_responses: bool = True):
+        """Guarda respuestas y resultados con una sentencia por tabla. Devuelve filas y tiempos por tabla"""
+        stats = await bulk_writer.write(db, question_id, results, save_responses)
+        # Snapshot desde lo guardado: incluye respuestas y resultados que ya estaban en la base
+        await ComparisonSnapshotStore.save(db, question_id, await AnalysisStore.build_comparison(db, question_id))
+        print(f"💾 Análisis de la pregunta {question_id} guardado: {stats['total_rows']} filas en {stats['total_ms']} ms ({stats['mode']})")
+        return stats
+
+    @staticmethod
+    async def load_question(db: AsyncSession, question_id: int) -> Optional[QuestionModel]:
+        """Pregunta con todos sus resultados cargados de una vez (selectinload, una consulta por relación)"""
+        return (await db.execute(
+            select(QuestionModel)
+            .where(QuestionModel.id == question_id)
+            .options(
+                selectinload(QuestionModel.responses),
+                selectinload(QuestionModel.summary),
+                selectinload(QuestionModel.similarities),
+                selectinload(QuestionModel.semantic_similarities),
+                selectinload(QuestionModel.contradictions),
+                selectinload(QuestionModel.named_entities).load_only(
+                    NamedEntity.ai_name, NamedEntity.entity, NamedEntity.label
+                ),
+                selectinload(QuestionModel.sentiments),
+            )
+            # Las filas de resultados se insertan con Core (BulkWriter): refrescar lo que ya esté en la sesión
+            .execution_options(populate_existing=True)
+        )).scalars().first()
+
+    @staticmethod
+    async def load_comparison(db: AsyncSession, question_id: int) -> Optional[Dict[str, Any]]:
+        """Documento de comparación de la pregunta: el snapshot si existe, si no se reconstruye y se guarda"""
+        document, _ = await AnalysisStore.load_comparison_snapshot(db, question_id)
+        return document
+
+    @staticmethod
+    async def load_comparison_snapshot(db: AsyncSession, question_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Documento de comparación y revisión de su snapshot (para escrituras condicionales).
+        Si no hay snapshot o está invalidado se reconstruye y se guarda solo si nadie lo
+        invalidó mientras tanto; en ese caso la revisión es None.
+        """
+        document, revision = await ComparisonSnapshotStore.get(db, question_id)
+        if document is not None:
+            return document, revision
+        document = await AnalysisStore.build_comparison(db, question_id)
+        if document is None:
+            return None, None
+        return await ComparisonSnapshotStore.save_if_current(db, question_id, document, revision)
+
+    @staticmethod
+    async def build_comparison(db: AsyncSession, question_id: int) -> Optional[Dict[str, Any]]:
+        """Reconstruye desde las tablas de resultados el documento de comparación (formato de save_analysis)"""
+        question = await AnalysisStore.load_question(db, question_id)
+        if not question:
+            return None
+
+        return {
+            "question": question.text,
+            "question_id": question.id,
+            "language": question.language,
+            "responses": {r.ai_name: r.response_text for r in question.responses},
+            "similarities": {f"{s.ai1} vs {s.ai2}": s.similarity_score for s in question.similarities},
+            "semantic_similarities": [
+                {"ai1": s.ai1, "ai2": s.ai2, "score": s.similarity_score} for s in question.semantic_similarities
+            ],
+            "contradictions": [
+                {"ai1": c.ai1, "ai2": c.ai2, "label": c.label, "score": c.score} for c in question.contradictions
+            ],
+            "named_entities": group_by_ai(
+                question.named_entities, lambda e: {"word": e.entity, "entity_group": e.label}
+            ),
+            "sentiments": group_by_ai(question.sentiments, lambda s: {"label": s.label, "score": s.score}),
+            "summary": question.summary.summary_text if question.summary else None
+        }
@@ -0,0 +1,139 @@
+"""
+Escritura masiva de los resultados de análisis.
+
+Cada tabla de resultados (respuestas, similitudes, contradicciones, entidades,
+sentimientos, resumen) se escribe con una sola sentencia por tabla dentro de una
+única transacción, en vez de un INSERT por fila a través del ORM:
+
+- executemany: INSERT ... VALUES por lotes (insertmanyvalues de SQLAlchemy).
+- copy: COPY ... FROM STDIN con asyncpg (copy_records_to_table), el más rápido
+  cuando hay cientos de entidades por pregunta.
+
+Con ANALYSIS_BULK_MODE=copy y un driver distinto de asyncpg se usa executemany.
+"""
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.response import Response as Answer
+from models.summary import Summary
+from models.similarity import Similarity
+from models.semantic_similarity import SemanticSimilarity
+from models.contradiction import Contradiction
+from models.named_entity import NamedEntity
+from models.sentiment import Sentiment
+
+BULK_MODES = ("executemany", "copy")
+
+
+def build_rows(question_id: int, results: Dict[str, Any], save_responses: bool = True) -> List[Tuple[Type, List[Dict[str, Any]]]]:
+    """Filas de cada tabla a partir del resultado de AnalysisPipeline (mismo formato que save_analysis)"""
+    tables = []
+    if save_responses:
+        tables.append((Answer, [
+            {"question_id": question_id, "ai_name": ai_name, "response_text": response_text}
+            for ai_name, response_text in results["responses"].items()
+        ]))
+
+    similarities = []
+    for pair, score in results["similarities"].items():
+        ai1, ai2 = pair.split(" vs ")
+        similarities.append({"question_id": question_id, "ai1": ai1, "ai2": ai2, "similarity_score": float(score)})
+    tables.append((Similarity, similarities))
+
+    tables.append((SemanticSimilarity, [
+        {"question_id": question_id, "ai1": r["ai1"], "ai2": r["ai2"], "similarity_score": float(r["score"])}
+        for r in results["semantic_similarities"]
+    ]))
+    tables.append((Contradiction, [
+        {"question_id": question_id, "ai1": r["ai1"], "ai2": r["ai2"], "label": r["label"], "score": float(r["score"])}
+        for r in results["contradictions"]
+    ]))
+    tables.append((NamedEntity, [
+        {"question_id": question_id, "ai_name": ai_name, "entity": e["word"], "label": e["entity_group"]}
+        for ai_name, entities in results["named_entities"].items()
+        for e in entities
+    ]))
+    tables.append((Sentiment, [
+        {"question_id": question_id, "ai_name": ai_name, "label": r["label"], "score": float(r["score"])}
+        for ai_name, sentiment_results in results["sentiments"].items()
+        for r in sentiment_results
+    ]))
+    tables.append((Summary, [{"question_id": question_id, "summary_text": results["summary"]}]))
+    return tables
+
+
+class AnalysisBulkWriter:
+    """Persiste el resultado de un análisis con una sentencia por tabla en una transacción"""
+
+    def __init__(self, mode: Optional[str] = None):
+        mode = (mode or os.getenv("ANALYSIS_BULK_MODE", "executemany")).lower()
+        if mode not in BULK_MODES:
+            raise ValueError(f"ANALYSIS_BULK_MODE inválido: {mode} (opciones: {', '.join(BULK_MODES)})")
+        self.mode = mode
+
+    async def write(
+        self,
+        db: AsyncSession,
+        question_id: int,
+        results: Dict[str, Any],
+        save_responses: bool = True
+    ) -> Dict[str, Any]:
+        """Escribe todas las tablas y hace commit. Devuelve filas y milisegundos por tabla"""
+        start = time.perf_counter()
+        tables = build_rows(question_id, results, save_responses)
+        mode = self.mode
+        if mode == "copy" and db.bind.dialect.driver != "asyncpg":
+            mode = "executemany"
+
+        rows: Dict[str, int] = {}
+        timings_ms: Dict[str, float] = {}
+        try:
+            now = None
+            for model, table_rows in tables:
+                table = model.__table__
+                if not table_rows:
+                    rows[table.name] = 0
+                    continue
+                table_start = time.perf_counter()
+                if mode == "copy":
+                    if now is None:
+                        # Mismo valor que func.now() en la transacción (default de created_at)
+                        now = (await db.execute(text("SELECT LOCALTIMESTAMP"))).scalar()
+                    await self._copy(db, table, table_rows, now)
+                else:
+                    await db.execute(insert(table), table_rows)
+                rows[table.name] = len(table_rows)
+                timings_ms[table.name] = round((time.perf_counter() - table_start) * 1000, 2)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        return {
+            "mode": mode,
+            "rows": rows,
+            "total_rows": sum(rows.values()),
+            "timings_ms": timings_ms,
+            "total_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    async def _copy(self, db: AsyncSession, table, table_rows: List[Dict[str, Any]], now):
+        columns = list(table_rows[0].keys())
+        if "created_at" in table.c and "created_at" not in columns:
+            columns.append("created_at")
+            table_rows = [{**row, "created_at": now} for row in table_rows]
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(row[column] for column in columns) for row in table_rows],
+            columns=columns
+        )
+
+
+# Instancia global del escritor masivo
+bulk_writer = AnalysisBulkWriter()
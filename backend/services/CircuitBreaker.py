@@ -0,0 +1,201 @@
+"""
+Circuit breaker por proveedor de IA.
+
+Estados:
+- closed: las solicitudes pasan y se registra su resultado.
+- open: el proveedor falló demasiado; se omite sin esperar hasta que pase el enfriamiento.
+- half_open: pasado el enfriamiento se deja pasar una solicitud de prueba; si responde
+  bien el circuito se cierra y si falla vuelve a abrirse.
+
+El mismo registro guarda la tasa de error y la latencia recientes de cada proveedor,
+que es lo que reportan los endpoints de salud.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderUnavailable(Exception):
+    """El circuito del proveedor está abierto: la solicitud se omite sin llamarlo"""
+
+
+class ProviderCircuitBreaker:
+    """Estado del circuito y ventana de resultados recientes de un proveedor"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        error_rate_threshold: float,
+        min_requests: int,
+        window_seconds: float,
+        open_seconds: float,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_requests = min_requests
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.consecutive_failures = 0
+        self.half_open_calls = 0
+        self.times_opened = 0
+        self.skipped = 0
+        self.last_error: Optional[str] = None
+        # (instante, éxito, latencia en ms)
+        self._outcomes: Deque[Tuple[float, bool, float]] = deque()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Indica si se puede llamar al proveedor (y reserva la llamada de prueba en half_open)"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    self.skipped += 1
+                    return False
+                self.state = HALF_OPEN
+                self.half_open_calls = 0
+                print(f"🔌 Circuito de {self.name} semiabierto: se enviará una solicitud de prueba")
+            if self.state == HALF_OPEN:
+                if self.half_open_calls >= self.half_open_max_calls:
+                    self.skipped += 1
+                    return False
+                self.half_open_calls += 1
+            return True
+
+    def record_success(self, latency_ms: float):
+        with self._lock:
+            self._record(True, latency_ms)
+            self.consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self.opened_at = None
+                # La ventana anterior ya no representa al proveedor recuperado
+                self._outcomes.clear()
+                self._record(True, latency_ms)
+                print(f"✅ Circuito de {self.name} cerrado: el proveedor volvió a responder")
+
+    def record_failure(self, latency_ms: float, error: Optional[str] = None):
+        with self._lock:
+            self._record(False, latency_ms)
+            self.consecutive_failures += 1
+            self.last_error = error[:200] if error else None
+            if self.state == HALF_OPEN or self._should_open():
+                self._open()
+
+    def release(self):
+        """La llamada autorizada se canceló sin resultado: liberar el cupo de prueba"""
+        with self._lock:
+            if self.state == HALF_OPEN and self.half_open_calls > 0:
+                self.half_open_calls -= 1
+
+    def reset(self):
+        with self._lock:
+            self.state = CLOSED
+            self.opened_at = None
+            self.consecutive_failures = 0
+            self._outcomes.clear()
+
+    def _record(self, success: bool, latency_ms: float):
+        now = time.monotonic()
+        self._outcomes.append((now, success, latency_ms))
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _should_open(self) -> bool:
+        if self.consecutive_failures >= self.failure_threshold:
+            return True
+        total = len(self._outcomes)
+        if total < self.min_requests:
+            return False
+        failures = sum(1 for _, success, _ in self._outcomes if not success)
+        return failures / total >= self.error_rate_threshold
+
+    def _open(self):
+        if self.state != OPEN:
+            self.times_opened += 1
+            print(f"🚫 Circuito de {self.name} abierto durante {self.open_seconds}s")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            outcomes = [outcome for outcome in self._outcomes if now - outcome[0] <= self.window_seconds]
+            latencies = sorted(latency for _, success, latency in outcomes if success)
+            failures = sum(1 for _, success, _ in outcomes if not success)
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.open_seconds - (now - self.opened_at)), 2)
+            return {
+                "state": self.state,
+                "recent_requests": len(outcomes),
+                "error_rate": round(failures / len(outcomes), 3) if outcomes else None,
+                "avg_latency_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                "p95_latency_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 1) if latencies else None,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "skipped": self.skipped,
+                "retry_in_seconds": retry_in,
+                "last_error": self.last_error,
+            }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers por proveedor con umbrales comunes (configurables por entorno)"""
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        error_rate_threshold: Optional[float] = None,
+        min_requests: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+    ):
+        self.settings = {
+            "failure_threshold": failure_threshold if failure_threshold is not None
+            else int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
+            "error_rate_threshold": error_rate_threshold if error_rate_threshold is not None
+            else float(os.getenv("CIRCUIT_BREAKER_ERROR_RATE", "0.5")),
+            "min_requests": min_requests if min_requests is not None
+            else int(os.getenv("CIRCUIT_BREAKER_MIN_REQUESTS", "10")),
+            "window_seconds": window_seconds if window_seconds is not None
+            else float(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", "120")),
+            "open_seconds": open_seconds if open_seconds is not None
+            else float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30")),
+        }
+        self._breakers: Dict[str, ProviderCircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ai_name: str) -> ProviderCircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(ai_name)
+            if breaker is None:
+                breaker = ProviderCircuitBreaker(ai_name, **self.settings)
+                self._breakers[ai_name] = breaker
+            return breaker
+
+    def state(self, ai_name: str) -> str:
+        with self._lock:
+            breaker = self._breakers.get(ai_name)
+        return breaker.state if breaker is not None else CLOSED
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
+
+
+# Instancia global de los circuit breakers
+circuit_breakers = CircuitBreakerRegistry()
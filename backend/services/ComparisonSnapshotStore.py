@@ -0,0 +1,198 @@
+"""
+Snapshots de comparación por pregunta (tabla comparison_snapshots, JSONB).
+
+El documento de comparación completo se guarda una vez cuando termina el análisis y se
+sirve con una búsqueda por clave primaria (question_id, analysis_version), en vez de
+reconstruirlo desde las siete tablas de resultados. Los análisis avanzados
+(/advanced-analysis/*) se calculan la primera vez que se piden y quedan en el mismo
+documento, en la sección "advanced".
+
+Agregar una respuesta o un resultado a una pregunta invalida su snapshot: la fila queda
+sin documento y sube su revisión. Volver a correr el análisis lo reescribe. Las escrituras
+que parten de un snapshot leído antes (la reconstrucción de load_comparison y las
+secciones avanzadas) son condicionales a que la revisión siga siendo la leída, para no
+restaurar un documento que se invalidó mientras se calculaba.
+"""
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import Text, delete, func, literal, null, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.comparison_snapshot import ComparisonSnapshot
+
+# Subir cuando cambie el formato del documento o los modelos que lo producen:
+# los snapshots de versiones anteriores dejan de usarse y se reconstruyen al leerlos
+ANALYSIS_VERSION = 6
+
+
+def _json_default(obj):
+    # Escalares y arrays de numpy (scores, matrices) y conjuntos
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    return str(obj)
+
+
+def to_json_document(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia del documento con solo tipos JSON (lo que JSONB puede guardar)"""
+    return json.loads(json.dumps(data, default=_json_default))
+
+
+class ComparisonSnapshotStore:
+    """Lectura, escritura e invalidación de los snapshots de comparación"""
+
+    @staticmethod
+    async def get(db: AsyncSession, question_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Documento y revisión del snapshot de la versión actual. El documento es None si no
+        hay fila o si está invalidado; la revisión es None solo si no hay fila.
+        """
+        row = (await db.execute(
+            select(ComparisonSnapshot.document, ComparisonSnapshot.revision).where(
+                ComparisonSnapshot.question_id == question_id,
+                ComparisonSnapshot.analysis_version == ANALYSIS_VERSION
+            )
+        )).first()
+        if row is None:
+            return None, None
+        return row.document, row.revision
+
+    @staticmethod
+    async def save(db: AsyncSession, question_id: int, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Crea o reemplaza el snapshot de la versión actual y hace commit"""
+        document = to_json_document(document)
+        statement = insert(ComparisonSnapshot).values(
+            question_id=question_id,
+            analysis_version=ANALYSIS_VERSION,
+            document=document,
+            revision=0,
+            created_at=datetime.utcnow()
+        )
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[ComparisonSnapshot.question_id, ComparisonSnapshot.analysis_version],
+            set_={
+                "document": statement.excluded.document,
+                "revision": ComparisonSnapshot.revision + 1,
+                "created_at": statement.excluded.created_at
+            }
+        ))
+        await db.commit()
+        return document
+
+    @staticmethod
+    async def save_if_current(
+        db: AsyncSession, question_id: int, document: Dict[str, Any], revision: Optional[int]
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """
+        Guarda un documento reconstruido solo si el snapshot sigue en la revisión leída
+        (revision None: solo si todavía no hay fila). Hace commit y devuelve el documento y
+        la nueva revisión, o None si el snapshot cambió entretanto y no se guardó.
+        """
+        document = to_json_document(document)
+        if revision is None:
+            statement = insert(ComparisonSnapshot).values(
+                question_id=question_id,
+                analysis_version=ANALYSIS_VERSION,
+                document=document,
+                revision=0,
+                created_at=datetime.utcnow()
+            ).on_conflict_do_nothing(
+                index_elements=[ComparisonSnapshot.question_id, ComparisonSnapshot.analysis_version]
+            )
+            new_revision = 0
+        else:
+            statement = update(ComparisonSnapshot).where(
+                ComparisonSnapshot.question_id == question_id,
+                ComparisonSnapshot.analysis_version == ANALYSIS_VERSION,
+                ComparisonSnapshot.revision == revision
+            ).values(document=document, revision=revision + 1, created_at=datetime.utcnow())
+            new_revision = revision + 1
+        result = await db.execute(statement)
+        await db.commit()
+        if result.rowcount == 0:
+            print(f"⚠️ Snapshot de la pregunta {question_id} modificado durante la reconstrucción: no se guarda")
+            return document, None
+        return document, new_revision
+
+    @staticmethod
+    async def invalidate(db: AsyncSession, question_id: int):
+        """
+        Invalida los snapshots de la pregunta (sin commit: va en la transacción del cambio
+        que los invalida). Los de versiones anteriores se borran; el de la versión actual
+        queda sin documento y con la revisión siguiente, así las escrituras condicionales
+        en curso ya no lo restauran.
+        """
+        await db.execute(delete(ComparisonSnapshot).where(
+            ComparisonSnapshot.question_id == question_id,
+            ComparisonSnapshot.analysis_version != ANALYSIS_VERSION
+        ))
+        statement = insert(ComparisonSnapshot).values(
+            question_id=question_id,
+            analysis_version=ANALYSIS_VERSION,
+            document=null(),
+            revision=1,
+            created_at=datetime.utcnow()
+        )
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[ComparisonSnapshot.question_id, ComparisonSnapshot.analysis_version],
+            set_={
+                "document": null(),
+                "revision": ComparisonSnapshot.revision + 1,
+                "created_at": statement.excluded.created_at
+            }
+        ))
+
+    @staticmethod
+    async def save_section(db: AsyncSession, question_id: int, revision: int, name: str, value: Any) -> bool:
+        """
+        Agrega la sección avanzada `name` al documento guardado si sigue en la revisión
+        leída. Solo cambia esa clave (jsonb_set), así dos secciones calculadas a la vez no
+        se pisan. Hace commit y devuelve si se guardó.
+        """
+        advanced = func.coalesce(ComparisonSnapshot.document["advanced"], literal({}, JSONB))
+        document = func.jsonb_set(
+            func.jsonb_set(ComparisonSnapshot.document, literal(["advanced"], ARRAY(Text)), advanced),
+            literal(["advanced", name], ARRAY(Text)),
+            literal(value, JSONB)
+        )
+        result = await db.execute(
+            update(ComparisonSnapshot).where(
+                ComparisonSnapshot.question_id == question_id,
+                ComparisonSnapshot.analysis_version == ANALYSIS_VERSION,
+                ComparisonSnapshot.revision == revision,
+                ComparisonSnapshot.document.isnot(None)
+            ).values(document=document)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def get_section(
+        db: AsyncSession,
+        question_id: int,
+        document: Dict[str, Any],
+        revision: Optional[int],
+        name: str,
+        build: Callable[[Dict[str, Any]], Any]
+    ) -> Any:
+        """
+        Devuelve la sección avanzada `name` del documento; si no está, la calcula con
+        build(documento) fuera del event loop y la guarda en el snapshot si sigue en la
+        revisión `revision` (None: el documento no quedó guardado, no se guarda nada).
+        """
+        advanced = document.setdefault("advanced", {})
+        if name not in advanced:
+            result = await asyncio.get_running_loop().run_in_executor(None, build, document)
+            advanced[name] = to_json_document({"result": result})["result"]
+            if revision is not None and not await ComparisonSnapshotStore.save_section(
+                db, question_id, revision, name, advanced[name]
+            ):
+                print(f"⚠️ Snapshot de la pregunta {question_id} invalidado durante el análisis {name}: no se guarda")
+        return advanced[name]
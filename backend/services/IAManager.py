@@ -1,27 +1,60 @@
 from IATools.IAFactory import IAFactory
+from IATools.AsyncIA import ProviderRateLimited
+from IATools.AsyncHTTP import pool_stats
 from dotenv import load_dotenv
 import os
 import asyncio
 import aiohttp
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from config.ai_config import ai_config_manager
+from services.ResponseCache import response_cache, is_error_response
+from services.RateLimiter import rate_limiter
+from services.CircuitBreaker import circuit_breakers, ProviderUnavailable, CLOSED
 load_dotenv()
 
+# Plazo máximo de una solicitud a todas las IAs (0 = sin plazo)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "30"))
+# Reintentos de respaldo (hedging) para IAs lentas con hedge_after_seconds configurado
+HEDGING_ENABLED = os.getenv("PROVIDER_HEDGING", "false").lower() == "true"
+# Reintentos tras un 429 (cada uno espera el Retry-After del proveedor)
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "2"))
+# Tiempo máximo del pre-calentamiento de conexiones al arrancar
+PROVIDER_WARMUP_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_WARMUP_TIMEOUT_SECONDS", "5"))
+
+# Estado del plazo de la consulta en curso: lo ven las tareas creadas dentro de ella (también
+# los intentos de respaldo) para distinguir la cancelación por plazo de cualquier otra
+_request_deadline_state: ContextVar[Optional[Dict[str, bool]]] = ContextVar("request_deadline_state", default=None)
+
+# IAs que consulta el manager y la variable de entorno de su API key
+PROVIDER_KEYS = [
+    ("ChatGPT", "OPENAI_API_KEY"),
+    #("Claude", "ANTHROPIC_API_KEY"),  # Comentado por ahora
+    ("Gemini", "GEMINI_API_KEY"),
+    ("Mistral", "MISTRAL_API_KEY"),
+    ("Cohere", "COHERE_API_KEY"),
+    ("Perplexity", "PERPLEXITY_API_KEY")
+]
+
 
 class IAManager:
+    """
+    Clientes de todas las IAs configuradas. La app crea una única instancia al arrancar
+    (app.state.ia_manager) y la comparten todas las solicitudes, así los clientes y sus
+    pools de conexiones keep-alive se reutilizan entre preguntas
+    """
+
     def __init__(self):
+        self.created_at = time.time()
+        self.warmup_results = {}
         self.ias = {}
+        # Clientes nativos async: se consultan en el event loop sin ocupar un thread
+        self.async_ias = {}
         self.responses = {}
         
         # Crear instancias de IA solo si tienen API keys válidas
-        ai_configs = [
-            ("ChatGPT", "OPENAI_API_KEY"),
-            #("Claude", "ANTHROPIC_API_KEY"),  # Comentado por ahora
-            ("Gemini", "GEMINI_API_KEY"),
-            ("Mistral", "MISTRAL_API_KEY"),
-            ("Cohere", "COHERE_API_KEY"),
-            ("Perplexity", "PERPLEXITY_API_KEY")
-        ]
-        
-        for ai_name, env_key in ai_configs:
+        for ai_name, env_key in PROVIDER_KEYS:
             api_key = os.getenv(env_key)
             if api_key and api_key.strip():  # Verificar que la API key existe y no está vacía
                 try:
@@ -29,6 +62,12 @@ class IAManager:
                     print(f"✅ {ai_name} inicializado correctamente")
                 except Exception as e:
                     print(f"❌ Error al inicializar {ai_name}: {str(e)}")
+                    continue
+                try:
+                    self.async_ias[ai_name] = IAFactory.create_async_ia(ai_name, api_key)
+                    self.async_ias[ai_name].on_headers = rate_limiter.get(ai_name).update_from_headers
+                except Exception as e:
+                    print(f"⚠️ {ai_name} sin cliente async, se usará un thread: {str(e)}")
             else:
                 print(f"⚠️ {ai_name} no configurado (API key faltante)")
 
@@ -70,48 +109,336 @@ class IAManager:
     def get_responses(self):
         return self.responses
 
-    async def query_single_ai(self, question: str, ai_name: str, lang: str = "en"):
+    async def query_single_ai(
+        self,
+        question: str,
+        ai_name: str,
+        lang: str = "en",
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ):
         """
-        Consulta una IA específica de forma asíncrona
+        Consulta una IA específica de forma asíncrona. Devuelve None si vence el plazo.
+        Lanza ProviderUnavailable si el circuito del proveedor está abierto y
+        ProviderRateLimited si la cuota del proveedor no deja enviarla a tiempo
         """
         if ai_name not in self.ias:
             raise ValueError(f"IA {ai_name} no está disponible")
         
-        full_prompt = self._build_prompt(question, lang, ai_name)
-        response = self.ias[ai_name].get_response(full_prompt, lang)
-        return response
+        deadline = self._resolve_deadline(timeout)
+        return await self._query_ai_async(question, lang, ai_name, self.ias[ai_name], use_cache, deadline)
 
-    async def query_all_ias_parallel(self, question: str, lang: str = "en"):
+    async def query_all_ias_parallel(
+        self,
+        question: str,
+        lang: str = "en",
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ):
         """
-        Consulta todas las IAs en paralelo de forma asíncrona
+        Consulta todas las IAs en paralelo de forma asíncrona (sin las que vencieron el plazo)
         """
-        tasks = []
-        for name, ia in self.ias.items():
-            task = self._query_ai_async(question, lang, name, ia)
-            tasks.append(task)
-        
-        # Ejecutar todas las tareas en paralelo
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Procesar resultados
-        result = {}
-        for i, (name, _) in enumerate(self.ias.items()):
-            if isinstance(responses[i], Exception):
-                result[name] = f"Error: {str(responses[i])}"
-            else:
-                result[name] = responses[i]
-        
-        return result
+        result = await self.query_all_ias_with_status(question, lang, use_cache, timeout)
+        return result["responses"]
 
-    async def _query_ai_async(self, question: str, lang: str, ai_name: str, ia):
+    async def query_all_ias_with_status(
+        self,
+        question: str,
+        lang: str = "en",
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
-        Método auxiliar para consultar una IA de forma asíncrona
+        Consulta todas las IAs en paralelo con un plazo común. Al vencer el plazo devuelve
+        las respuestas recibidas y marca las demás como timed_out. Las IAs con el circuito
+        abierto se omiten y se listan en unavailable; las rechazadas por su cuota, en rate_limited
         """
+        responses = {}
+        timed_out = []
+        unavailable = []
+        rate_limited = []
+        async for name, response in self.query_as_completed(
+            question, lang, use_cache, timeout, unavailable, rate_limited
+        ):
+            if response is not None:
+                responses[name] = response
+            elif name not in unavailable and name not in rate_limited:
+                timed_out.append(name)
+
+        # Mantener el orden de configuración de las IAs
+        ordered = {name: responses[name] for name in self.ias if name in responses}
+        return {
+            "responses": ordered,
+            "timed_out": timed_out,
+            "unavailable": unavailable,
+            "rate_limited": rate_limited
+        }
+
+    async def query_as_completed(
+        self,
+        question: str,
+        lang: str = "en",
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+        unavailable: Optional[List[str]] = None,
+        rate_limited: Optional[List[str]] = None
+    ):
+        """
+        Consulta todas las IAs en paralelo y entrega (nombre, respuesta) en orden de llegada.
+        Las IAs que no responden dentro del plazo se entregan al final con respuesta None.
+        Las IAs con el circuito abierto se entregan de inmediato con None y, si se pasa
+        la lista unavailable, se agregan a ella. Igual con rate_limited para las que su
+        cuota rechazó (espera mayor que el máximo o reintentos de 429 agotados)
+        """
+        deadline = self._resolve_deadline(timeout)
+
+        async def query_named(name, ia):
+            try:
+                return name, await self._query_ai_async(question, lang, name, ia, use_cache, deadline)
+            except ProviderUnavailable:
+                if unavailable is not None:
+                    unavailable.append(name)
+                return name, None
+            except ProviderRateLimited as e:
+                # Un 429 no es una respuesta: no se guarda en caché ni se analiza
+                print(f"🚦 {name} limitado por cuota: {str(e)}")
+                if rate_limited is not None:
+                    rate_limited.append(name)
+                return name, None
+
+        tasks = [asyncio.ensure_future(query_named(name, ia)) for name, ia in self.ias.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Si el consumidor abandona la iteración, no dejar consultas huérfanas
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _resolve_deadline(self, timeout: Optional[float]) -> Optional[float]:
+        """Plazo absoluto (reloj del loop) de la solicitud, acotado por REQUEST_DEADLINE_SECONDS"""
+        if timeout is None or (REQUEST_DEADLINE_SECONDS > 0 and timeout > REQUEST_DEADLINE_SECONDS):
+            timeout = REQUEST_DEADLINE_SECONDS
+        if not timeout or timeout <= 0:
+            return None
+        return asyncio.get_running_loop().time() + timeout
+
+    async def _query_ai_async(
+        self,
+        question: str,
+        lang: str,
+        ai_name: str,
+        ia,
+        use_cache: bool = True,
+        deadline: Optional[float] = None
+    ):
+        """
+        Método auxiliar para consultar una IA de forma asíncrona (pasando por la caché de respuestas).
+        Devuelve None si la IA no respondió antes del plazo. Lanza ProviderRateLimited si
+        su cuota la rechazó y ProviderUnavailable si su circuito está abierto
+        """
+        remaining = None
+        if deadline is not None:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return None
+
+        # La tarea copia el contexto al crearse: ve este estado aunque se cancele desde aquí
+        state = {"expired": False, "failure_recorded": False}
+        token = _request_deadline_state.set(state)
+        try:
+            task = asyncio.ensure_future(self._query_ai_cached(question, lang, ai_name, ia, use_cache))
+        finally:
+            _request_deadline_state.reset(token)
+
+        try:
+            done, _ = await asyncio.wait({task}, timeout=remaining)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if not done:
+            # Se marca antes de cancelar para que _call_provider lo cuente como fallo del proveedor
+            state["expired"] = True
+            task.cancel()
+            await asyncio.wait({task})
+            print(f"⏱️ {ai_name} no respondió dentro del plazo de la solicitud")
+            return None
+        return task.result()
+
+    async def _query_ai_cached(self, question: str, lang: str, ai_name: str, ia, use_cache: bool):
         try:
             full_prompt = self._build_prompt(question, lang, ai_name)
-            # Como las IAs actuales no son async, las ejecutamos en un thread pool
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, ia.get_response, full_prompt, lang)
+
+            # Parámetros del cliente que hace la llamada (el async si existe, si no el de thread)
+            params = (self.async_ias.get(ai_name) or ia).cache_params()
+            cache_key = response_cache.make_key(full_prompt, lang, ai_name, params)
+            if use_cache:
+                cached = await response_cache.get(cache_key, ai_name)
+                if cached is not None:
+                    return cached
+            else:
+                response_cache.record_bypass(ai_name)
+
+            start = time.perf_counter()
+            response = await self._call_with_hedging(full_prompt, lang, ai_name, ia)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            await response_cache.set(cache_key, ai_name, lang, response, latency_ms, params.get("model"))
             return response
+        except (ProviderRateLimited, ProviderUnavailable):
+            raise
         except Exception as e:
             return f"Error: {str(e)}"
+
+    async def _call_with_hedging(self, full_prompt: str, lang: str, ai_name: str, ia):
+        """
+        Si la IA tiene hedge_after_seconds y PROVIDER_HEDGING está activo, lanza un segundo
+        intento cuando el primero tarda demasiado y se queda con el primero que responda bien
+        """
+        config = ai_config_manager.get_config(ai_name)
+        hedge_after = config.hedge_after_seconds if (HEDGING_ENABLED and config) else None
+
+        primary = asyncio.ensure_future(self._call_provider(full_prompt, lang, ai_name, ia))
+        if not hedge_after:
+            return await primary
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_after)
+            if done:
+                return primary.result()
+
+            if circuit_breakers.state(ai_name) != CLOSED:
+                # Con el circuito en prueba no se duplican solicitudes
+                return await primary
+            print(f"🔁 {ai_name} tarda más de {hedge_after}s, lanzando intento de respaldo")
+            pending.add(asyncio.ensure_future(self._call_provider(full_prompt, lang, ai_name, ia)))
+            response = None
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    response = task.result()
+                    if not is_error_response(response):
+                        return response
+            if response is None and error is not None:
+                raise error
+            return response
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call_provider(self, full_prompt: str, lang: str, ai_name: str, ia):
+        """
+        Llamada al proveedor a través de su circuit breaker y su limitador de tasa.
+        Lanza ProviderUnavailable si el circuito está abierto y ProviderRateLimited si no hay
+        turno en la cuota; ante un 429 pausa el limitador según Retry-After y reintenta
+        """
+        breaker = circuit_breakers.get(ai_name)
+        limiter = rate_limiter.get(ai_name)
+        retries = 0
+        while True:
+            if not breaker.allow():
+                raise ProviderUnavailable(f"circuito abierto para {ai_name}")
+            try:
+                acquired = await rate_limiter.acquire(ai_name, full_prompt)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            if not acquired:
+                breaker.release()
+                raise ProviderRateLimited(
+                    f"cuota agotada, la espera supera {rate_limiter.max_wait_seconds}s"
+                )
+
+            start = time.perf_counter()
+            try:
+                async_ia = self.async_ias.get(ai_name)
+                if async_ia is not None:
+                    response = await async_ia.get_response(full_prompt, lang)
+                else:
+                    # Las IAs sin cliente async se ejecutan en un thread pool
+                    loop = asyncio.get_event_loop()
+                    response = await loop.run_in_executor(None, ia.get_response, full_prompt, lang)
+            except ProviderRateLimited as e:
+                # La cuota no indica que el proveedor esté caído
+                breaker.release()
+                limiter.penalize(e.headers)
+                retries += 1
+                if retries > RATE_LIMIT_MAX_RETRIES:
+                    raise
+                print(f"🚦 {ai_name} respondió 429, reintento {retries}/{RATE_LIMIT_MAX_RETRIES}")
+                continue
+            except asyncio.CancelledError:
+                state = _request_deadline_state.get()
+                if state is not None and state["expired"] and not state["failure_recorded"]:
+                    # El proveedor no respondió dentro del plazo: cuenta como fallo (una vez por
+                    # consulta, aunque haya un intento de respaldo en vuelo)
+                    state["failure_recorded"] = True
+                    breaker.record_failure(
+                        (time.perf_counter() - start) * 1000,
+                        "timeout: sin respuesta dentro del plazo de la solicitud"
+                    )
+                else:
+                    breaker.release()
+                raise
+            except Exception as e:
+                response = f"Error: {str(e)}"
+
+            latency_ms = (time.perf_counter() - start) * 1000
+            if is_error_response(response):
+                breaker.record_failure(latency_ms, response)
+            else:
+                breaker.record_success(latency_ms)
+            return response
+
+    async def warmup_connections(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Abre por adelantado las conexiones con cada proveedor (DNS + TCP + TLS) para que la
+        primera pregunta no pague el handshake. Devuelve la latencia (ms) o el error por IA
+        """
+        timeout = PROVIDER_WARMUP_TIMEOUT_SECONDS if timeout is None else timeout
+
+        async def warm(name, async_ia):
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(async_ia.warmup(), timeout=timeout)
+                return name, {"status": "ok", "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+            except Exception as e:
+                return name, {"status": "error", "error": str(e) or type(e).__name__}
+
+        results = await asyncio.gather(*(warm(name, ia) for name, ia in self.async_ias.items()))
+        self.warmup_results = dict(results)
+        warmed = [name for name, result in self.warmup_results.items() if result["status"] == "ok"]
+        print(f"🔥 Conexiones pre-calentadas: {', '.join(warmed) or 'ninguna'}")
+        return self.warmup_results
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Estado de los clientes compartidos y de los pools HTTP keep-alive por proveedor"""
+        http_pools = pool_stats()
+        providers = {}
+        for name in self.ias:
+            async_ia = self.async_ias.get(name)
+            providers[name] = {
+                "client": type(async_ia).__name__ if async_ia is not None else type(self.ias[name]).__name__,
+                # Los SDK (openai, cohere, google) mantienen su propio pool dentro del cliente
+                "pool": "aiohttp" if name in http_pools else "sdk",
+                "http": http_pools.get(name),
+                "warmup": self.warmup_results.get(name),
+            }
+        return {
+            "manager_age_seconds": round(time.time() - self.created_at, 1),
+            "providers": providers
+        }
+
+    async def close(self):
+        """Cierra los clientes async propios (las sesiones HTTP compartidas se cierran al apagar la app)"""
+        for async_ia in self.async_ias.values():
+            try:
+                await async_ia.close()
+            except Exception as e:
+                print(f"⚠️ Error al cerrar cliente async: {str(e)}")
@@ -1,8 +1,66 @@
 from typing import Dict, List, Tuple, Any
 from collections import defaultdict
+import os
 import re
 from difflib import SequenceMatcher
 
+import numpy as np
+
+from services.SentenceSimilarity import SentenceMatrix, threshold_clusters
+
+WORD_RE = re.compile(r'\b\w+\b')
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+BULLET_RE = re.compile(r'[•\-\*]')
+NUMBERED_LIST_RE = re.compile(r'\d+\.')
+DIGIT_RE = re.compile(r'\d')
+
+# Similitud máxima con las oraciones de las otras respuestas para considerar una oración propia
+UNIQUE_POINT_THRESHOLD = float(os.getenv("UNIQUE_POINT_SIMILARITY_THRESHOLD", "0.5"))
+# Similitud entre puntos clave para unirlos en un cluster de consenso / contarlos como acuerdo
+CONSENSUS_THRESHOLD = float(os.getenv("CONSENSUS_SIMILARITY_THRESHOLD", "0.7"))
+AGREEMENT_THRESHOLD = float(os.getenv("AGREEMENT_SIMILARITY_THRESHOLD", "0.6"))
+
+KEY_POINT_KEYWORDS = ['key', 'important', 'main', 'primary', 'essential']
+
+
+class TextProfile:
+    """
+    Perfil de una respuesta: tokens, oraciones, conteos y marcas de estructura,
+    calculados una sola vez y compartidos por todos los métodos del comparador.
+    """
+
+    __slots__ = (
+        "text", "lower", "length",
+        "words", "word_count", "unique_word_count",
+        "lower_words", "word_set",
+        "sentences", "sentence_count", "sentence_word_total", "points",
+        "has_bullets", "has_numbered_list", "has_digits"
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self.length = len(text)
+
+        # Tokens con mayúsculas (diversidad de vocabulario) y en minúsculas (temas, elementos comunes)
+        self.words = WORD_RE.findall(text)
+        self.word_count = len(self.words)
+        self.unique_word_count = len(set(self.words))
+        self.lower_words = WORD_RE.findall(self.lower)
+        self.word_set = set(self.lower_words)
+
+        # Fragmentos tal como los deja re.split (incluye el vacío final tras el último punto)
+        self.sentences = SENTENCE_SPLIT_RE.split(text)
+        self.sentence_count = len(self.sentences)
+        self.sentence_word_total = sum(len(s.split()) for s in self.sentences)
+        # Oraciones sin espacios de al menos 10 caracteres: candidatas a puntos únicos y clave
+        self.points = [s.strip() for s in self.sentences if len(s.strip()) >= 10]
+
+        self.has_bullets = BULLET_RE.search(text) is not None
+        self.has_numbered_list = NUMBERED_LIST_RE.search(text) is not None
+        self.has_digits = DIGIT_RE.search(text) is not None
+
+
 class IntelligentComparator:
     def __init__(self):
         self.comparison_metrics = {}
@@ -11,71 +69,91 @@ class IntelligentComparator:
         """Compara inteligentemente todas las respuestas de AI"""
         if len(responses) < 2:
             return {"error": "Se necesitan al menos 2 respuestas para comparar"}
+        
+        # Cada respuesta se tokeniza una sola vez
+        profiles = {ai: TextProfile(response) for ai, response in responses.items()}
+        sentence_matrix = self._build_sentence_matrix(profiles)
+        quality_ranking = self._quality_ranking(profiles)
             
         comparison_results = {
-            "overall_analysis": self._overall_analysis(responses),
-            "consensus_analysis": self._consensus_analysis(responses),
-            "divergence_analysis": self._divergence_analysis(responses),
-            "quality_ranking": self._quality_ranking(responses),
-            "recommendations": self._generate_recommendations(responses),
-            "detailed_comparisons": self._detailed_pairwise_comparisons(responses)
+            "overall_analysis": self._overall_analysis(profiles),
+            "consensus_analysis": self._consensus_analysis(profiles, sentence_matrix),
+            "divergence_analysis": self._divergence_analysis(profiles, sentence_matrix),
+            "quality_ranking": quality_ranking,
+            "recommendations": self._generate_recommendations(profiles, quality_ranking),
+            "detailed_comparisons": self._detailed_pairwise_comparisons(profiles)
         }
         
         return comparison_results
     
-    def _overall_analysis(self, responses: Dict[str, str]) -> Dict[str, Any]:
+    def _build_sentence_matrix(self, profiles: Dict[str, TextProfile], backend: str = None) -> SentenceMatrix:
+        """Matriz de similitud entre las oraciones de todas las respuestas, calculada una vez"""
+        # Respuestas con el mismo texto forman un grupo y no se comparan entre sí
+        text_groups = {}
+        groups = {ai: text_groups.setdefault(profile.text, len(text_groups)) for ai, profile in profiles.items()}
+        return SentenceMatrix({ai: profile.points for ai, profile in profiles.items()}, groups, backend)
+    
+    def _overall_analysis(self, profiles: Dict[str, TextProfile]) -> Dict[str, Any]:
         """Análisis general de todas las respuestas"""
         # Estadísticas básicas
-        response_lengths = {ai: len(response) for ai, response in responses.items()}
+        response_lengths = {ai: profile.length for ai, profile in profiles.items()}
         avg_length = sum(response_lengths.values()) / len(response_lengths)
         
         # Detectar temas principales
-        common_themes = self._extract_common_themes(responses)
+        common_themes = self._extract_common_themes(profiles)
         
         # Análisis de cobertura
-        coverage_analysis = self._analyze_coverage(responses)
+        coverage_analysis = self._analyze_coverage(profiles)
         
         return {
-            "total_responses": len(responses),
+            "total_responses": len(profiles),
             "average_length": round(avg_length, 2),
             "length_variance": self._calculate_variance(list(response_lengths.values())),
             "common_themes": common_themes,
             "coverage_analysis": coverage_analysis,
-            "consistency_score": self._calculate_consistency_score(responses)
+            "consistency_score": self._calculate_consistency_score(profiles)
         }
     
-    def _consensus_analysis(self, responses: Dict[str, str]) -> Dict[str, Any]:
+    def _consensus_analysis(self, profiles: Dict[str, TextProfile], sentence_matrix: SentenceMatrix) -> Dict[str, Any]:
         """Analiza el consenso entre las respuestas"""
-        # Extraer puntos clave de cada respuesta
-        key_points = {}
-        for ai, response in responses.items():
-            key_points[ai] = self._extract_key_points(response)
+        # Extraer puntos clave de cada respuesta (filas de la matriz de oraciones)
+        key_rows = {ai: self._extract_key_points(ai, sentence_matrix) for ai in profiles}
+        key_points = {ai: [sentence_matrix.sentences[row] for row in rows] for ai, rows in key_rows.items()}
+        
+        # Una sola submatriz de similitud entre todos los puntos clave
+        ai_names = list(key_rows)
+        rows = np.concatenate([key_rows[ai] for ai in ai_names])
+        owners = np.concatenate([np.full(len(key_rows[ai]), i) for i, ai in enumerate(ai_names)])
+        similarity = sentence_matrix.submatrix(rows)
+        points = [sentence_matrix.sentences[row] for row in rows]
         
         # Encontrar puntos de consenso
-        consensus_points = self._find_consensus_points(key_points)
+        consensus_clusters = self._find_consensus_points(points, owners, similarity, ai_names)
+        consensus_points = [cluster["points"][0] for cluster in consensus_clusters]
         
         # Calcular nivel de acuerdo
-        agreement_level = self._calculate_agreement_level(key_points)
+        agreement_level = self._calculate_agreement_level(owners, similarity, len(ai_names))
         
         return {
             "consensus_points": consensus_points,
+            "consensus_clusters": consensus_clusters,
             "agreement_level": agreement_level,
             "consensus_score": len(consensus_points) / max(len(key_points.values()), 1),
             "key_points_by_ai": key_points
         }
     
-    def _divergence_analysis(self, responses: Dict[str, str]) -> Dict[str, Any]:
+    def _divergence_analysis(self, profiles: Dict[str, TextProfile], sentence_matrix: SentenceMatrix) -> Dict[str, Any]:
         """Analiza las divergencias entre respuestas"""
         # Encontrar puntos únicos de cada AI
         unique_points = {}
-        for ai, response in responses.items():
-            unique_points[ai] = self._find_unique_points(response, responses)
+        for ai in profiles:
+            unique_points[ai] = self._find_unique_points(ai, sentence_matrix)
         
         # Detectar contradicciones
-        contradictions = self._detect_contradictions(responses)
+        contradictions = self._detect_contradictions(profiles)
         
         # Análisis de enfoques diferentes
-        approach_analysis = self._analyze_different_approaches(responses)
+        approach_analysis = self._analyze_different_approaches(profiles)
         
         return {
             "unique_points": unique_points,
@@ -84,19 +162,19 @@ class IntelligentComparator:
             "divergence_score": self._calculate_divergence_score(unique_points, contradictions)
         }
     
-    def _quality_ranking(self, responses: Dict[str, str]) -> List[Dict[str, Any]]:
+    def _quality_ranking(self, profiles: Dict[str, TextProfile]) -> List[Dict[str, Any]]:
         """Ranking de calidad de las respuestas"""
         rankings = []
         
-        for ai, response in responses.items():
-            quality_score = self._calculate_response_quality(response)
+        for ai, profile in profiles.items():
+            quality_score = self._calculate_response_quality(profile)
             rankings.append({
                 "ai_name": ai,
                 "quality_score": quality_score,
-                "strengths": self._identify_strengths(response),
-                "weaknesses": self._identify_weaknesses(response),
-                "length": len(response),
-                "readability": self._calculate_readability_score(response)
+                "strengths": self._identify_strengths(profile),
+                "weaknesses": self._identify_weaknesses(profile),
+                "length": profile.length,
+                "readability": self._calculate_readability_score(profile)
             })
         
         # Ordenar por score de calidad
@@ -104,7 +182,11 @@ class IntelligentComparator:
         
         return rankings
     
-    def _generate_recommendations(self, responses: Dict[str, str]) -> Dict[str, List[str]]:
+    def _generate_recommendations(
+        self,
+        profiles: Dict[str, TextProfile],
+        quality_rankings: List[Dict[str, Any]]
+    ) -> Dict[str, List[str]]:
         """Genera recomendaciones basadas en el análisis"""
         recommendations = {
             "best_overall": [],
@@ -114,14 +196,13 @@ class IntelligentComparator:
             "improvement_suggestions": []
         }
         
-        # Encontrar la mejor respuesta general
-        quality_rankings = self._quality_ranking(responses)
+        # Encontrar la mejor respuesta general (ranking ya calculado en compare_responses)
         if quality_rankings:
             recommendations["best_overall"].append(quality_rankings[0]["ai_name"])
         
         # Encontrar la más concisa
         conciseness_rankings = sorted(
-            [(ai, len(response)) for ai, response in responses.items()],
+            [(ai, profile.length) for ai, profile in profiles.items()],
             key=lambda x: x[1]
         )
         if conciseness_rankings:
@@ -132,44 +213,44 @@ class IntelligentComparator:
             recommendations["most_detailed"].append(conciseness_rankings[-1][0])
         
         # Sugerencias de mejora
-        recommendations["improvement_suggestions"] = self._generate_improvement_suggestions(responses)
+        recommendations["improvement_suggestions"] = self._generate_improvement_suggestions(profiles)
         
         return recommendations
     
-    def _detailed_pairwise_comparisons(self, responses: Dict[str, str]) -> Dict[str, Dict]:
+    def _detailed_pairwise_comparisons(self, profiles: Dict[str, TextProfile]) -> Dict[str, Dict]:
         """Comparaciones detalladas entre pares de AI"""
         comparisons = {}
-        ai_names = list(responses.keys())
+        ai_names = list(profiles.keys())
         
         for i in range(len(ai_names)):
             for j in range(i + 1, len(ai_names)):
                 ai1, ai2 = ai_names[i], ai_names[j]
+                profile1, profile2 = profiles[ai1], profiles[ai2]
                 comparison_key = f"{ai1}_vs_{ai2}"
                 
                 comparisons[comparison_key] = {
-                    "similarity_score": self._calculate_similarity(responses[ai1], responses[ai2]),
+                    "similarity_score": self._calculate_similarity(profile1.lower, profile2.lower),
                     "length_comparison": {
-                        ai1: len(responses[ai1]),
-                        ai2: len(responses[ai2]),
-                        "difference": abs(len(responses[ai1]) - len(responses[ai2]))
+                        ai1: profile1.length,
+                        ai2: profile2.length,
+                        "difference": abs(profile1.length - profile2.length)
                     },
-                    "common_elements": self._find_common_elements(responses[ai1], responses[ai2]),
+                    "common_elements": self._find_common_elements(profile1, profile2),
                     "unique_elements": {
-                        ai1: self._find_unique_elements(responses[ai1], responses[ai2]),
-                        ai2: self._find_unique_elements(responses[ai2], responses[ai1])
+                        ai1: self._find_unique_elements(profile1, profile2),
+                        ai2: self._find_unique_elements(profile2, profile1)
                     },
-                    "style_comparison": self._compare_styles(responses[ai1], responses[ai2])
+                    "style_comparison": self._compare_styles(profile1, profile2)
                 }
         
         return comparisons
     
-    def _extract_common_themes(self, responses: Dict[str, str]) -> List[str]:
+    def _extract_common_themes(self, profiles: Dict[str, TextProfile]) -> List[str]:
         """Extrae temas comunes entre las respuestas"""
         # Implementación simplificada - en producción usar NLP más avanzado
         all_words = []
-        for response in responses.values():
-            words = re.findall(r'\b\w+\b', response.lower())
-            all_words.extend(words)
+        for profile in profiles.values():
+            all_words.extend(profile.lower_words)
         
         # Encontrar palabras más frecuentes
         word_freq = defaultdict(int)
@@ -181,116 +262,93 @@ class IntelligentComparator:
         common_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10]
         return [word for word, freq in common_words if freq > 1]
     
-    def _analyze_coverage(self, responses: Dict[str, str]) -> Dict[str, Any]:
+    def _analyze_coverage(self, profiles: Dict[str, TextProfile]) -> Dict[str, Any]:
         """Analiza la cobertura de temas en las respuestas"""
         # Implementación simplificada
-        total_length = sum(len(response) for response in responses.values())
-        avg_length = total_length / len(responses)
+        total_length = sum(profile.length for profile in profiles.values())
+        avg_length = total_length / len(profiles)
         
         return {
             "total_content_length": total_length,
             "average_response_length": round(avg_length, 2),
-            "coverage_variance": self._calculate_variance([len(r) for r in responses.values()]),
+            "coverage_variance": self._calculate_variance([profile.length for profile in profiles.values()]),
             "completeness_estimate": min(1.0, total_length / 1000)  # Estimación simplificada
         }
     
-    def _calculate_consistency_score(self, responses: Dict[str, str]) -> float:
+    def _calculate_consistency_score(self, profiles: Dict[str, TextProfile]) -> float:
         """Calcula un score de consistencia entre respuestas"""
-        if len(responses) < 2:
+        if len(profiles) < 2:
             return 1.0
         
         # Calcular similitud promedio entre todas las respuestas
         similarities = []
-        responses_list = list(responses.values())
+        profiles_list = list(profiles.values())
         
-        for i in range(len(responses_list)):
-            for j in range(i + 1, len(responses_list)):
-                similarity = self._calculate_similarity(responses_list[i], responses_list[j])
+        for i in range(len(profiles_list)):
+            for j in range(i + 1, len(profiles_list)):
+                similarity = self._calculate_similarity(profiles_list[i].lower, profiles_list[j].lower)
                 similarities.append(similarity)
         
         return sum(similarities) / len(similarities) if similarities else 0.0
     
-    def _extract_key_points(self, text: str) -> List[str]:
-        """Extrae puntos clave de un texto"""
+    def _extract_key_points(self, ai: str, sentence_matrix: SentenceMatrix) -> np.ndarray:
+        """Extrae puntos clave de un texto (filas de la matriz de oraciones)"""
         # Implementación simplificada
-        sentences = re.split(r'[.!?]+', text)
-        key_points = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 20 and any(keyword in sentence.lower() for keyword in ['key', 'important', 'main', 'primary', 'essential']):
-                key_points.append(sentence)
-        
-        return key_points[:5]  # Limitar a 5 puntos clave
+        key_rows = [
+            row for row in sentence_matrix.rows[ai]
+            if len(sentence_matrix.sentences[row]) > 20
+            and any(keyword in sentence_matrix.sentences[row].lower() for keyword in KEY_POINT_KEYWORDS)
+        ]
+        return np.asarray(key_rows[:5], dtype=np.int64)  # Limitar a 5 puntos clave
     
-    def _find_consensus_points(self, key_points: Dict[str, List[str]]) -> List[str]:
-        """Encuentra puntos de consenso entre las respuestas"""
-        # Implementación simplificada
-        all_points = []
-        for points in key_points.values():
-            all_points.extend(points)
-        
-        # Encontrar puntos similares
+    def _find_consensus_points(
+        self,
+        points: List[str],
+        owners: np.ndarray,
+        similarity: np.ndarray,
+        ai_names: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Encuentra puntos de consenso: clusters de puntos clave parecidos de al menos 2 AI"""
         consensus = []
-        for i, point1 in enumerate(all_points):
-            for j, point2 in enumerate(all_points[i+1:], i+1):
-                if self._calculate_similarity(point1, point2) > 0.7:
-                    consensus.append(point1)
-                    break
+        for cluster in threshold_clusters(similarity, CONSENSUS_THRESHOLD):
+            cluster_owners = np.unique(owners[cluster])
+            if len(cluster_owners) < 2:
+                continue
+            consensus.append({
+                "points": [points[i] for i in cluster],
+                "ai_names": [ai_names[i] for i in cluster_owners]
+            })
         
-        return list(set(consensus))
+        return consensus
     
-    def _calculate_agreement_level(self, key_points: Dict[str, List[str]]) -> float:
+    def _calculate_agreement_level(self, owners: np.ndarray, similarity: np.ndarray, ai_count: int) -> float:
         """Calcula el nivel de acuerdo entre las respuestas"""
-        if len(key_points) < 2:
+        if ai_count < 2:
             return 1.0
         
-        total_comparisons = 0
-        agreement_count = 0
-        
-        points_list = list(key_points.values())
-        for i in range(len(points_list)):
-            for j in range(i + 1, len(points_list)):
-                for point1 in points_list[i]:
-                    for point2 in points_list[j]:
-                        total_comparisons += 1
-                        if self._calculate_similarity(point1, point2) > 0.6:
-                            agreement_count += 1
+        # Pares de puntos clave de AI distintas, cada par una vez
+        cross_pairs = owners[:, None] < owners[None, :]
+        total_comparisons = int(cross_pairs.sum())
+        agreement_count = int((similarity[cross_pairs] > AGREEMENT_THRESHOLD).sum())
         
         return agreement_count / total_comparisons if total_comparisons > 0 else 0.0
     
-    def _find_unique_points(self, response: str, all_responses: Dict[str, str]) -> List[str]:
+    def _find_unique_points(self, ai: str, sentence_matrix: SentenceMatrix) -> List[str]:
         """Encuentra puntos únicos en una respuesta"""
-        # Implementación simplificada
-        sentences = re.split(r'[.!?]+', response)
-        unique_points = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 10:
-                continue
-                
-            is_unique = True
-            for other_response in all_responses.values():
-                if other_response != response:
-                    if self._calculate_similarity(sentence, other_response) > 0.5:
-                        is_unique = False
-                        break
-            
-            if is_unique:
-                unique_points.append(sentence)
-        
-        return unique_points[:3]  # Limitar a 3 puntos únicos
+        # Oraciones de la AI sin ninguna parecida entre las oraciones de las demás respuestas
+        rows = sentence_matrix.rows[ai]
+        unique_rows = rows[sentence_matrix.unique_rows(UNIQUE_POINT_THRESHOLD)[rows]]
+        return [sentence_matrix.sentences[row] for row in unique_rows[:3]]  # Limitar a 3 puntos únicos
     
-    def _detect_contradictions(self, responses: Dict[str, str]) -> List[Dict[str, str]]:
+    def _detect_contradictions(self, profiles: Dict[str, TextProfile]) -> List[Dict[str, str]]:
         """Detecta contradicciones entre respuestas"""
         contradictions = []
-        responses_list = list(responses.items())
+        profiles_list = list(profiles.items())
         
-        for i, (ai1, response1) in enumerate(responses_list):
-            for j, (ai2, response2) in enumerate(responses_list[i+1:], i+1):
+        for i, (ai1, profile1) in enumerate(profiles_list):
+            for j, (ai2, profile2) in enumerate(profiles_list[i+1:], i+1):
                 # Implementación simplificada - buscar palabras opuestas
-                contradiction = self._find_contradictions_between(response1, response2)
+                contradiction = self._find_contradictions_between(profile1.lower, profile2.lower)
                 if contradiction:
                     contradictions.append({
                         "ai1": ai1,
@@ -300,8 +358,8 @@ class IntelligentComparator:
         
         return contradictions
     
-    def _find_contradictions_between(self, text1: str, text2: str) -> str:
-        """Encuentra contradicciones específicas entre dos textos"""
+    def _find_contradictions_between(self, text1_lower: str, text2_lower: str) -> str:
+        """Encuentra contradicciones específicas entre dos textos (ya en minúsculas)"""
         # Palabras opuestas comunes
         opposites = [
             ("increase", "decrease"), ("high", "low"), ("good", "bad"),
@@ -309,9 +367,6 @@ class IntelligentComparator:
             ("beneficial", "harmful"), ("effective", "ineffective")
         ]
         
-        text1_lower = text1.lower()
-        text2_lower = text2.lower()
-        
         for word1, word2 in opposites:
             if word1 in text1_lower and word2 in text2_lower:
                 return f"'{word1}' vs '{word2}'"
@@ -320,7 +375,7 @@ class IntelligentComparator:
         
         return ""
     
-    def _analyze_different_approaches(self, responses: Dict[str, str]) -> Dict[str, List[str]]:
+    def _analyze_different_approaches(self, profiles: Dict[str, TextProfile]) -> Dict[str, List[str]]:
         """Analiza diferentes enfoques en las respuestas"""
         approaches = {
             "technical": [],
@@ -329,8 +384,8 @@ class IntelligentComparator:
             "creative": []
         }
         
-        for ai, response in responses.items():
-            response_lower = response.lower()
+        for ai, profile in profiles.items():
+            response_lower = profile.lower
             
             # Clasificar enfoque
             if any(word in response_lower for word in ["algorithm", "technical", "implementation", "code"]):
@@ -344,12 +399,12 @@ class IntelligentComparator:
         
         return approaches
     
-    def _calculate_response_quality(self, response: str) -> float:
+    def _calculate_response_quality(self, profile: TextProfile) -> float:
         """Calcula un score de calidad para una respuesta"""
         score = 0.0
         
         # Longitud apropiada (0-25 puntos)
-        length = len(response)
+        length = profile.length
         if 100 <= length <= 500:
             score += 25
         elif 50 <= length <= 1000:
@@ -360,24 +415,21 @@ class IntelligentComparator:
             score += 10
         
         # Estructura (0-25 puntos)
-        if re.search(r'[•\-\*]', response):  # Bullet points
+        if profile.has_bullets:  # Bullet points
             score += 10
-        if re.search(r'\d+\.', response):  # Numbered lists
+        if profile.has_numbered_list:  # Numbered lists
             score += 10
-        if len(re.split(r'[.!?]+', response)) > 3:  # Multiple sentences
+        if profile.sentence_count > 3:  # Multiple sentences
             score += 5
         
         # Vocabulario (0-25 puntos)
-        words = re.findall(r'\b\w+\b', response)
-        unique_words = set(words)
-        if len(words) > 0:
-            diversity = len(unique_words) / len(words)
+        if profile.word_count > 0:
+            diversity = profile.unique_word_count / profile.word_count
             score += diversity * 25
         
         # Legibilidad (0-25 puntos)
-        sentences = re.split(r'[.!?]+', response)
-        if sentences:
-            avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
+        if profile.sentence_count:
+            avg_sentence_length = profile.sentence_word_total / profile.sentence_count
             if 10 <= avg_sentence_length <= 25:
                 score += 25
             elif 5 <= avg_sentence_length <= 30:
@@ -387,43 +439,40 @@ class IntelligentComparator:
         
         return min(100, score)
     
-    def _identify_strengths(self, response: str) -> List[str]:
+    def _identify_strengths(self, profile: TextProfile) -> List[str]:
         """Identifica fortalezas de una respuesta"""
         strengths = []
         
-        if len(response) > 200:
+        if profile.length > 200:
             strengths.append("Respuesta detallada")
-        if re.search(r'[•\-\*]', response):
+        if profile.has_bullets:
             strengths.append("Bien estructurada")
-        if len(re.findall(r'\b\w+\b', response)) > 50:
+        if profile.word_count > 50:
             strengths.append("Vocabulario rico")
-        if re.search(r'\d+', response):
+        if profile.has_digits:
             strengths.append("Incluye datos específicos")
         
         return strengths
     
-    def _identify_weaknesses(self, response: str) -> List[str]:
+    def _identify_weaknesses(self, profile: TextProfile) -> List[str]:
         """Identifica debilidades de una respuesta"""
         weaknesses = []
         
-        if len(response) < 50:
+        if profile.length < 50:
             weaknesses.append("Respuesta muy corta")
-        if len(re.split(r'[.!?]+', response)) < 2:
+        if profile.sentence_count < 2:
             weaknesses.append("Falta estructura")
-        if not re.search(r'[•\-\*]', response) and len(response) > 100:
+        if not profile.has_bullets and profile.length > 100:
             weaknesses.append("Podría beneficiarse de listas")
         
         return weaknesses
     
-    def _calculate_readability_score(self, response: str) -> float:
+    def _calculate_readability_score(self, profile: TextProfile) -> float:
         """Calcula un score de legibilidad"""
-        sentences = re.split(r'[.!?]+', response)
-        words = re.findall(r'\b\w+\b', response)
-        
-        if not sentences or not words:
+        if not profile.sentence_count or not profile.word_count:
             return 0.0
         
-        avg_sentence_length = len(words) / len(sentences)
+        avg_sentence_length = profile.word_count / profile.sentence_count
         
         # Score basado en longitud de oraciones
         if avg_sentence_length <= 15:
@@ -435,13 +484,13 @@ class IntelligentComparator:
         else:
             return 40.0
     
-    def _generate_improvement_suggestions(self, responses: Dict[str, str]) -> List[str]:
+    def _generate_improvement_suggestions(self, profiles: Dict[str, TextProfile]) -> List[str]:
         """Genera sugerencias de mejora"""
         suggestions = []
         
         # Analizar patrones comunes
-        short_responses = [ai for ai, resp in responses.items() if len(resp) < 100]
-        long_responses = [ai for ai, resp in responses.items() if len(resp) > 500]
+        short_responses = [ai for ai, profile in profiles.items() if profile.length < 100]
+        long_responses = [ai for ai, profile in profiles.items() if profile.length > 500]
         
         if short_responses:
             suggestions.append(f"Las respuestas de {', '.join(short_responses)} podrían ser más detalladas")
@@ -450,7 +499,7 @@ class IntelligentComparator:
             suggestions.append(f"Las respuestas de {', '.join(long_responses)} podrían ser más concisas")
         
         # Verificar estructura
-        unstructured = [ai for ai, resp in responses.items() if not re.search(r'[•\-\*]', resp)]
+        unstructured = [ai for ai, profile in profiles.items() if not profile.has_bullets]
         if unstructured:
             suggestions.append(f"Las respuestas de {', '.join(unstructured)} podrían beneficiarse de mejor estructura")
         
@@ -460,31 +509,25 @@ class IntelligentComparator:
         """Calcula similitud entre dos textos"""
         return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
     
-    def _find_common_elements(self, text1: str, text2: str) -> List[str]:
+    def _find_common_elements(self, profile1: TextProfile, profile2: TextProfile) -> List[str]:
         """Encuentra elementos comunes entre dos textos"""
-        words1 = set(re.findall(r'\b\w+\b', text1.lower()))
-        words2 = set(re.findall(r'\b\w+\b', text2.lower()))
-        
-        common = words1.intersection(words2)
+        common = profile1.word_set.intersection(profile2.word_set)
         return list(common)[:10]  # Limitar a 10 elementos
     
-    def _find_unique_elements(self, text1: str, text2: str) -> List[str]:
-        """Encuentra elementos únicos en text1 comparado con text2"""
-        words1 = set(re.findall(r'\b\w+\b', text1.lower()))
-        words2 = set(re.findall(r'\b\w+\b', text2.lower()))
-        
-        unique = words1 - words2
+    def _find_unique_elements(self, profile1: TextProfile, profile2: TextProfile) -> List[str]:
+        """Encuentra elementos únicos en profile1 comparado con profile2"""
+        unique = profile1.word_set - profile2.word_set
         return list(unique)[:5]  # Limitar a 5 elementos
     
-    def _compare_styles(self, text1: str, text2: str) -> Dict[str, Any]:
+    def _compare_styles(self, profile1: TextProfile, profile2: TextProfile) -> Dict[str, Any]:
         """Compara estilos de escritura entre dos textos"""
         return {
-            "text1_length": len(text1),
-            "text2_length": len(text2),
-            "text1_sentences": len(re.split(r'[.!?]+', text1)),
-            "text2_sentences": len(re.split(r'[.!?]+', text2)),
-            "text1_has_bullets": bool(re.search(r'[•\-\*]', text1)),
-            "text2_has_bullets": bool(re.search(r'[•\-\*]', text2))
+            "text1_length": profile1.length,
+            "text2_length": profile2.length,
+            "text1_sentences": profile1.sentence_count,
+            "text2_sentences": profile2.sentence_count,
+            "text1_has_bullets": profile1.has_bullets,
+            "text2_has_bullets": profile2.has_bullets
         }
     
     def _calculate_variance(self, values: List[float]) -> float:
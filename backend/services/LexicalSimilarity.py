@@ -0,0 +1,161 @@
+"""
+Motor de similitud léxica entre respuestas.
+
+Cada respuesta se convierte una sola vez en una firma y todos los pares se comparan a
+partir de esas firmas. Métricas disponibles (LEXICAL_SIMILARITY_METRIC):
+
+- jaccard: Jaccard sobre shingles de k tokens (por defecto).
+- minhash: estimación MinHash del Jaccard de shingles; firma de tamaño fijo, costo por
+  par constante sin importar el largo de las respuestas.
+- edit: 1 - distancia de edición normalizada sobre la secuencia de tokens (no de
+  caracteres), con cada fila de la matriz de Levenshtein calculada con numpy.
+
+Se pueden agregar métricas con register_metric.
+"""
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Type
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def _stable_hash(value: str) -> int:
+    # hash() de Python cambia entre procesos; crc32 no (las firmas pueden venir de otro worker)
+    return zlib.crc32(value.encode("utf-8"))
+
+
+class LexicalMetric(ABC):
+    """Métrica de similitud: signature() una vez por respuesta, similarity() por par"""
+
+    name: str
+
+    @abstractmethod
+    def signature(self, text: str) -> Any:
+        pass
+
+    @abstractmethod
+    def similarity(self, first: Any, second: Any) -> float:
+        pass
+
+
+class ShingleJaccard(LexicalMetric):
+    name = "jaccard"
+
+    def __init__(self, shingle_size: int = None):
+        self.shingle_size = shingle_size or int(os.getenv("LEXICAL_SHINGLE_SIZE", "3"))
+
+    def shingles(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        k = self.shingle_size
+        if len(tokens) <= k:
+            return [" ".join(tokens)] if tokens else []
+        return [" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+
+    def signature(self, text: str) -> frozenset:
+        return frozenset(self.shingles(text))
+
+    def similarity(self, first: frozenset, second: frozenset) -> float:
+        if not first and not second:
+            return 1.0
+        return len(first & second) / len(first | second)
+
+
+class MinHashSimilarity(ShingleJaccard):
+    name = "minhash"
+
+    # Primo mayor que 2**32 para la familia de hashes (a * x + b) mod p
+    _PRIME = np.uint64(4294967311)
+
+    def __init__(self, shingle_size: int = None, num_perm: int = None, seed: int = 1):
+        super().__init__(shingle_size)
+        self.num_perm = num_perm or int(os.getenv("LEXICAL_MINHASH_PERMUTATIONS", "128"))
+        rng = np.random.RandomState(seed)
+        # a, b < 2**31 para que a * x + b no desborde uint64 con x < 2**32
+        self._a = rng.randint(1, 2 ** 31, size=self.num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=self.num_perm).astype(np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = set(self.shingles(text))
+        if not shingles:
+            return np.full(self.num_perm, self._PRIME, dtype=np.uint64)
+        hashes = np.fromiter((_stable_hash(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % self._PRIME
+        return permuted.min(axis=1)
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        return float(np.mean(first == second))
+
+
+class TokenEditSimilarity(LexicalMetric):
+    name = "edit"
+
+    def signature(self, text: str) -> np.ndarray:
+        tokens = tokenize(text)
+        return np.fromiter((_stable_hash(t) for t in tokens), dtype=np.int64, count=len(tokens))
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        longest = max(len(first), len(second))
+        if longest == 0:
+            return 1.0
+        return 1.0 - self.distance(first, second) / longest
+
+    @staticmethod
+    def distance(first: np.ndarray, second: np.ndarray) -> int:
+        """Levenshtein por filas: el bucle recorre la secuencia corta y cada fila es vectorial"""
+        if len(first) > len(second):
+            first, second = second, first
+        if len(first) == 0:
+            return len(second)
+        columns = np.arange(len(second) + 1)
+        previous = columns.copy()
+        current = np.empty_like(previous)
+        for i, token in enumerate(first, start=1):
+            current[0] = i
+            # Sustitución (diagonal) y borrado (arriba)
+            np.minimum(previous[:-1] + (second != token), previous[1:] + 1, out=current[1:])
+            # Inserción (izquierda): current[j] = min_k<=j (current[k] + j - k)
+            previous = np.minimum.accumulate(current - columns) + columns
+        return int(previous[-1])
+
+
+METRICS: Dict[str, Type[LexicalMetric]] = {}
+
+
+def register_metric(metric: Type[LexicalMetric]) -> Type[LexicalMetric]:
+    METRICS[metric.name] = metric
+    return metric
+
+
+for _metric in (ShingleJaccard, MinHashSimilarity, TokenEditSimilarity):
+    register_metric(_metric)
+
+
+class LexicalSimilarityEngine:
+    """Similitud léxica de todos los pares de respuestas a partir de una firma por respuesta"""
+
+    def __init__(self, metric: str = None):
+        name = (metric or os.getenv("LEXICAL_SIMILARITY_METRIC", "jaccard")).lower()
+        if name not in METRICS:
+            raise ValueError(f"Métrica léxica desconocida: {name} (opciones: {', '.join(METRICS)})")
+        self.metric = METRICS[name]()
+
+    @property
+    def metric_name(self) -> str:
+        return self.metric.name
+
+    def pairwise(self, responses: Dict[str, str]) -> Dict[str, float]:
+        ai_names = list(responses.keys())
+        signatures = [self.metric.signature(responses[name]) for name in ai_names]
+        scores = {}
+        for i in range(len(ai_names)):
+            for j in range(i + 1, len(ai_names)):
+                scores[f"{ai_names[i]} vs {ai_names[j]}"] = self.metric.similarity(signatures[i], signatures[j])
+        return scores
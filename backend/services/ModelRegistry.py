@@ -0,0 +1,288 @@
+"""
+Registro de modelos NLP compartido por todo el proceso.
+
+Cada modelo se carga una sola vez (al primer uso o en el warmup de arranque)
+y se entrega como un handle compartido. El registro lleva la cuenta del
+tiempo de carga y la memoria residente de cada modelo, y permite fijar
+(pin) o desalojar (evict) modelos respetando un presupuesto de memoria.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _load_sentence_embedding():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer('all-MiniLM-L6-v2')
+
+
+def _load_nli():
+    from transformers import pipeline
+    return pipeline("text-classification", model="roberta-large-mnli")
+
+
+def _load_ner():
+    from transformers import pipeline
+    return pipeline("ner", grouped_entities=True)
+
+
+def _load_sentiment():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis")
+
+
+def _load_sentiment_tokenizer():
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained("distilbert-base-uncased-finetuned-sst-2-english")
+
+
+# Modelos conocidos por el registro: nombre -> función de carga
+DEFAULT_LOADERS: Dict[str, Callable[[], Any]] = {
+    "sentence_embedding": _load_sentence_embedding,
+    "nli": _load_nli,
+    "ner": _load_ner,
+    "sentiment": _load_sentiment,
+    "sentiment_tokenizer": _load_sentiment_tokenizer,
+}
+
+
+def _env_list(name: str) -> List[str]:
+    value = os.getenv(name, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Memoria residente actual del proceso (solo Linux, None si no se puede leer)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _module_bytes(module) -> int:
+    total = 0
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def _estimate_model_bytes(model: Any) -> Optional[int]:
+    """Estima la memoria de un modelo a partir de sus tensores (parámetros y buffers)"""
+    torch_module = model
+    if not hasattr(torch_module, "parameters"):
+        # Los pipelines de transformers guardan el modelo en .model
+        torch_module = getattr(model, "model", None)
+    if torch_module is None or not hasattr(torch_module, "parameters"):
+        return None
+    try:
+        return _module_bytes(torch_module)
+    except Exception:
+        return None
+
+
+class ModelHandle:
+    """Handle compartido sobre un modelo cargado.
+
+    Las llamadas pasan por un lock propio del modelo: los tokenizers rápidos de
+    Hugging Face no admiten uso concurrente desde varios hilos.
+    """
+
+    def __init__(self, name: str, model: Any, load_time: float, memory_bytes: Optional[int]):
+        self.name = name
+        self.model = model
+        self.load_time = load_time
+        self.memory_bytes = memory_bytes
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.uses = 0
+        self.lock = threading.RLock()
+
+    def _touch(self):
+        self.last_used = time.time()
+        self.uses += 1
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            self._touch()
+            return self.model(*args, **kwargs)
+
+    def call(self, method: str, *args, **kwargs):
+        """Invoca un método del modelo (p.ej. encode) bajo el lock del handle"""
+        with self.lock:
+            self._touch()
+            return getattr(self.model, method)(*args, **kwargs)
+
+    def encode(self, *args, **kwargs):
+        return self.call("encode", *args, **kwargs)
+
+    def decode(self, *args, **kwargs):
+        return self.call("decode", *args, **kwargs)
+
+
+class ModelRegistry:
+    """Carga perezosa y compartida de los modelos NLP del proceso"""
+
+    def __init__(
+        self,
+        loaders: Optional[Dict[str, Callable[[], Any]]] = None,
+        memory_budget_mb: Optional[float] = None,
+        pinned: Optional[List[str]] = None,
+    ):
+        self.loaders = dict(loaders if loaders is not None else DEFAULT_LOADERS)
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv("NLP_MODEL_MEMORY_BUDGET_MB", "0") or 0)
+        # 0 significa sin límite
+        self.memory_budget_mb = memory_budget_mb
+        self.pinned = set(pinned if pinned is not None else _env_list("NLP_PINNED_MODELS"))
+
+        self._handles: Dict[str, ModelHandle] = {}
+        self._state_lock = threading.RLock()
+        # Las cargas se serializan para que el delta de RSS sea atribuible a un único modelo
+        self._load_lock = threading.Lock()
+        self._evictions = 0
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Registra (o reemplaza) la función de carga de un modelo"""
+        with self._state_lock:
+            self.loaders[name] = loader
+
+    def get(self, name: str) -> ModelHandle:
+        """Devuelve el handle del modelo, cargándolo si todavía no está en memoria"""
+        handle = self._handles.get(name)
+        if handle is not None:
+            return handle
+        if name not in self.loaders:
+            raise ValueError(f"Modelo NLP no registrado: {name}")
+
+        with self._load_lock:
+            # Otro hilo pudo haberlo cargado mientras esperábamos el lock
+            handle = self._handles.get(name)
+            if handle is not None:
+                return handle
+
+            rss_before = _current_rss_bytes()
+            start = time.perf_counter()
+            model = self.loaders[name]()
+            load_time = time.perf_counter() - start
+            rss_after = _current_rss_bytes()
+
+            memory_bytes = _estimate_model_bytes(model)
+            if memory_bytes is None and rss_before is not None and rss_after is not None:
+                memory_bytes = max(0, rss_after - rss_before)
+
+            handle = ModelHandle(name, model, load_time, memory_bytes)
+            with self._state_lock:
+                self._handles[name] = handle
+                self._enforce_budget(keep=name)
+            print(f"✅ Modelo NLP '{name}' cargado en {load_time:.2f}s")
+            return handle
+
+    def warmup(self, names: Optional[List[str]] = None) -> Dict[str, float]:
+        """Carga por adelantado los modelos indicados (todos si no se indica ninguno)"""
+        names = names or list(self.loaders.keys())
+        load_times = {}
+        for name in names:
+            try:
+                load_times[name] = self.get(name).load_time
+            except Exception as e:
+                print(f"❌ Error al precargar el modelo NLP '{name}': {str(e)}")
+        return load_times
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._handles
+
+    def pin(self, name: str) -> bool:
+        """Fija un modelo para que nunca sea desalojado por el presupuesto de memoria"""
+        if name not in self.loaders:
+            return False
+        with self._state_lock:
+            self.pinned.add(name)
+        return True
+
+    def unpin(self, name: str) -> bool:
+        if name not in self.loaders:
+            return False
+        with self._state_lock:
+            self.pinned.discard(name)
+            self._enforce_budget()
+        return True
+
+    def evict(self, name: str) -> bool:
+        """Libera un modelo cargado. Los handles ya entregados siguen funcionando hasta soltarse"""
+        with self._state_lock:
+            handle = self._handles.pop(name, None)
+            if handle is None:
+                return False
+            self._evictions += 1
+        self._release_memory()
+        print(f"♻️ Modelo NLP '{name}' desalojado")
+        return True
+
+    def set_memory_budget(self, memory_budget_mb: float):
+        with self._state_lock:
+            self.memory_budget_mb = memory_budget_mb
+            self._enforce_budget()
+
+    def total_memory_mb(self) -> float:
+        return sum(
+            (handle.memory_bytes or 0) for handle in self._handles.values()
+        ) / (1024 * 1024)
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """Desaloja los modelos no fijados usados hace más tiempo hasta respetar el presupuesto"""
+        if not self.memory_budget_mb:
+            return
+        candidates = sorted(
+            (
+                handle for name, handle in self._handles.items()
+                if name not in self.pinned and name != keep
+            ),
+            key=lambda handle: handle.last_used
+        )
+        for handle in candidates:
+            if self.total_memory_mb() <= self.memory_budget_mb:
+                break
+            self._handles.pop(handle.name, None)
+            self._evictions += 1
+            print(f"♻️ Modelo NLP '{handle.name}' desalojado por presupuesto de memoria")
+        self._release_memory()
+
+    def _release_memory(self):
+        try:
+            import gc
+            import torch
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado del registro: memoria y tiempo de carga de cada modelo"""
+        models = {}
+        for name in self.loaders:
+            handle = self._handles.get(name)
+            models[name] = {
+                "loaded": handle is not None,
+                "pinned": name in self.pinned,
+                "load_time_seconds": round(handle.load_time, 3) if handle else None,
+                "memory_mb": (
+                    round(handle.memory_bytes / (1024 * 1024), 2)
+                    if handle and handle.memory_bytes is not None else None
+                ),
+                "uses": handle.uses if handle else 0,
+                "last_used": handle.last_used if handle else None,
+            }
+        return {
+            "models": models,
+            "total_memory_mb": round(self.total_memory_mb(), 2),
+            "memory_budget_mb": self.memory_budget_mb or None,
+            "evictions": self._evictions,
+        }
+
+
+# Instancia global del registro de modelos
+model_registry = ModelRegistry()
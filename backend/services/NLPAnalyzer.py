@@ -1,68 +1,188 @@
 # 📁 backend/services/NLPAnalyzer.py
 
-from sentence_transformers import SentenceTransformer, util
-from transformers import pipeline
-from transformers import AutoTokenizer
-from difflib import SequenceMatcher
+import os
+import time
+import torch
+from sentence_transformers import util
+from services.ModelRegistry import model_registry
 
-tokenizer = AutoTokenizer.from_pretrained("distilbert-base-uncased-finetuned-sst-2-english")
+NLI_BATCH_SIZE = int(os.getenv("NLI_BATCH_SIZE", "8"))
+NLI_BIDIRECTIONAL = os.getenv("NLI_BIDIRECTIONAL", "false").lower() == "true"
 
 def truncate_text(text, max_tokens=512):
+    tokenizer = model_registry.get("sentiment_tokenizer")
     tokens = tokenizer.encode(text, truncation=True, max_length=max_tokens)
     return tokenizer.decode(tokens, skip_special_tokens=True)
 
 class NLPAnalyzer:
     def __init__(self, responses):
         self.responses = responses
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.classifier = pipeline("text-classification", model="roberta-large-mnli")
-        self.ner = pipeline("ner", grouped_entities=True)
-        self.sentiment = pipeline("sentiment-analysis")
+        self._similarity_matrix = None
+        self._embeddings = {}
+        self.contradiction_stats = None
+
+    # Los modelos se obtienen del registro compartido: se cargan una vez por proceso
+    @property
+    def model(self):
+        return model_registry.get("sentence_embedding")
+
+    @property
+    def classifier(self):
+        return model_registry.get("nli")
+
+    @property
+    def ner(self):
+        return model_registry.get("ner")
+
+    @property
+    def sentiment(self):
+        return model_registry.get("sentiment")
+
+    def embed_response(self, ai):
+        """Calcula y guarda el embedding de una respuesta (para adelantarlo mientras llegan las demás)"""
+        self._embeddings[ai] = self.model.encode(self.responses[ai], convert_to_tensor=True)
+        return self._embeddings[ai]
+
+    def set_embedding(self, ai, vector):
+        """Guarda un embedding calculado fuera (p.ej. en un worker del ejecutor de análisis)"""
+        self._embeddings[ai] = torch.as_tensor(vector)
+        self._similarity_matrix = None
+
+    def semantic_similarity_matrix(self):
+        """Matriz NxN de similitud coseno con un único encode en batch de todas las respuestas"""
+        if self._similarity_matrix is None:
+            ai_names = list(self.responses.keys())
+            if not ai_names:
+                self._similarity_matrix = {"ai_names": [], "matrix": []}
+            else:
+                # Solo se codifican las respuestas sin embedding precalculado
+                missing = [ai for ai in ai_names if ai not in self._embeddings]
+                if missing:
+                    encoded = self.model.encode(
+                        [self.responses[ai] for ai in missing],
+                        batch_size=32,
+                        convert_to_tensor=True
+                    )
+                    self._embeddings.update(zip(missing, encoded))
+                embeddings = torch.stack([self._embeddings[ai] for ai in ai_names])
+                matrix = util.cos_sim(embeddings, embeddings)
+                self._similarity_matrix = {"ai_names": ai_names, "matrix": matrix.cpu().tolist()}
+        return self._similarity_matrix
 
     def analyze_semantic_similarity(self):
-        ai_names = list(self.responses.keys())
+        similarity = self.semantic_similarity_matrix()
+        ai_names, matrix = similarity["ai_names"], similarity["matrix"]
         results = []
 
         for i in range(len(ai_names)):
             for j in range(i + 1, len(ai_names)):
-                ai1, ai2 = ai_names[i], ai_names[j]
-                emb1 = self.model.encode(self.responses[ai1], convert_to_tensor=True)
-                emb2 = self.model.encode(self.responses[ai2], convert_to_tensor=True)
-                score = util.cos_sim(emb1, emb2).item()
-                results.append({"ai1": ai1, "ai2": ai2, "score": score})
+                results.append({"ai1": ai_names[i], "ai2": ai_names[j], "score": matrix[i][j]})
 
         return results
 
-    def detect_contradictions(self):
+    def detect_contradictions(self, bidirectional=None, batch_size=None, max_length=512):
+        """NLI por pares (premisa/hipótesis) en micro-batches con padding y truncado por tokens.
+
+        Con bidirectional=True cada par se evalúa en ambos sentidos y la etiqueta final sale
+        del promedio de las dos distribuciones.
+        """
+        if bidirectional is None:
+            bidirectional = NLI_BIDIRECTIONAL
+        batch_size = batch_size or NLI_BATCH_SIZE
+
         ai_names = list(self.responses.keys())
-        results = []
+        pairs = [
+            (ai_names[i], ai_names[j])
+            for i in range(len(ai_names))
+            for j in range(i + 1, len(ai_names))
+        ]
+        inputs = [(self.responses[ai1], self.responses[ai2]) for ai1, ai2 in pairs]
+        if bidirectional:
+            inputs += [(self.responses[ai2], self.responses[ai1]) for ai1, ai2 in pairs]
 
-        for i in range(len(ai_names)):
-            for j in range(i + 1, len(ai_names)):
-                ai1, ai2 = ai_names[i], ai_names[j]
-                max_length = 512
-                text1 = self.responses[ai1][:max_length // 2]
-                text2 = self.responses[ai2][:max_length // 2]
-                input_text = f"{text1} [SEP] {text2}"
+        start = time.perf_counter()
+        distributions = self._classify_pairs(inputs, batch_size, max_length)
+        elapsed = time.perf_counter() - start
 
-                result = self.classifier(input_text)[0]
+        results = []
+        for index, (ai1, ai2) in enumerate(pairs):
+            forward = distributions[index]
+            if bidirectional:
+                backward = distributions[index + len(pairs)]
+                scores = {label: (forward[label] + backward[label]) / 2 for label in forward}
+            else:
+                backward = None
+                scores = forward
 
-                results.append({"ai1": ai1, "ai2": ai2, "label": result['label'], "score": result['score']})
+            label = max(scores, key=scores.get)
+            result = {"ai1": ai1, "ai2": ai2, "label": label, "score": scores[label], "scores": scores}
+            if bidirectional:
+                result["forward"] = forward
+                result["backward"] = backward
+            results.append(result)
 
+        self.contradiction_stats = {
+            "pairs": len(pairs),
+            "bidirectional": bidirectional,
+            "forward_passes": len(inputs),
+            "batch_size": batch_size,
+            "seconds": round(elapsed, 4),
+            "pairs_per_second": round(len(inputs) / elapsed, 2) if elapsed > 0 else None
+        }
         return results
 
+    def _classify_pairs(self, inputs, batch_size, max_length):
+        """Distribución entailment/neutral/contradiction para cada par (premisa, hipótesis)"""
+        if not inputs:
+            return []
+
+        classifier = self.classifier
+        model = classifier.model.model
+        tokenizer = classifier.model.tokenizer
+        id2label = model.config.id2label
+
+        # Ordenar por longitud reduce el padding dentro de cada micro-batch
+        order = sorted(range(len(inputs)), key=lambda k: len(inputs[k][0]) + len(inputs[k][1]))
+        distributions = [None] * len(inputs)
+
+        with classifier.lock, torch.inference_mode():
+            for offset in range(0, len(order), batch_size):
+                batch_ids = order[offset:offset + batch_size]
+                encoded = tokenizer(
+                    [inputs[k][0] for k in batch_ids],
+                    [inputs[k][1] for k in batch_ids],
+                    padding=True,
+                    truncation="longest_first",
+                    max_length=max_length,
+                    return_tensors="pt"
+                ).to(model.device)
+                probabilities = torch.softmax(model(**encoded).logits, dim=-1).cpu().tolist()
+                for k, row in zip(batch_ids, probabilities):
+                    distributions[k] = {id2label[label_id]: score for label_id, score in enumerate(row)}
+
+        return distributions
+
     def extract_named_entities(self):
         results = {}
-        for ai, response in self.responses.items():
-            results[ai] = self.ner(response)
+        for ai in self.responses:
+            results[ai] = self.entities_for(ai)
         return results
 
+    def entities_for(self, ai):
+        return self.ner(self.responses[ai])
+
     def analyze_sentiment(self):
         results = {}
-        for ai, response in self.responses.items():
-            if not response:
-                continue
-            text = truncate_text(response)
-            results[ai] = self.sentiment(text)
+        for ai in self.responses:
+            result = self.sentiment_for(ai)
+            if result is not None:
+                results[ai] = result
         return results
 
+    def sentiment_for(self, ai):
+        response = self.responses[ai]
+        if not response:
+            return None
+        text = truncate_text(response)
+        return self.sentiment(text)
+
@@ -0,0 +1,130 @@
+"""
+Detector de frases de varias categorías, compartido por los análisis de respuestas.
+
+Las listas de todos los idiomas se preparan una sola vez al importar el módulo: cada
+frase distinta queda una sola vez (aunque esté en varias categorías) junto con las
+categorías a las que pertenece. find() pasa el texto a minúsculas una vez y devuelve las
+frases presentes de todas las categorías, con el mismo resultado que buscar cada frase
+con `frase in texto.lower()`.
+
+Para listas de este tamaño la búsqueda de subcadenas de CPython sobre el texto ya en
+minúsculas es más rápida que un único regex con todas las frases (alternativas en forma
+de trie probadas en cada posición), incluso recorriendo el texto una vez por frase.
+
+Las listas por idioma están en PHRASES; register_phrases agrega frases y reconstruye
+el detector del idioma. Los idiomas sin listas propias usan las de inglés.
+"""
+from typing import Dict, List, Set, Tuple
+
+DEFAULT_LANGUAGE = "en"
+
+PHRASES: Dict[str, Dict[str, List[str]]] = {
+    "en": {
+        "factual": [
+            'according to', 'research shows', 'studies indicate', 'data suggests',
+            'evidence shows', 'statistics show', 'reports indicate', 'analysis reveals',
+            'findings show', 'results indicate', 'survey shows', 'experts say'
+        ],
+        "uncertainty": [
+            'might be', 'could be', 'possibly', 'perhaps', 'maybe', 'potentially',
+            'it seems', 'appears to', 'suggests', 'indicates', 'may be'
+        ],
+        "confident": [
+            'definitely', 'certainly', 'clearly', 'obviously', 'undoubtedly',
+            'without doubt', 'absolutely', 'positively', 'assuredly'
+        ],
+        "cautious": [
+            'i think', 'in my opinion', 'it seems', 'appears', 'might',
+            'could', 'possibly', 'perhaps', 'maybe', 'i believe'
+        ],
+        "connector": [
+            'however', 'therefore', 'furthermore', 'moreover', 'consequently',
+            'additionally', 'nevertheless', 'nonetheless', 'thus', 'hence'
+        ],
+        "introduction": [
+            'introduction', 'overview', 'summary', 'in this', 'this article',
+            'this response', 'let me', 'i will', 'we will'
+        ],
+        "conclusion": [
+            'conclusion', 'summary', 'in conclusion', 'to summarize',
+            'therefore', 'thus', 'finally', 'in summary'
+        ],
+    },
+    "es": {
+        "factual": [
+            'según', 'de acuerdo con', 'los estudios indican', 'las investigaciones muestran',
+            'los datos sugieren', 'la evidencia muestra', 'las estadísticas muestran',
+            'los informes indican', 'el análisis revela', 'los resultados indican',
+            'la encuesta muestra', 'los expertos dicen'
+        ],
+        "uncertainty": [
+            'podría ser', 'puede ser', 'posiblemente', 'quizás', 'quizá', 'tal vez',
+            'potencialmente', 'parece que', 'sugiere', 'indica'
+        ],
+        "confident": [
+            'definitivamente', 'ciertamente', 'claramente', 'obviamente', 'indudablemente',
+            'sin duda', 'absolutamente', 'sin lugar a dudas'
+        ],
+        "cautious": [
+            'creo que', 'en mi opinión', 'parece', 'podría', 'posiblemente',
+            'quizás', 'quizá', 'tal vez', 'me parece'
+        ],
+        "connector": [
+            'sin embargo', 'por lo tanto', 'además', 'asimismo', 'en consecuencia',
+            'no obstante', 'por consiguiente', 'así que', 'por ende'
+        ],
+        "introduction": [
+            'introducción', 'resumen', 'en este', 'en esta', 'este artículo',
+            'esta respuesta', 'permíteme', 'voy a', 'vamos a'
+        ],
+        "conclusion": [
+            'conclusión', 'en conclusión', 'en resumen', 'para resumir',
+            'por lo tanto', 'finalmente', 'en definitiva'
+        ],
+    },
+}
+
+
+class PhraseMatcher:
+    """Encuentra qué frases de cada categoría aparecen en un texto"""
+
+    def __init__(self, phrases_by_category: Dict[str, List[str]]):
+        self.categories = {
+            category: [phrase.lower() for phrase in phrases]
+            for category, phrases in phrases_by_category.items()
+        }
+        # Frase -> categorías: las frases repetidas entre categorías se buscan una vez
+        owners: Dict[str, List[str]] = {}
+        for category, phrases in self.categories.items():
+            for phrase in phrases:
+                owners.setdefault(phrase, []).append(category)
+        self._phrases: List[Tuple[str, List[str]]] = list(owners.items())
+
+    def find(self, text: str) -> Dict[str, Set[str]]:
+        """Frases presentes por categoría (cada frase cuenta una vez, como `frase in texto`)"""
+        text = text.lower()
+        found: Dict[str, Set[str]] = {category: set() for category in self.categories}
+        for phrase, categories in self._phrases:
+            if phrase in text:
+                for category in categories:
+                    found[category].add(phrase)
+        return found
+
+    def counts(self, text: str) -> Dict[str, int]:
+        return {category: len(found) for category, found in self.find(text).items()}
+
+
+PHRASE_MATCHERS: Dict[str, PhraseMatcher] = {
+    language: PhraseMatcher(categories) for language, categories in PHRASES.items()
+}
+
+
+def register_phrases(language: str, category: str, phrases: List[str]):
+    """Agrega frases a una categoría de un idioma y reconstruye su detector"""
+    categories = PHRASES.setdefault(language, {})
+    categories.setdefault(category, []).extend(phrases)
+    PHRASE_MATCHERS[language] = PhraseMatcher(categories)
+
+
+def get_phrase_matcher(language: str = None) -> PhraseMatcher:
+    return PHRASE_MATCHERS.get(language or DEFAULT_LANGUAGE, PHRASE_MATCHERS[DEFAULT_LANGUAGE])
@@ -0,0 +1,192 @@
+"""
+Índice de embeddings de preguntas para detectar preguntas casi duplicadas.
+
+Los embeddings (MiniLM, normalizados) se guardan en la tabla question_embeddings,
+así el índice se reconstruye al arrancar sin volver a codificar. La búsqueda usa
+HNSW (hnswlib) si está instalado y, si no, un producto matricial exacto con numpy.
+"""
+import asyncio
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models.question import Question as QuestionModel
+from models.question_embedding import QuestionEmbedding
+from models.summary import Summary
+from services.ModelRegistry import model_registry
+
+try:
+    import hnswlib
+except ImportError:  # pragma: no cover - depende del entorno
+    hnswlib = None
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class QuestionIndex:
+    """Búsqueda de la pregunta previa más parecida por similitud coseno"""
+
+    def __init__(self, threshold: Optional[float] = None, enabled: Optional[bool] = None):
+        if threshold is None:
+            threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        if enabled is None:
+            enabled = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+        self.threshold = threshold
+        self.enabled = enabled
+
+        self._lock = threading.RLock()
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._languages: Dict[int, Optional[str]] = {}
+        # HNSW
+        self._hnsw = None
+        # Fallback exacto
+        self._ids: List[int] = []
+        self._vectors: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = model_registry.get("sentence_embedding").encode(
+            texts, batch_size=64, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+    async def load(self, batch_size: int = 256):
+        """Carga los embeddings persistidos y calcula los de preguntas previas que no lo tengan"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            loop = asyncio.get_running_loop()
+            async with AsyncSessionLocal() as db:
+                stored = (await db.execute(
+                    select(QuestionEmbedding.question_id, QuestionEmbedding.embedding, QuestionModel.language)
+                    .join(QuestionModel, QuestionModel.id == QuestionEmbedding.question_id)
+                    .where(QuestionEmbedding.model_name == EMBEDDING_MODEL_NAME)
+                )).all()
+                with self._lock:
+                    for question_id, blob, language in stored:
+                        self._add_vector(question_id, np.frombuffer(blob, dtype=np.float32), language)
+
+                # Solo preguntas con análisis completo (tienen resumen) y sin embedding todavía
+                pending = (await db.execute(
+                    select(QuestionModel.id, QuestionModel.text, QuestionModel.language)
+                    .join(Summary, Summary.question_id == QuestionModel.id)
+                    .outerjoin(QuestionEmbedding, QuestionEmbedding.question_id == QuestionModel.id)
+                    .where(QuestionEmbedding.question_id.is_(None))
+                    .distinct()
+                )).all()
+
+                for offset in range(0, len(pending), batch_size):
+                    batch = pending[offset:offset + batch_size]
+                    vectors = await loop.run_in_executor(None, self.embed, [row.text for row in batch])
+                    with self._lock:
+                        for row, vector in zip(batch, vectors):
+                            db.add(QuestionEmbedding(
+                                question_id=row.id, model_name=EMBEDDING_MODEL_NAME, embedding=vector.tobytes()
+                            ))
+                            self._add_vector(row.id, vector, row.language)
+                    await db.commit()
+            self._loaded = True
+            print(f"✅ Índice de preguntas cargado ({len(self._languages)} preguntas)")
+
+    async def add(self, question_id: int, text: str, language: Optional[str] = None):
+        """Agrega una pregunta analizada al índice y persiste su embedding"""
+        if not self.enabled:
+            return
+        try:
+            await self.load()
+            vector = (await asyncio.get_running_loop().run_in_executor(None, self.embed, [text]))[0]
+            async with AsyncSessionLocal() as db:
+                await db.merge(QuestionEmbedding(
+                    question_id=question_id, model_name=EMBEDDING_MODEL_NAME, embedding=vector.tobytes()
+                ))
+                await db.commit()
+            with self._lock:
+                self._add_vector(question_id, vector, language)
+        except Exception as e:
+            print(f"⚠️ Error al indexar la pregunta {question_id}: {str(e)}")
+
+    def remove(self, question_id: int):
+        with self._lock:
+            if question_id not in self._languages:
+                return
+            del self._languages[question_id]
+            if self._hnsw is not None:
+                self._hnsw.mark_deleted(question_id)
+            else:
+                index = self._ids.index(question_id)
+                del self._ids[index]
+                del self._vectors[index]
+                self._matrix = None
+
+    async def find_similar(self, text: str, language: Optional[str] = None, k: int = 5) -> Optional[Tuple[int, float]]:
+        """Devuelve (question_id, similitud) de la pregunta previa más parecida sobre el umbral"""
+        if not self.enabled:
+            return None
+        try:
+            await self.load()
+            query = (await asyncio.get_running_loop().run_in_executor(None, self.embed, [text]))[0]
+            with self._lock:
+                candidates = self._search(query, k)
+        except Exception as e:
+            print(f"⚠️ Error al buscar en el índice de preguntas: {str(e)}")
+            return None
+
+        for question_id, similarity in candidates:
+            if similarity < self.threshold:
+                break
+            if language is None or self._languages.get(question_id) in (None, language):
+                return question_id, similarity
+        return None
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "loaded": self._loaded,
+            "questions": len(self._languages),
+            "threshold": self.threshold,
+            "backend": "hnswlib" if hnswlib is not None else "numpy"
+        }
+
+    def _add_vector(self, question_id: int, vector: np.ndarray, language: Optional[str]):
+        self._languages[question_id] = language
+        if hnswlib is not None:
+            if self._hnsw is None:
+                self._hnsw = hnswlib.Index(space="cosine", dim=vector.shape[0])
+                self._hnsw.init_index(max_elements=1024, ef_construction=200, M=16)
+                self._hnsw.set_ef(64)
+            if self._hnsw.get_current_count() >= self._hnsw.get_max_elements():
+                self._hnsw.resize_index(self._hnsw.get_max_elements() * 2)
+            self._hnsw.add_items(vector.reshape(1, -1), np.array([question_id]))
+        elif question_id in self._ids:
+            self._vectors[self._ids.index(question_id)] = vector
+            self._matrix = None
+        else:
+            self._ids.append(question_id)
+            self._vectors.append(vector)
+            self._matrix = None
+
+    def _search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        count = len(self._languages)
+        if count == 0:
+            return []
+        k = min(k, count)
+        if self._hnsw is not None:
+            labels, distances = self._hnsw.knn_query(query.reshape(1, -1), k=k)
+            return [(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
+
+        if self._matrix is None:
+            self._matrix = np.vstack(self._vectors)
+        scores = self._matrix @ query
+        top = np.argsort(-scores)[:k]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+
+# Instancia global del índice de preguntas
+question_index = QuestionIndex()
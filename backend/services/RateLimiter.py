@@ -0,0 +1,258 @@
+"""
+Limitador de tasa por proveedor de IA.
+
+Cada proveedor tiene dos token buckets: solicitudes por minuto (RPM) y tokens por
+minuto (TPM), configurados en AIConfig. Las solicitudes que exceden el límite esperan
+en cola un tiempo acotado en vez de fallar. Las cabeceras Retry-After y x-ratelimit-*
+de las respuestas ajustan los buckets a la cuota real del proveedor.
+"""
+import asyncio
+import os
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from config.ai_config import ai_config_manager
+
+# Espera máxima en cola antes de dar por limitada una solicitud
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "10"))
+# Espera por defecto tras un 429 sin Retry-After
+RATE_LIMIT_DEFAULT_BACKOFF_SECONDS = float(os.getenv("RATE_LIMIT_DEFAULT_BACKOFF_SECONDS", "2"))
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Segundos de una duración tipo '20', '1.5s', '6m0s', '20ms' o una fecha HTTP"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts:
+        factors = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        return sum(float(amount) * factors[unit] for amount, unit in parts)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _first_header(headers: Mapping[str, str], *names: str) -> Optional[str]:
+    lowered = {str(key).lower(): value for key, value in headers.items()}
+    for name in names:
+        if name in lowered:
+            return lowered[name]
+    return None
+
+
+def _as_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Bucket que se rellena de forma continua hasta su capacidad (límite por minuto)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Segundos hasta que haya saldo para amount (0 si ya lo hay)"""
+        # Una solicitud más grande que la capacidad se trata como si usara todo el bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class ProviderRateLimiter:
+    """Buckets RPM/TPM de un proveedor más los contadores de throttling"""
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.name = name
+        self._lock = threading.Lock()
+        self.requests: Optional[TokenBucket] = None
+        self.tokens: Optional[TokenBucket] = None
+        self.configure(requests_per_minute, tokens_per_minute)
+        # Pausa impuesta por el proveedor (Retry-After o cuota agotada)
+        self.blocked_until = 0.0
+        self.counters = {
+            "requests": 0,
+            "throttled": 0,
+            "rejected": 0,
+            "rate_limited_responses": 0,
+            "wait_seconds": 0.0,
+            "max_queue_depth": 0,
+        }
+        self.queued = 0
+
+    def configure(self, requests_per_minute: Optional[float], tokens_per_minute: Optional[float]):
+        with self._lock:
+            self.requests_per_minute = requests_per_minute
+            self.tokens_per_minute = tokens_per_minute
+            self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+            self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def reserve(self, estimated_tokens: int, max_wait: float) -> Optional[float]:
+        """
+        Reserva saldo para una solicitud y devuelve cuántos segundos debe esperar antes
+        de enviarla, o None si la espera superaría max_wait (no se reserva nada).
+        Las reservas pueden dejar el bucket en negativo: así las solicitudes en cola
+        quedan ordenadas sin necesidad de un lock del event loop.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            for bucket, amount in ((self.requests, 1), (self.tokens, estimated_tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_for(amount))
+
+            self.counters["requests"] += 1
+            if wait > max_wait:
+                self.counters["rejected"] += 1
+                return None
+
+            for bucket, amount in ((self.requests, 1), (self.tokens, estimated_tokens)):
+                if bucket is not None:
+                    bucket.tokens -= min(amount, bucket.capacity)
+            if wait > 0:
+                self.counters["throttled"] += 1
+                self.counters["wait_seconds"] += wait
+            return wait
+
+    async def acquire(self, estimated_tokens: int, max_wait: float) -> bool:
+        wait = self.reserve(estimated_tokens, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            with self._lock:
+                self.queued += 1
+                self.counters["max_queue_depth"] = max(self.counters["max_queue_depth"], self.queued)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                with self._lock:
+                    self.queued -= 1
+        return True
+
+    def penalize(self, headers: Optional[Mapping[str, str]] = None):
+        """El proveedor respondió 429: pausar hasta Retry-After (o el backoff por defecto)"""
+        retry_after = parse_duration(_first_header(headers or {}, "retry-after", "x-ratelimit-reset-requests"))
+        if retry_after is None:
+            retry_after = RATE_LIMIT_DEFAULT_BACKOFF_SECONDS
+        with self._lock:
+            self.counters["rate_limited_responses"] += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        self.update_from_headers(headers or {})
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Ajusta los buckets con las cabeceras de cuota del proveedor (formatos OpenAI/Mistral/Anthropic)"""
+        limit_requests = _as_float(_first_header(
+            headers, "x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit", "x-ratelimit-limit"
+        ))
+        remaining_requests = _as_float(_first_header(
+            headers, "x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining", "x-ratelimit-remaining"
+        ))
+        reset_requests = parse_duration(_first_header(headers, "x-ratelimit-reset-requests"))
+        limit_tokens = _as_float(_first_header(
+            headers, "x-ratelimit-limit-tokens", "x-ratelimit-limit-tokens-minute", "anthropic-ratelimit-tokens-limit"
+        ))
+        remaining_tokens = _as_float(_first_header(
+            headers, "x-ratelimit-remaining-tokens", "x-ratelimit-remaining-tokens-minute", "anthropic-ratelimit-tokens-remaining"
+        ))
+
+        # Sin límite configurado se aprende el que informa el proveedor
+        if limit_requests and not self.requests_per_minute:
+            self.configure(limit_requests, self.tokens_per_minute)
+        if limit_tokens and not self.tokens_per_minute:
+            self.configure(self.requests_per_minute, limit_tokens)
+
+        with self._lock:
+            now = time.monotonic()
+            if remaining_requests is not None and self.requests is not None:
+                self.requests.refill(now)
+                self.requests.tokens = min(self.requests.tokens, remaining_requests)
+            if remaining_tokens is not None and self.tokens is not None:
+                self.tokens.refill(now)
+                self.tokens.tokens = min(self.tokens.tokens, remaining_tokens)
+            if remaining_requests == 0 and reset_requests:
+                self.blocked_until = max(self.blocked_until, now + reset_requests)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "available_requests": round(self.requests.tokens, 2) if self.requests else None,
+                "available_tokens": round(self.tokens.tokens) if self.tokens else None,
+                "blocked_for_seconds": round(max(0.0, self.blocked_until - now), 2),
+                "queued": self.queued,
+                **{
+                    name: round(value, 3) if isinstance(value, float) else value
+                    for name, value in self.counters.items()
+                },
+            }
+
+
+class RateLimiterRegistry:
+    """Limitadores por proveedor, creados a partir de la configuración de cada IA"""
+
+    def __init__(self, max_wait_seconds: Optional[float] = None):
+        self.max_wait_seconds = RATE_LIMIT_MAX_WAIT_SECONDS if max_wait_seconds is None else max_wait_seconds
+        self._limiters: Dict[str, ProviderRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ai_name: str) -> ProviderRateLimiter:
+        config = ai_config_manager.get_config(ai_name)
+        rpm = config.requests_per_minute if config else None
+        tpm = config.tokens_per_minute if config else None
+        with self._lock:
+            limiter = self._limiters.get(ai_name)
+            if limiter is None:
+                limiter = ProviderRateLimiter(ai_name, rpm, tpm)
+                self._limiters[ai_name] = limiter
+        # La configuración puede cambiar en caliente (update_config)
+        if (rpm and rpm != limiter.requests_per_minute) or (tpm and tpm != limiter.tokens_per_minute):
+            limiter.configure(rpm or limiter.requests_per_minute, tpm or limiter.tokens_per_minute)
+        return limiter
+
+    def estimate_tokens(self, ai_name: str, prompt: str) -> int:
+        """Tokens aproximados de una solicitud: ~4 caracteres por token más la respuesta máxima"""
+        config = ai_config_manager.get_config(ai_name)
+        return len(prompt) // 4 + (config.max_tokens if config else 0)
+
+    async def acquire(self, ai_name: str, prompt: str, max_wait: Optional[float] = None) -> bool:
+        """Espera turno en la cola del proveedor. False si la espera superaría max_wait"""
+        max_wait = self.max_wait_seconds if max_wait is None else max_wait
+        return await self.get(ai_name).acquire(self.estimate_tokens(ai_name, prompt), max_wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {
+            "max_wait_seconds": self.max_wait_seconds,
+            "providers": {name: limiter.stats() for name, limiter in limiters.items()}
+        }
+
+
+# Instancia global del limitador de tasa
+rate_limiter = RateLimiterRegistry()
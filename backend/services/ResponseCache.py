@@ -0,0 +1,225 @@
+"""
+Caché de respuestas de proveedores en dos niveles:
+un LRU en memoria con TTL delante de una tabla persistente en Postgres.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from config.ai_config import ai_config_manager
+from database import AsyncSessionLocal
+from models.provider_response_cache import ProviderResponseCache
+
+ERROR_PREFIXES = ("Error", "[Perplexity ERROR")
+
+
+def is_error_response(response: Optional[str]) -> bool:
+    """Las respuestas de error de los clientes de IA no se guardan en caché"""
+    return not response or response.startswith(ERROR_PREFIXES)
+
+
+def _normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.split()).casefold()
+
+
+class ResponseCache:
+    """LRU en memoria con TTL por proveedor, respaldado por la tabla provider_response_cache"""
+
+    def __init__(self, max_entries: Optional[int] = None, enabled: Optional[bool] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+        if enabled is None:
+            enabled = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        # cache_key -> (respuesta, expira_en (epoch), latencia original en ms)
+        self._entries: "OrderedDict[str, Tuple[str, float, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "saved_latency_ms": 0.0
+        })
+
+    def make_key(self, prompt: str, lang: str, ai_name: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Hash del prompt normalizado, idioma, proveedor y los parámetros que el cliente envía
+        de verdad (modelo, muestreo, instrucciones: IA.cache_params), no los de AIConfig
+        """
+        key_data = {
+            "prompt": _normalize_prompt(prompt),
+            "lang": lang,
+            "ai_name": ai_name,
+            "params": params or {},
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, ai_name: str) -> int:
+        config = ai_config_manager.get_config(ai_name)
+        return config.cache_ttl_seconds if config else 0
+
+    async def get(self, key: str, ai_name: str) -> Optional[str]:
+        """Busca en memoria y luego en la base de datos. Devuelve None si no hay entrada vigente"""
+        if not self.enabled or self.ttl_for(ai_name) <= 0:
+            return None
+
+        entry = self._memory_get(key)
+        if entry is not None:
+            self._record_hit(ai_name, "memory_hits", entry[2])
+            return entry[0]
+
+        try:
+            row = await self._db_get(key)
+        except Exception as e:
+            print(f"⚠️ Error al leer la caché de respuestas: {str(e)}")
+            row = None
+
+        if row is None:
+            with self._lock:
+                self._counters[ai_name]["misses"] += 1
+            return None
+
+        response_text, expires_at, latency_ms = row
+        self._memory_set(key, response_text, expires_at, latency_ms)
+        self._record_hit(ai_name, "db_hits", latency_ms)
+        return response_text
+
+    async def set(
+        self,
+        key: str,
+        ai_name: str,
+        lang: str,
+        response_text: str,
+        latency_ms: Optional[float] = None,
+        model_name: Optional[str] = None
+    ):
+        if not self.enabled or is_error_response(response_text):
+            return
+        ttl = self.ttl_for(ai_name)
+        if ttl <= 0:
+            return
+
+        expires_at = time.time() + ttl
+        self._memory_set(key, response_text, expires_at, latency_ms)
+        with self._lock:
+            self._counters[ai_name]["stores"] += 1
+
+        try:
+            await self._db_set(key, ai_name, lang, response_text, expires_at, latency_ms, model_name)
+        except Exception as e:
+            print(f"⚠️ Error al guardar en la caché de respuestas: {str(e)}")
+
+    def record_bypass(self, ai_name: str):
+        with self._lock:
+            self._counters[ai_name]["bypassed"] += 1
+
+    async def clear(self, persistent: bool = False) -> int:
+        """Vacía el nivel en memoria (y opcionalmente la tabla). Devuelve las entradas borradas"""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+        if persistent:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(delete(ProviderResponseCache))
+                await db.commit()
+                removed += result.rowcount
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = {name: dict(counters) for name, counters in self._counters.items()}
+            entries = len(self._entries)
+
+        totals = defaultdict(float)
+        for counters in providers.values():
+            for counter, value in counters.items():
+                totals[counter] += value
+        hits = totals["memory_hits"] + totals["db_hits"]
+        lookups = hits + totals["misses"]
+
+        return {
+            "enabled": self.enabled,
+            "memory_entries": entries,
+            "max_entries": self.max_entries,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "totals": dict(totals),
+            "providers": providers,
+            "ttl_seconds": {
+                name: config.cache_ttl_seconds for name, config in ai_config_manager.ai_configs.items()
+            }
+        }
+
+    def _record_hit(self, ai_name: str, counter: str, latency_ms: Optional[float]):
+        with self._lock:
+            self._counters[ai_name][counter] += 1
+            self._counters[ai_name]["saved_latency_ms"] += latency_ms or 0.0
+
+    def _memory_get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _memory_set(self, key: str, response_text: str, expires_at: float, latency_ms: Optional[float]):
+        with self._lock:
+            self._entries[key] = (response_text, expires_at, latency_ms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _db_get(self, key: str):
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(select(ProviderResponseCache).where(
+                ProviderResponseCache.cache_key == key,
+                ProviderResponseCache.expires_at > datetime.utcnow()
+            ))).scalars().first()
+            if row is None:
+                return None
+            expires_at = time.time() + (row.expires_at - datetime.utcnow()).total_seconds()
+            return row.response_text, expires_at, row.latency_ms
+
+    async def _db_set(
+        self,
+        key: str,
+        ai_name: str,
+        lang: str,
+        response_text: str,
+        expires_at: float,
+        latency_ms: Optional[float],
+        model_name: Optional[str]
+    ):
+        expires = datetime.utcnow() + timedelta(seconds=max(0.0, expires_at - time.time()))
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                select(ProviderResponseCache).where(ProviderResponseCache.cache_key == key)
+            )).scalars().first()
+            if row is None:
+                row = ProviderResponseCache(cache_key=key, ai_name=ai_name)
+                db.add(row)
+            row.model_name = model_name
+            row.language = lang
+            row.response_text = response_text
+            row.latency_ms = latency_ms
+            row.created_at = datetime.utcnow()
+            row.expires_at = expires
+            await db.commit()
+
+
+# Instancia global de la caché de respuestas
+response_cache = ResponseCache()
@@ -0,0 +1,139 @@
+"""
+Matriz de similitud oración por oración entre todas las respuestas de una pregunta.
+
+Las oraciones de todas las respuestas se vectorizan juntas y una sola multiplicación de
+matrices da la similitud coseno de cada par. Backends (SENTENCE_SIMILARITY_BACKEND):
+
+- tfidf: vectores TF-IDF dispersos (scikit-learn) normalizados L2 (por defecto).
+- embedding: el modelo compartido "sentence_embedding" del registro, con las oraciones
+  codificadas en lotes. Si el modelo no se puede cargar se usa tfidf.
+
+Cada oración pertenece a un grupo (respuestas con el mismo texto comparten grupo) y las
+consultas como max_other_similarity ignoran las oraciones del propio grupo.
+"""
+import os
+from typing import Dict, List, Sequence
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from services.ModelRegistry import model_registry
+
+BACKENDS = ("tfidf", "embedding")
+
+
+def tfidf_vectors(sentences: Sequence[str]):
+    """Matriz dispersa oración x término, filas normalizadas L2 (None si no hay vocabulario)"""
+    try:
+        return TfidfVectorizer(lowercase=True, norm="l2").fit_transform(sentences)
+    except ValueError:
+        # Todas las oraciones sin términos (solo números de un dígito, signos, etc.)
+        return None
+
+
+def embedding_vectors(sentences: Sequence[str]) -> np.ndarray:
+    """Embeddings normalizados de todas las oraciones en lotes"""
+    batch_size = int(os.getenv("SENTENCE_EMBEDDING_BATCH_SIZE", "64"))
+    return model_registry.get("sentence_embedding").encode(
+        list(sentences), batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+    )
+
+
+def cosine_matrix(sentences: Sequence[str], backend: str = "tfidf") -> np.ndarray:
+    """Similitud coseno densa n x n entre las oraciones"""
+    count = len(sentences)
+    if count == 0:
+        return np.zeros((0, 0))
+    if backend == "embedding":
+        try:
+            vectors = embedding_vectors(sentences)
+            return np.clip(vectors @ vectors.T, -1.0, 1.0)
+        except Exception as e:
+            print(f"❌ Error con embeddings de oraciones, se usa TF-IDF: {str(e)}")
+    vectors = tfidf_vectors(sentences)
+    if vectors is None:
+        return np.zeros((count, count))
+    return (vectors @ vectors.T).toarray()
+
+
+def binary_term_matrix(token_lists: Sequence[Sequence[str]]) -> csr_matrix:
+    """Matriz dispersa oración x término con 1 si el término aparece en la oración"""
+    vocabulary: Dict[str, int] = {}
+    indices: List[int] = []
+    indptr = [0]
+    for tokens in token_lists:
+        indices.extend(vocabulary.setdefault(token, len(vocabulary)) for token in set(tokens))
+        indptr.append(len(indices))
+    return csr_matrix(
+        (np.ones(len(indices)), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(token_lists), len(vocabulary))
+    )
+
+
+def jaccard_matrix(token_lists: Sequence[Sequence[str]]) -> np.ndarray:
+    """Jaccard entre los conjuntos de tokens de todas las oraciones con un solo producto disperso"""
+    terms = binary_term_matrix(token_lists)
+    intersection = (terms @ terms.T).toarray()
+    sizes = np.diff(terms.indptr)
+    union = sizes[:, None] + sizes[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def threshold_clusters(similarity: np.ndarray, threshold: float) -> List[np.ndarray]:
+    """
+    Componentes conexas del grafo que une los pares con similitud > threshold.
+    Devuelve solo las de al menos 2 elementos, ordenadas por su primer índice.
+    """
+    if len(similarity) == 0:
+        return []
+    adjacency = csr_matrix(np.triu(similarity > threshold, k=1))
+    count, labels = connected_components(adjacency, directed=False)
+    sizes = np.bincount(labels, minlength=count)
+    order = np.argsort(labels, kind="stable")
+    members = np.split(order, np.cumsum(sizes)[:-1])
+    clusters = [rows for rows in members if len(rows) > 1]
+    clusters.sort(key=lambda rows: rows[0])
+    return clusters
+
+
+class SentenceMatrix:
+    """Oraciones de todas las respuestas, su grupo y la matriz de similitud entre ellas"""
+
+    def __init__(self, sentences_by_owner: Dict[str, List[str]], groups: Dict[str, int] = None, backend: str = None):
+        backend = (backend or os.getenv("SENTENCE_SIMILARITY_BACKEND", "tfidf")).lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend de similitud de oraciones desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+        self.backend = backend
+
+        groups = groups or {owner: i for i, owner in enumerate(sentences_by_owner)}
+        self.sentences: List[str] = []
+        self.rows: Dict[str, np.ndarray] = {}
+        sentence_groups = []
+        for owner, sentences in sentences_by_owner.items():
+            start = len(self.sentences)
+            self.sentences.extend(sentences)
+            self.rows[owner] = np.arange(start, len(self.sentences))
+            sentence_groups.extend([groups[owner]] * len(sentences))
+        self.groups = np.asarray(sentence_groups, dtype=np.int64)
+        self.similarity = cosine_matrix(self.sentences, backend)
+        self._max_other = None
+
+    def max_other_similarity(self) -> np.ndarray:
+        """Para cada oración, la similitud máxima con las oraciones de otros grupos (-inf si no hay)"""
+        if self._max_other is None:
+            if not self.sentences:
+                self._max_other = np.zeros(0)
+            else:
+                masked = np.where(self.groups[:, None] == self.groups[None, :], -np.inf, self.similarity)
+                self._max_other = masked.max(axis=1)
+        return self._max_other
+
+    def unique_rows(self, threshold: float) -> np.ndarray:
+        """Máscara de oraciones sin ninguna parecida (> threshold) en otro grupo"""
+        return self.max_other_similarity() <= threshold
+
+    def submatrix(self, indices: Sequence[int]) -> np.ndarray:
+        indices = np.asarray(indices, dtype=np.int64)
+        return self.similarity[np.ix_(indices, indices)]
@@ -1,15 +1,13 @@
-from difflib import SequenceMatcher
+from services.LexicalSimilarity import LexicalSimilarityEngine
 
 class SimilarityAnalyzer:
     @staticmethod
-    def analyze(responses):
-        ai_names = list(responses.keys())
-        analysis = {}
+    def analyze(responses, metric=None):
+        """Similitud léxica por par ("AI1 vs AI2" -> score) con la métrica configurada"""
+        return LexicalSimilarityEngine(metric).pairwise(responses)
 
-        for i in range(len(ai_names)):
-            for j in range(i + 1, len(ai_names)):
-                ai1, ai2 = ai_names[i], ai_names[j]
-                similarity = SequenceMatcher(None, responses[ai1], responses[ai2]).ratio()
-                analysis[f"{ai1} vs {ai2}"] = similarity
-
-        return analysis
+    @staticmethod
+    def analyze_with_metric(responses, metric=None):
+        """Como analyze, indicando además qué métrica se usó"""
+        engine = LexicalSimilarityEngine(metric)
+        return {"scores": engine.pairwise(responses), "metric": engine.metric_name}
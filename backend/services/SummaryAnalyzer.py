@@ -5,13 +5,16 @@ class SummaryAnalyzer:
     def __init__(self):
         self.api_key = os.getenv("SUMMARY_API_KEY")  # Obtiene la API Key desde .env
 
-    def generate_summary(self, observations, lang="en"):
+    def _build_prompt(self, observations, lang="en"):
         if lang == "es":
-            prompt = "Resuma las siguientes observaciones de manera concisa:\n\n" + "\n".join(observations)
+            return "Resuma las siguientes observaciones de manera concisa:\n\n" + "\n".join(observations)
         elif lang == "en":
-            prompt = "Summarize the following observations concisely:\n\n" + "\n".join(observations)
+            return "Summarize the following observations concisely:\n\n" + "\n".join(observations)
         else:
-            prompt = "Summarize the following observations concisely:\n\n" + "\n".join(observations)
+            return "Summarize the following observations concisely:\n\n" + "\n".join(observations)
+
+    def generate_summary(self, observations, lang="en"):
+        prompt = self._build_prompt(observations, lang)
 
         client = openai.OpenAI(api_key=self.api_key)  # Usa el nuevo cliente de OpenAI
 
@@ -21,3 +24,15 @@ class SummaryAnalyzer:
         )
 
         return response.choices[0].message.content  # Nuevo formato de respuesta en OpenAI 1.0.0
+
+    async def generate_summary_async(self, observations, lang="en"):
+        """Igual que generate_summary pero sin bloquear el event loop"""
+        prompt = self._build_prompt(observations, lang)
+
+        async with openai.AsyncOpenAI(api_key=self.api_key) as client:
+            response = await client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "system", "content": prompt}]
+            )
+
+        return response.choices[0].message.content
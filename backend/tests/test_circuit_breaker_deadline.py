@@ -0,0 +1,68 @@
+"""
+El plazo de la solicitud (REQUEST_DEADLINE_SECONDS) vence antes que el timeout propio del
+cliente (PROVIDER_TIMEOUT_SECONDS): un proveedor colgado solo se detecta por ese plazo y
+tiene que terminar abriendo su circuito.
+"""
+import asyncio
+
+from IATools.AsyncIA import AsyncIA
+from services.CircuitBreaker import CLOSED, OPEN, circuit_breakers
+from services.IAManager import IAManager
+
+
+class HangingIA(AsyncIA):
+    """Cliente async que nunca responde"""
+
+    async def get_response(self, prompt: str, lang: str) -> str:
+        await asyncio.sleep(3600)
+        return "nunca"
+
+
+def make_manager(ai_name: str) -> IAManager:
+    manager = IAManager.__new__(IAManager)
+    manager.ias = {ai_name: HangingIA()}
+    manager.async_ias = {ai_name: manager.ias[ai_name]}
+    manager.responses = {}
+    return manager
+
+
+def test_deadline_timeouts_open_the_circuit():
+    ai_name = "StubHangingDeadline"
+    manager = make_manager(ai_name)
+    breaker = circuit_breakers.get(ai_name)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for _ in range(breaker.failure_threshold):
+            result = await manager._query_ai_async(
+                "pregunta", "en", ai_name, manager.ias[ai_name], use_cache=False, deadline=loop.time() + 0.05
+            )
+            assert result is None
+
+    asyncio.run(run())
+
+    assert breaker.consecutive_failures == breaker.failure_threshold
+    assert breaker.state == OPEN
+    assert "timeout" in breaker.last_error
+
+
+def test_other_cancellations_do_not_count_as_failures():
+    ai_name = "StubHangingCancelled"
+    manager = make_manager(ai_name)
+    breaker = circuit_breakers.get(ai_name)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for _ in range(breaker.failure_threshold):
+            # El consumidor abandona la consulta antes del plazo (p.ej. el cliente SSE se desconecta)
+            task = asyncio.ensure_future(manager._query_ai_async(
+                "pregunta", "en", ai_name, manager.ias[ai_name], use_cache=False, deadline=loop.time() + 10
+            ))
+            await asyncio.sleep(0.02)
+            task.cancel()
+            await asyncio.wait({task})
+
+    asyncio.run(run())
+
+    assert breaker.consecutive_failures == 0
+    assert breaker.state == CLOSED
@@ -0,0 +1,22 @@
+"""Cursor de paginación del historial de preguntas (created_at, id)"""
+from datetime import datetime
+
+import pytest
+
+from services.AnalysisStore import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 17, 12, 30, 5, 123456)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_cursor_requires_created_at():
+    with pytest.raises(RuntimeError):
+        encode_cursor(None, 42)
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("no-es-un-cursor")
@@ -0,0 +1,39 @@
+"""
+Un proveedor que su cuota rechaza (429 sin reintentos posibles) se informa en rate_limited,
+no en timed_out: no esperó hasta el plazo de la solicitud.
+"""
+import asyncio
+
+from IATools.AsyncIA import AsyncIA, ProviderRateLimited
+from services.IAManager import IAManager
+
+
+class ThrottledIA(AsyncIA):
+    """Cliente async que siempre responde 429 con un Retry-After largo"""
+
+    async def get_response(self, prompt: str, lang: str) -> str:
+        raise ProviderRateLimited("429 Too Many Requests", {"retry-after": "3600"})
+
+
+class EchoIA(AsyncIA):
+    async def get_response(self, prompt: str, lang: str) -> str:
+        return "respuesta"
+
+
+def make_manager(clients) -> IAManager:
+    manager = IAManager.__new__(IAManager)
+    manager.ias = dict(clients)
+    manager.async_ias = dict(clients)
+    manager.responses = {}
+    return manager
+
+
+def test_rate_limited_providers_are_not_reported_as_timeouts():
+    manager = make_manager({"StubThrottled": ThrottledIA(), "StubEcho": EchoIA()})
+
+    result = asyncio.run(manager.query_all_ias_with_status("pregunta", "en", use_cache=False, timeout=5))
+
+    assert result["responses"] == {"StubEcho": "respuesta"}
+    assert result["rate_limited"] == ["StubThrottled"]
+    assert result["timed_out"] == []
+    assert result["unavailable"] == []
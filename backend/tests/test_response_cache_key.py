@@ -0,0 +1,26 @@
+"""
+La clave de caché sale de lo que cada cliente envía al proveedor (cache_params), no de
+AIConfig: cambiar el modelo o las instrucciones de un cliente no puede servir respuestas
+generadas con los anteriores.
+"""
+from IATools import Gemini, PerplexityIA
+from services.ResponseCache import ResponseCache
+
+
+def test_key_depends_on_client_params():
+    cache = ResponseCache(enabled=True)
+    params = {"model": "modelo-a", "temperature": 0.7}
+
+    key = cache.make_key("¿Qué es Python?", "es", "Stub", params)
+
+    assert key == cache.make_key("  ¿qué es   python? ", "es", "Stub", dict(params))
+    assert key != cache.make_key("¿Qué es Python?", "es", "Stub", {**params, "model": "modelo-b"})
+    assert key != cache.make_key("¿Qué es Python?", "es", "Stub", {**params, "temperature": 0.2})
+
+
+def test_clients_report_the_model_they_send():
+    assert Gemini.CACHE_PARAMS["model"] == Gemini.MODEL == "gemini-1.5-flash"
+    assert PerplexityIA.CACHE_PARAMS["model"] == PerplexityIA.MODEL == "r1-1776"
+    assert PerplexityIA.AsyncPerplexityIA("clave").cache_params() is PerplexityIA.CACHE_PARAMS
+    _, payload = PerplexityIA._build_request("clave", "pregunta", "es")
+    assert payload["model"] == PerplexityIA.CACHE_PARAMS["model"]
@@ -1,17 +1,21 @@
 // src/components/QuestionList.tsx
 import React from "react";
-import { QuestionWithData } from '../types';
+import { QuestionSummary } from '../types';
 
 interface QuestionListProps {
-  questions: QuestionWithData[];
+  questions: QuestionSummary[];
+  total: number;
   onSelect: (id: number) => void;
+  onLoadMore?: () => void;
   selectedId?: number;
   loadingId?: number | null;
 }
 
 const QuestionList: React.FC<QuestionListProps> = ({ 
   questions, 
+  total,
   onSelect, 
+  onLoadMore,
   selectedId, 
   loadingId 
 }) => {
@@ -24,7 +28,7 @@ const QuestionList: React.FC<QuestionListProps> = ({
             No questions yet. Ask your first question!
           </div>
         ) : (
-          [...questions].sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime()).map((question) => {
+          questions.map((question) => {
             const isSelected = question.id === selectedId;
             const isLoading = question.id === loadingId;
             
@@ -57,18 +61,18 @@ const QuestionList: React.FC<QuestionListProps> = ({
                       </div>
                     )}
                     {/* Response count */}
-                    {!isLoading && question.responses && (
+                    {!isLoading && (
                       <div className="flex items-center space-x-1 mt-2">
                         <span className="text-xs text-gray-500">
-                          {question.responses.length} AI responses
+                          {question.providers.length} AI responses
                         </span>
-                        {question.responses.length > 0 && (
+                        {question.providers.length > 0 && (
                           <div className="flex space-x-1">
-                            {question.responses.map((response, index) => (
+                            {question.providers.map((provider, index) => (
                               <div
                                 key={index}
                                 className="w-2 h-2 bg-green-500 rounded-full"
-                                title={response.ai_name}
+                                title={provider}
                               ></div>
                             ))}
                           </div>
@@ -87,6 +91,14 @@ const QuestionList: React.FC<QuestionListProps> = ({
             );
           })
         )}
+        {onLoadMore && (
+          <button
+            onClick={onLoadMore}
+            className="w-full py-2 text-sm text-blue-600 hover:text-blue-800"
+          >
+            Load more
+          </button>
+        )}
       </div>
       {/* Summary */}
       {questions.length > 0 && (
@@ -94,12 +106,12 @@ const QuestionList: React.FC<QuestionListProps> = ({
           <div className="text-sm text-gray-600">
             <div className="flex justify-between">
               <span>Total questions:</span>
-              <span className="font-medium">{questions.length}</span>
+              <span className="font-medium">{total}</span>
             </div>
             <div className="flex justify-between">
               <span>With responses:</span>
               <span className="font-medium">
-                {questions.filter(q => q.responses && q.responses.length > 0).length}
+                {questions.filter(q => q.providers.length > 0).length}
               </span>
             </div>
           </div>
@@ -1,6 +1,10 @@
 import { useState, useCallback } from 'react';
 import { AIProgress, ProcessingStep } from '../types';
-import { querySingleAI, queryAllAIs, generateSummary, performFullAnalysis } from '../services/api';
+import { streamAllAIs } from '../services/api';
+
+const AI_NAMES = ['ChatGPT', 'Gemini', 'Mistral', 'Cohere', 'Perplexity'];
+// Etapas por pares del pipeline que forman el paso "Full Analysis"
+const ANALYSIS_STAGES = ['similarities', 'contradictions', 'semantic_similarities'];
 
 export const useParallelProcessing = () => {
   const [progress, setProgress] = useState<AIProgress>({
@@ -48,41 +52,89 @@ export const useParallelProcessing = () => {
   const processQuestion = useCallback(async (question: string) => {
     try {
       setProgress(prev => ({ ...prev, status: 'processing', message: 'Starting processing...' }));
-      // Step 1-5: Query all AIs in parallel
+      // Una sola solicitud SSE: respuestas en orden de llegada, luego las etapas de análisis
       updateProgress(1, 'All AIs', 'Querying all AIs in parallel...');
-      const aiNames = ['ChatGPT', 'Gemini', 'Mistral', 'Cohere', 'Perplexity'];
-      // Update all AI steps to 'processing'
-      aiNames.forEach((ai, index) => {
+      AI_NAMES.forEach((ai, index) => {
         updateStep(index + 1, 'processing', `Querying ${ai}...`);
       });
-      // Query all AIs in parallel
-      const responses = await queryAllAIs(question);
-      // Mark all AIs as completed
-      aiNames.forEach((ai, index) => {
-        updateStep(index + 1, 'completed', `${ai} completed`);
+
+      let finished = 0;
+      const finishAI = (aiName: string, status: ProcessingStep['status'], message: string) => {
+        const index = AI_NAMES.indexOf(aiName);
+        if (index === -1) return;
+        finished += 1;
+        updateStep(index + 1, status, message);
+        updateProgress(Math.min(finished, AI_NAMES.length), aiName, message);
+      };
+
+      const completedStages = new Set<string>();
+      // Se completa desde el callback del stream
+      const outcome: { result: any; error: string | null } = { result: null, error: null };
+
+      await streamAllAIs(question, (event, data) => {
+        switch (event) {
+          case 'response':
+            finishAI(data.ai_name, 'completed', `${data.ai_name} completed`);
+            break;
+          case 'timeout':
+            finishAI(data.ai_name, 'error', `${data.ai_name} timed out`);
+            break;
+          case 'unavailable':
+            finishAI(data.ai_name, 'error', `${data.ai_name} unavailable`);
+            break;
+          case 'rate_limited':
+            finishAI(data.ai_name, 'error', `${data.ai_name} rate limited`);
+            break;
+          case 'stage':
+            completedStages.add(data.stage);
+            if (data.stage === 'summary') {
+              updateStep(6, 'completed', 'Summary generated');
+            } else if (ANALYSIS_STAGES.includes(data.stage)) {
+              const done = ANALYSIS_STAGES.filter(stage => completedStages.has(stage)).length;
+              updateStep(7, done === ANALYSIS_STAGES.length ? 'completed' : 'processing',
+                done === ANALYSIS_STAGES.length ? 'Analysis completed' : `Analysis ${done}/${ANALYSIS_STAGES.length}...`);
+            }
+            if (completedStages.has('summary') && ANALYSIS_STAGES.every(stage => completedStages.has(stage))) {
+              updateProgress(8, 'Finalizing', 'Saving results...');
+              updateStep(8, 'processing', 'Saving results...');
+            } else {
+              updateProgress(6 + (completedStages.has('summary') ? 1 : 0), 'Analysis', 'Analyzing responses...');
+            }
+            break;
+          case 'done':
+            outcome.result = data;
+            break;
+          case 'error':
+            outcome.error = data.detail;
+            break;
+        }
+        // Con todas las respuestas recibidas empiezan el resumen y el análisis
+        if (['response', 'timeout', 'unavailable', 'rate_limited'].includes(event) && finished === AI_NAMES.length) {
+          updateStep(6, 'processing', 'Generating summary...');
+          updateStep(7, 'processing', 'Analyzing similarities, contradictions, entities, and sentiments...');
+        }
+      });
+
+      if (outcome.error !== null) throw new Error(outcome.error);
+      if (outcome.result === null) throw new Error('Stream ended before the analysis finished');
+      const result = outcome.result;
+
+      // IAs sin evento (no configuradas en el backend)
+      AI_NAMES.forEach((ai, index) => {
+        const reported = [...result.timed_out, ...result.unavailable, ...result.rate_limited];
+        if (!(ai in result.responses) && !reported.includes(ai)) {
+          updateStep(index + 1, 'error', `${ai} not configured`);
+        }
       });
-      updateProgress(6, 'Summary', 'Generating summary of all responses...');
-      updateStep(6, 'processing', 'Generating summary...');
-      // Step 6: Generate summary
-      const summaryResult = await generateSummary(responses.question_id);
       updateStep(6, 'completed', 'Summary generated');
-      updateProgress(7, 'Analysis', 'Performing full analysis...');
-      updateStep(7, 'processing', 'Analyzing similarities, contradictions, entities, and sentiments...');
-      // Step 7: Full analysis
-      const analysisResult = await performFullAnalysis(responses.question_id);
       updateStep(7, 'completed', 'Analysis completed');
-      updateProgress(8, 'Finalizing', 'Finalizing process...');
-      updateStep(8, 'processing', 'Finalizing...');
-      // Step 8: Finalize
-      setTimeout(() => {
-        updateStep(8, 'completed', 'Process completed');
-        setProgress(prev => ({ ...prev, status: 'completed', message: 'Process completed successfully' }));
-      }, 1000);
+      updateStep(8, 'completed', 'Process completed');
+      updateProgress(8, 'Finalizing', 'Process completed successfully', 'completed');
       return {
-        questionId: responses.question_id,
-        responses: responses.responses,
-        summary: summaryResult.summary,
-        analysis: analysisResult
+        questionId: result.question_id,
+        responses: result.responses,
+        summary: result.summary,
+        analysis: result
       };
     } catch (error) {
       console.error('Error in parallel processing:', error);
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { getQuestions, getQuestionDetail } from "../services/api";
-import { Question, QuestionWithData } from "../types";
+import { QuestionPage, QuestionSummary, QuestionWithData } from "../types";
 import QuestionList from "../components/QuestionList";
 import { QuestionDetail } from "../components/QuestionDetail";
 import QuestionInput from "../components/QuestionInput";
@@ -8,7 +8,9 @@ import { useParallelProcessing } from "../hooks/useParallelProcessing";
 import AnalysisGraphs from "../components/AnalysisGraphs";
 
 const Home: React.FC = () => {
-  const [questions, setQuestions] = useState<QuestionWithData[]>([]);
+  const [questions, setQuestions] = useState<QuestionSummary[]>([]);
+  const [totalQuestions, setTotalQuestions] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [selectedQuestionId, setSelectedQuestionId] = useState<number | null>(null);
   const [selectedQuestion, setSelectedQuestion] = useState<QuestionWithData | null>(null);
   const [activeTab, setActiveTab] = useState<'analysis' | 'graphs'>('analysis');
@@ -20,8 +22,22 @@ const Home: React.FC = () => {
     resetProgress 
   } = useParallelProcessing();
 
+  const showFirstPage = (page: QuestionPage) => {
+    setQuestions(page.items);
+    setTotalQuestions(page.total);
+    setNextCursor(page.next_cursor);
+  };
+
+  const loadMoreQuestions = async () => {
+    if (!nextCursor) return;
+    const page = await getQuestions(nextCursor);
+    setQuestions((previous) => [...previous, ...page.items]);
+    setTotalQuestions(page.total);
+    setNextCursor(page.next_cursor);
+  };
+
   useEffect(() => {
-    getQuestions().then(setQuestions);
+    getQuestions().then(showFirstPage);
   }, []);
 
   useEffect(() => {
@@ -36,7 +52,7 @@ const Home: React.FC = () => {
     try {
       resetProgress();
       const result = await processQuestion(question);
-      await getQuestions().then(setQuestions);
+      await getQuestions().then(showFirstPage);
       setSelectedQuestionId(result.questionId);
       setSelectedQuestion({
         id: result.questionId,
@@ -83,7 +99,12 @@ const Home: React.FC = () => {
           {/* Question History */}
           <aside className="w-full lg:w-[420px] min-h-[200px] bg-white shadow-md flex flex-col p-4 sm:p-6 rounded-xl mb-4 lg:mb-0">
             <h2 className="text-lg sm:text-xl font-bold mb-4 sm:mb-6">Question History</h2>
-            <QuestionList questions={questions} onSelect={setSelectedQuestionId} />
+            <QuestionList
+              questions={questions}
+              total={totalQuestions}
+              onSelect={setSelectedQuestionId}
+              onLoadMore={nextCursor ? loadMoreQuestions : undefined}
+            />
           </aside>
           {/* Main Panel - Results */}
           <main className="flex-1">
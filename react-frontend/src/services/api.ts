@@ -1,4 +1,4 @@
-import { Question, Response, Analysis, AIProgress } from "../types";
+import { QuestionPage, Response, Analysis, AIProgress } from "../types";
 
 const API_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
 
@@ -11,8 +11,13 @@ declare global {
   }
 }
 
-export const getQuestions = async (): Promise<Question[]> => {
-  const res = await fetch(`${API_URL}/questions/`);
+export const getQuestions = async (
+  cursor?: string | null,
+  limit: number = 20
+): Promise<QuestionPage> => {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`${API_URL}/questions/?${params}`);
   return res.json();
 };
 
@@ -68,4 +73,62 @@ export const performFullAnalysis = async (questionId: number): Promise<any> => {
   return res.json();
 };
 
+// Stream SSE: cada respuesta llega en cuanto la IA termina, seguida de las etapas de análisis
+export type StreamEventName =
+  | "question"
+  | "response"
+  | "timeout"
+  | "unavailable"
+  | "rate_limited"
+  | "response_analysis"
+  | "stage"
+  | "done"
+  | "error";
+
+export const streamAllAIs = async (
+  question: string,
+  onEvent: (event: StreamEventName, data: any) => void
+): Promise<void> => {
+  const res = await fetch(`${API_URL}/ai/query-all-ais/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Accept': 'text/event-stream',
+    },
+    body: JSON.stringify({ text: question }),
+  });
+  if (!res.ok) {
+    const detail = await res.json().catch(() => null);
+    throw new Error(detail?.detail || `Request failed with status ${res.status}`);
+  }
+  if (!res.body) {
+    throw new Error("Streaming not supported by the browser");
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const chunk = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let event = "message";
+      let data = "";
+      for (const line of chunk.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      if (data) onEvent(event as StreamEventName, JSON.parse(data));
+    }
+  }
+};
+
 export { API_URL };
@@ -3,6 +3,23 @@ export interface Question {
   text: string;
 }
 
+// Compact entry of the paginated question history (GET /questions/)
+export interface QuestionSummary {
+  id: number;
+  text: string;
+  language: string | null;
+  created_at: string;
+  providers: string[];
+  previews?: { [aiName: string]: string };
+}
+
+export interface QuestionPage {
+  items: QuestionSummary[];
+  next_cursor: string | null;
+  limit: number;
+  total: number;
+}
+
 export interface Response {
   id: number;
   iaName: string;